@@ -0,0 +1,103 @@
+"""
+Benchmark heuristic seeding of the GA's initial population.
+
+Runs the default 10 x 8 genetic algorithm on every manifest in input/, with a
+fully random initial population and with heuristic seeds (GA_SEED_FRACTION),
+over several random seeds. The targets of a manifest are the mean final
+utilization and fitness of the random runs; for both variants the benchmark
+reports the first generation whose best genome reaches each target (runs that
+never do count as generations + 1) and the mean final utilization.
+
+Usage:
+    python benchmarks/bench_heuristic_seeding.py [runs] [generations]
+"""
+import csv
+import glob
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop('GEMINI_API_KEY', None)  # Benchmark the GA alone, without LLM advice
+
+from optigenix_module.models.item import Item
+from optigenix_module.optimization.packer import GeneticPacker
+
+CONTAINER_DIMS = (12.0, 2.35, 2.39)
+POPULATION_SIZE = 10
+INPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'input')
+
+def load_manifest(path):
+    """Read a manifest CSV and expand non-bundled quantities into single items"""
+    items = []
+    with open(path, encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            bundle = 'YES' if row.get('Bundle', 'NO').strip().upper() == 'YES' else 'NO'
+            temperature = row.get('Temperature Sensitivity') or None
+            item = Item(row['Name'], row['Length'], row['Width'], row['Height'], row['Weight'], row['Quantity'],
+                        row['Fragility'], 'YES', row['BoxingType'], bundle, load_bearing=row.get('LoadBear') or 0,
+                        temperature_sensitivity=None if temperature in (None, 'n/a') else temperature)
+            if item.quantity > 1 and bundle != 'YES':
+                for i in range(item.quantity):
+                    items.append(Item(f"{item.name}_{i + 1}", *item.original_dims, item.weight, 1, item.fragility,
+                                      item.stackable, item.boxing_type, 'NO', item.load_bearing,
+                                      item.temperature_sensitivity))
+            else:
+                items.append(item)
+    return items
+
+def run_ga(items, generations, seed, seed_fraction):
+    """Run the GA once; returns (per-generation history, seconds)"""
+    random.seed(seed)
+    packer = GeneticPacker(CONTAINER_DIMS, POPULATION_SIZE, generations, workers=1, seed_fraction=seed_fraction)
+    start = time.perf_counter()
+    packer.optimize(items)
+    return packer.generation_history, time.perf_counter() - start
+
+def generations_to_reach(history, key, target, generations):
+    """First generation (1-based) whose history[key] reaches target, or generations + 1"""
+    for generation, entry in enumerate(history, 1):
+        if entry[key] >= target - 1e-9:
+            return generation
+    return generations + 1
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    generations = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    logging.disable(logging.CRITICAL)
+    seeded_fraction = float(os.environ.get('GA_SEED_FRACTION', 0.3)) or 0.3
+
+    print(f"{POPULATION_SIZE} x {generations} GA, {runs} runs per manifest; generations (random / seeded) "
+          f"to reach the random runs' mean final utilization and fitness")
+    print(f"{'manifest':<26}{'items':>6}{'util':>8}{'gens':>12}{'fitness':>9}{'gens':>12}"
+          f"{'final util':>15}{'time':>13}")
+    totals = {key: {'random': [], 'seeded': []} for key in ('volume_utilization', 'best_fitness')}
+    for path in sorted(glob.glob(os.path.join(INPUT_DIR, '*.csv'))):
+        items = load_manifest(path)
+        if not items:
+            continue
+        results = {}
+        for name, fraction in (('random', 0.0), ('seeded', seeded_fraction)):
+            results[name] = [run_ga(items, generations, seed, fraction) for seed in range(runs)]
+
+        columns = []
+        for key in ('volume_utilization', 'best_fitness'):
+            target = sum(history[-1][key] for history, _ in results['random']) / runs
+            reached = {}
+            for name, outcomes in results.items():
+                counts = [generations_to_reach(history, key, target, generations) for history, _ in outcomes]
+                totals[key][name].extend(counts)
+                reached[name] = sum(counts) / runs
+            columns.append(f"{target:>8.3f}{reached['random']:>6.2f} /{reached['seeded']:>5.2f}")
+        final = {name: sum(h[-1]['volume_utilization'] for h, _ in outcomes) / runs for name, outcomes in results.items()}
+        seconds = {name: sum(t for _, t in outcomes) / runs for name, outcomes in results.items()}
+        print(f"{os.path.basename(path)[:25]:<26}{len(items):>6}{columns[0]}{columns[1]:>21}"
+              f"{final['random']:>8.3f} /{final['seeded']:>5.3f}{seconds['random']:>6.1f}s /{seconds['seeded']:>4.1f}s")
+    for key, label in (('volume_utilization', 'utilization'), ('best_fitness', 'fitness')):
+        print(f"mean generations to the {label} target: "
+              + " / ".join(f"{sum(v) / len(v):.2f} {name}" for name, v in totals[key].items()))
+
+if __name__ == '__main__':
+    main()
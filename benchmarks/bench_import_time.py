@@ -0,0 +1,66 @@
+"""
+Benchmark the cold import time of the GA packer.
+
+Imports optigenix_module.optimization.packer in fresh interpreters (as a GA
+worker or a gunicorn worker does when it boots), reports the best and median
+wall time and checks them against a budget. Also fails if the import loads
+the visualization, dashboard, web or LLM libraries, which the packer should
+only pull in on first use.
+
+Usage:
+    python benchmarks/bench_import_time.py [runs] [budget_seconds]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = 'optigenix_module.optimization.packer'
+DEFAULT_BUDGET = 0.5  # Seconds for the median import, measured inside the child interpreter
+HEAVY_MODULES = ('pandas', 'plotly', 'dash', 'flask', 'google.generativeai')
+
+CHILD = f"""
+import sys, time
+start = time.perf_counter()
+import {MODULE}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(elapsed, ','.join(loaded))
+"""
+
+def measure():
+    """Import the packer in a fresh interpreter and return (seconds, heavy modules loaded)"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout.strip().splitlines()[-1]
+    seconds, _, loaded = output.partition(' ')
+    return float(seconds), [name for name in loaded.split(',') if name]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET
+
+    measure()  # Warm the bytecode and OS file caches
+    timings, loaded = [], set()
+    for _ in range(runs):
+        seconds, heavy = measure()
+        timings.append(seconds)
+        loaded.update(heavy)
+
+    median = statistics.median(timings)
+    print(f"import {MODULE}: best {min(timings):.3f}s, median {median:.3f}s over {runs} runs "
+          f"(budget {budget:.3f}s)")
+    failed = False
+    if median > budget:
+        print(f"FAIL: median import time exceeds the budget by {median - budget:.3f}s")
+        failed = True
+    if loaded:
+        print(f"FAIL: import loaded {', '.join(sorted(loaded))}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
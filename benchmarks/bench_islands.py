@@ -0,0 +1,66 @@
+"""
+Benchmark the island-model GA against a single population.
+
+Runs the GA on every manifest in input/ for the same wall-clock budget, once
+with a single population and once with one island per CPU core (or the given
+island count, which the packer caps at the core count), over several random seeds. Reports genome evaluations per
+second, which should scale near-linearly with the number of cores, and the
+mean best fitness reached within the budget.
+
+Usage:
+    python benchmarks/bench_islands.py [islands] [seconds] [runs]
+"""
+import glob
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop('GEMINI_API_KEY', None)  # Benchmark the GA alone, without LLM advice
+
+from bench_heuristic_seeding import CONTAINER_DIMS, INPUT_DIR, POPULATION_SIZE, load_manifest
+from optigenix_module.optimization.packer import GeneticPacker
+
+def run_ga(items, islands, seconds, seed):
+    """Run the GA once within the budget; returns (best fitness, evaluations per second)"""
+    random.seed(seed)
+    packer = GeneticPacker(CONTAINER_DIMS, POPULATION_SIZE, 10_000, workers=1, time_budget=seconds, islands=islands)
+    start = time.perf_counter()
+    packer.optimize(items)
+    elapsed = time.perf_counter() - start
+    if packer.island_stats:
+        evaluations = sum(stats['evaluations'] for stats in packer.island_stats)
+    else:
+        evaluations = packer.generation_count * POPULATION_SIZE
+    return packer.best_fitness, evaluations / elapsed
+
+def main():
+    islands = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    logging.disable(logging.CRITICAL)
+
+    print(f"{POPULATION_SIZE}-genome populations, {seconds:.0f}s per run, {runs} runs per manifest, "
+          f"{os.cpu_count()} CPU core(s); single population / {islands} islands")
+    print(f"{'manifest':<26}{'items':>6}{'evals/s':>20}{'speedup':>9}{'best fitness':>22}")
+    speedups = []
+    for path in sorted(glob.glob(os.path.join(INPUT_DIR, '*.csv'))):
+        items = load_manifest(path)
+        if not items:
+            continue
+        results = {}
+        for name, count in (('single', 1), ('islands', islands)):
+            outcomes = [run_ga(items, count, seconds, seed) for seed in range(runs)]
+            results[name] = (sum(f for f, _ in outcomes) / runs, sum(r for _, r in outcomes) / runs)
+        speedup = results['islands'][1] / results['single'][1] if results['single'][1] else 0.0
+        speedups.append(speedup)
+        print(f"{os.path.basename(path)[:25]:<26}{len(items):>6}"
+              f"{results['single'][1]:>10.1f} /{results['islands'][1]:>8.1f}{speedup:>8.2f}x"
+              f"{results['single'][0]:>12.4f} /{results['islands'][0]:>8.4f}")
+    if speedups:
+        print(f"mean evaluation throughput speedup: {sum(speedups) / len(speedups):.2f}x with {islands} islands")
+
+if __name__ == '__main__':
+    main()
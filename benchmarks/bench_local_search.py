@@ -0,0 +1,60 @@
+"""
+Benchmark the memetic local-search stage against a GA-only run.
+
+Runs the GA on every manifest in input/ for the same total wall-clock budget,
+handing 0% (GA only) and the given shares of it to the local search that
+refines the GA's best genome (GA_LOCAL_SEARCH_BUDGET), over several random
+seeds. Reports the mean best fitness of each split and the local search's
+mean fitness gained per second, to tune the GA-versus-local-search split.
+
+Usage:
+    python benchmarks/bench_local_search.py [seconds] [runs] [share ...]
+"""
+import glob
+import logging
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop('GEMINI_API_KEY', None)  # Benchmark the GA alone, without LLM advice
+
+from bench_heuristic_seeding import CONTAINER_DIMS, INPUT_DIR, POPULATION_SIZE, load_manifest
+from optigenix_module.optimization.packer import GeneticPacker
+
+def run_split(items, seconds, share, seed):
+    """Run the GA and local search once; returns (best fitness, local search fitness gain per second)"""
+    random.seed(seed)
+    packer = GeneticPacker(CONTAINER_DIMS, POPULATION_SIZE, 10_000, workers=1, time_budget=seconds,
+                           local_search_budget=seconds * share)
+    packer.optimize(items)
+    return packer.best_fitness, packer.local_search_stats.get('gain_per_second', 0.0)
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    shares = [float(share) for share in sys.argv[3:]] or [0.2, 0.5]
+    logging.disable(logging.CRITICAL)
+
+    splits = [0.0] + shares
+    print(f"{POPULATION_SIZE}-genome GA, {seconds:.0f}s per run, {runs} runs per manifest; mean best fitness "
+          f"with {' / '.join(f'{share:.0%}' for share in splits)} of the budget spent in local search")
+    print(f"{'manifest':<26}{'items':>6}  best fitness{'':<{9 * len(splits) - 12}}  local search gain/s")
+    totals = {share: [] for share in splits}
+    for path in sorted(glob.glob(os.path.join(INPUT_DIR, '*.csv'))):
+        items = load_manifest(path)
+        if not items:
+            continue
+        fitness, rates = [], []
+        for share in splits:
+            outcomes = [run_split(items, seconds, share, seed) for seed in range(runs)]
+            fitness.append(sum(f for f, _ in outcomes) / runs)
+            totals[share].append(fitness[-1])
+            if share:
+                rates.append(sum(r for _, r in outcomes) / runs)
+        print(f"{os.path.basename(path)[:25]:<26}{len(items):>6}  " + "".join(f"{f:>9.4f}" for f in fitness)
+              + "  " + "".join(f"{r:>9.4f}" for r in rates))
+    print("mean best fitness: " + " / ".join(f"{sum(v) / len(v):.4f} at {share:.0%}" for share, v in totals.items() if v))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark lazy, tiered fitness metrics against computing every metric.
+
+Runs the GA on every manifest in input/ with every metric in a single tier and
+early abort off (eager), and with the default METRIC_TIERS and early abort on
+(lazy), under the default fitness weights and under volume-heavy weights that
+zero out contact ratio, weight balance and temperature. Reports each variant's
+wall-clock time and best fitness, then the cost profile of every metric over
+all eager runs.
+
+Usage:
+    python benchmarks/bench_metric_tiers.py [generations] [runs]
+"""
+import glob
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop('GEMINI_API_KEY', None)  # Benchmark the GA alone, without LLM advice
+
+from bench_heuristic_seeding import CONTAINER_DIMS, INPUT_DIR, POPULATION_SIZE, load_manifest
+from optigenix_module.optimization.packer import METRIC_TIERS, GeneticPacker
+
+EAGER_TIERS = (tuple(name for tier in METRIC_TIERS for name in tier),)
+VOLUME_HEAVY_WEIGHTS = {
+    'volume_utilization_weight': 0.70,
+    'items_packed_ratio_weight': 0.20,
+    'stability_score_weight': 0.10,
+    'contact_ratio_weight': 0.0,
+    'weight_balance_weight': 0.0,
+    'temperature_constraint_weight': 0.0,
+    'weight_capacity_weight': 0.0,
+}
+
+def run_variant(items, generations, lazy, weights, seed):
+    """Run the GA once; returns (seconds, best fitness, metric profile)"""
+    random.seed(seed)
+    packer = GeneticPacker(CONTAINER_DIMS, POPULATION_SIZE, generations, workers=1, early_abort=lazy,
+                           metric_tiers=METRIC_TIERS if lazy else EAGER_TIERS)
+    started = time.perf_counter()
+    packer.optimize(items, weights)
+    return time.perf_counter() - started, packer.best_fitness, packer.metric_profile
+
+def main():
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    logging.disable(logging.CRITICAL)
+
+    print(f"{POPULATION_SIZE} x {generations} GA, {runs} runs per manifest; mean seconds / best fitness, "
+          f"eager vs lazy metrics")
+    print(f"{'manifest':<26}{'items':>6}  {'default weights':^34}  {'volume-heavy weights':^34}")
+    profile = {}
+    for path in sorted(glob.glob(os.path.join(INPUT_DIR, '*.csv'))):
+        items = load_manifest(path)
+        if not items:
+            continue
+        cells = []
+        for weights in (None, VOLUME_HEAVY_WEIGHTS):
+            for lazy in (False, True):
+                outcomes = [run_variant(items, generations, lazy, weights, seed) for seed in range(runs)]
+                cells.append(f"{sum(o[0] for o in outcomes) / runs:>7.2f}s {sum(o[1] for o in outcomes) / runs:.4f}")
+                if not lazy:
+                    for _, _, metric_profile in outcomes:
+                        for name, counts in metric_profile.items():
+                            total = profile.setdefault(name, {'computed': 0, 'seconds': 0.0})
+                            total['computed'] += counts['computed']
+                            total['seconds'] += counts['seconds']
+        print(f"{os.path.basename(path)[:25]:<26}{len(items):>6}  " + "  ".join(cells))
+
+    print("metric cost over the eager runs:")
+    for name, counts in sorted(profile.items(), key=lambda entry: -entry[1]['seconds']):
+        if counts['computed']:
+            print(f"  {name:<24}{counts['seconds'] / counts['computed'] * 1000:>8.3f} ms x {counts['computed']}")
+
+if __name__ == '__main__':
+    main()
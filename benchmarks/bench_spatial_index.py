@@ -0,0 +1,83 @@
+"""
+Benchmark placed-item queries with and without the spatial index.
+
+Fills a standard 40ft container with N small boxes on a regular lattice and
+times the overlap, support and nearest-distance checks used during packing,
+once through the spatial grid and once with a linear scan over all items.
+
+Usage:
+    python benchmarks/bench_spatial_index.py [queries]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.item import Item
+
+CONTAINER_DIMS = (12.0, 2.35, 2.39)
+ITEM_COUNTS = (100, 500, 1000, 2500, 5000)
+CELL = 0.2  # Lattice pitch; boxes are slightly smaller so neighbours do not overlap
+
+class _LinearScan:
+    """Stand-in index that returns every placed item (the pre-index behaviour)"""
+
+    def __init__(self):
+        self.items = []
+
+    def sync(self, items):
+        self.items = items
+
+    def query(self, *box, margin=0.001, ordered=True):
+        return list(self.items)
+
+def build_container(count, linear=False):
+    """Create a container holding count boxes stacked on a lattice"""
+    container = EnhancedContainer(CONTAINER_DIMS)
+    if linear:
+        container._spatial_index = _LinearScan()
+    nx, ny = int(CONTAINER_DIMS[0] / CELL), int(CONTAINER_DIMS[1] / CELL)
+    for n in range(count):
+        layer, rest = divmod(n, nx * ny)
+        row, col = divmod(rest, nx)
+        item = Item(f"box_{n}", 0.19, 0.19, 0.19, 5, 1, 'LOW', 'YES', 'BOX', 'NO')
+        item.position = (col * CELL, row * CELL, layer * 0.19)
+        item.dimensions = (0.19, 0.19, 0.19)
+        container.items.append(item)
+    return container
+
+def run_queries(container, probes):
+    """Run the packing-time checks for every probe and return their results"""
+    results = []
+    for pos, dims, item in probes:
+        results.append((
+            container._is_valid_placement(item, pos, dims),
+            len(container._get_items_below(pos, dims[:2])),
+            tuple(round(v, 6) for v in container._find_nearest_distances(pos, dims)),
+        ))
+    return results
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(0)
+    probe_item = Item("probe", 0.3, 0.3, 0.3, 5, 1, 'LOW', 'YES', 'BOX', 'NO')
+    probes = [((rng.uniform(0, 11.5), rng.uniform(0, 2.0), rng.choice([0.0, 0.19, 0.38, 0.57])),
+               (0.3, 0.3, 0.3), probe_item) for _ in range(queries)]
+
+    print(f"{'items':>6} {'linear (s)':>11} {'indexed (s)':>12} {'speedup':>8}")
+    for count in ITEM_COUNTS:
+        timings = []
+        outputs = []
+        for linear in (True, False):
+            container = build_container(count, linear=linear)
+            start = time.perf_counter()
+            outputs.append(run_queries(container, probes))
+            timings.append(time.perf_counter() - start)
+        assert outputs[0] == outputs[1], "Indexed queries disagree with linear scan"
+        print(f"{count:>6} {timings[0]:>11.3f} {timings[1]:>12.3f} {timings[0] / timings[1]:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,10 @@ SECRET_KEY = os.environ.get('SECRET_KEY', "f23fc24a32e7986b99c8cdaee97f5f395caf2
 
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
 
+# Default wall-clock budget (seconds) for genetic optimization requests; keeps
+# them well inside the gunicorn --timeout of 300 seconds
+GA_TIME_BUDGET = float(os.environ.get('GA_TIME_BUDGET', 240))
+
 # Ensure directories exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(PLANS_FOLDER, exist_ok=True)
\ No newline at end of file
@@ -10,10 +10,11 @@ import subprocess
 import sys
 
 # Import from config instead of app_modular
-from config import PLANS_FOLDER
+from config import PLANS_FOLDER, GA_TIME_BUDGET
 
 import json
 import datetime
+import math
 import os
 
 # Import directly from the new optigenix_module structure
@@ -305,6 +306,29 @@ def optimize_handler():
                 except ValueError:
                     current_app.logger.warning(f"Invalid number of generations: {request.form['num_generations']}")
 
+            # Anytime-mode stopping criteria; the time budget is capped so requests finish before the worker timeout
+            time_budget = parse_time_budget(request.form.get('time_budget'))
+            if request.form.get('time_budget'):
+                current_app.logger.info(f"Using time budget: {time_budget:.0f}s (requested {request.form['time_budget']})")
+
+            target_fitness = None
+            if 'target_fitness' in request.form and request.form['target_fitness']:
+                try:
+                    target_fitness = float(request.form['target_fitness'])
+                    current_app.logger.info(f"Using target fitness: {target_fitness}")
+                except ValueError:
+                    current_app.logger.warning(f"Invalid target fitness: {request.form['target_fitness']}")
+
+            stagnation_limit = None
+            if 'stagnation_limit' in request.form and request.form['stagnation_limit']:
+                try:
+                    stagnation_limit = int(request.form['stagnation_limit'])
+                    current_app.logger.info(f"Using stagnation limit: {stagnation_limit} generations")
+                except ValueError:
+                    current_app.logger.warning(f"Invalid stagnation limit: {request.form['stagnation_limit']}")
+
+            stop_at_volume_bound = request.form.get('stop_at_volume_bound', '').lower() in ('on', 'true', 'yes', '1')
+
             # Get constraint weights from form - convert form names to expected backend names
             constraint_weights = {
                 'volume_utilization_weight': float(request.form.get('volume_weight', 0.75)),
@@ -337,7 +361,11 @@ def optimize_handler():
                     population_size=population_size, # Use the variable defined above
                     generations=num_generations,   # Use the variable defined above
                     route_temperature=route_temperature,
-                    fitness_weights=normalized_weights 
+                    fitness_weights=normalized_weights,
+                    time_budget=time_budget,
+                    target_fitness=target_fitness,
+                    stagnation_limit=stagnation_limit,
+                    stop_at_volume_bound=stop_at_volume_bound
                 )
                 # Assuming optimize_packing_with_genetic_algorithm returns the container object
                 # or a structure from which the container can be accessed.
@@ -747,7 +775,7 @@ def generate_alternative_plan_handler():
         return jsonify({'error': 'No container data available'})
     
     try:
-        # Generate multiple arrangements
+        # Branch alternatives from the current plan (one replay, partial re-packs)
         arrangements = container_storage.current_container.generate_multiple_arrangements(5)
         
         if not arrangements:
@@ -761,10 +789,12 @@ def generate_alternative_plan_handler():
         for container, score in arrangements:
             alternative = {
                 'score': float(score),
+                'description': getattr(container, 'arrangement_description', ''),
                 'volume_utilization': float(container.volume_utilization * 100),
                 'items_packed': len(container.items),
+                'items_unpacked': len(container.unpacked_reasons),
                 'total_weight': float(container.total_weight),
-                'stability_score': float(container._calculate_stability_score()),
+                'stability_score': float(container.calculate_overall_stability_score()),
                 'weight_balance': float(container._calculate_weight_balance_score())
             }
             alternatives.append(alternative)
@@ -792,6 +822,21 @@ def serve_excel_template():
         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
 
+def parse_time_budget(value) -> float:
+    """
+    GA time budget requested by a form value, capped at GA_TIME_BUDGET
+
+    Missing, unparseable, non-finite and non-positive values give GA_TIME_BUDGET,
+    so every run has a deadline that ends it before the worker timeout.
+    """
+    try:
+        time_budget = float(value)
+    except (TypeError, ValueError):
+        return GA_TIME_BUDGET
+    if not math.isfinite(time_budget) or time_budget <= 0:
+        return GA_TIME_BUDGET
+    return min(time_budget, GA_TIME_BUDGET)
+
 def format_transport_modes():
     """Format transport modes data for frontend with corrected mapping"""
     # Updated mapping to match the corrected HTML data-value attributes
@@ -59,7 +59,21 @@ def calculate_support_score(container, item):
     support_area = 0
     total_area = w * d
     
-    for other in container.items:
+    # Read the support from the container's contact graph when it has one
+    if hasattr(container, '_get_contact_graph'):
+        graph = container._get_contact_graph()
+        if graph.node(item) is not None:
+            return min(graph.support_area(item) / total_area, 1.0)
+    
+    # Only items touching the item's base plane can support it (from the height map when enabled)
+    if hasattr(container, '_get_items_below'):
+        candidates = container._get_items_below((x, y, z), (w, d))
+    elif hasattr(container, '_get_items_near'):
+        candidates = container._get_items_near((x, y, z), (w, d, 0))
+    else:
+        candidates = container.items
+    
+    for other in candidates:
         if other == item:
             continue
             
@@ -89,6 +103,11 @@ def calculate_item_interlocking(container, item):
     contact_count = 0
     max_contacts = 6  # Maximum possible contacts (6 faces)
     
+    if hasattr(container, '_get_contact_graph'):
+        graph = container._get_contact_graph()
+        if graph.node(item) is not None:
+            return graph.degree(item) / max_contacts
+    
     for other in container.items:
         if other == item:
             continue
@@ -3,7 +3,6 @@ Utility functions for the container packing application
 """
 import os
 import time
-from flask import current_app
 
 # Define allowed extensions directly here to avoid import issues
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
@@ -14,6 +13,7 @@ def allowed_file(filename):
 
 def cleanup_old_files():
     """Remove uploaded files older than 24 hours"""
+    from flask import current_app  # Keeps the geometry helpers importable without Flask
     now = time.time()
     try:
         upload_folder = current_app.config['UPLOAD_FOLDER']
@@ -6,7 +6,7 @@ Main module exposing key components
 from optigenix_module.constants import CONTAINER_TYPES, TRANSPORT_MODES
 from optigenix_module.models.item import Item
 from optigenix_module.models.space import MaximalSpace
-from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.headless_container import HeadlessContainer
 from optigenix_module.optimization.genetic import optimize_packing_with_genetic_algorithm
 from optigenix_module.optimization.packer import PackingGenome, GeneticPacker
 from optigenix_module.optimization.temperature import TemperatureConstraintHandler
@@ -19,6 +19,7 @@ __all__ = [
     'Item',
     'MaximalSpace',
     'EnhancedContainer',
+    'HeadlessContainer',
     'PackingGenome',
     'GeneticPacker',
     'TemperatureConstraintHandler',
@@ -31,6 +32,12 @@ __all__ = [
 from . import constants
 from . import models
 from .models.item import Item
-from .models.container import EnhancedContainer
 from .models.space import MaximalSpace
-from .optimization.temperature import TemperatureConstraintHandler
\ No newline at end of file
+from .optimization.temperature import TemperatureConstraintHandler
+
+def __getattr__(name):
+    """Import EnhancedContainer (and with it plotly and dash) on first access"""
+    if name == 'EnhancedContainer':
+        from .models.container import EnhancedContainer
+        return EnhancedContainer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
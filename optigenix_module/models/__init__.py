@@ -1,4 +1,12 @@
 """Models package initialization"""
 from .item import Item
-from .container import EnhancedContainer
-from .space import MaximalSpace
\ No newline at end of file
+from .headless_container import HeadlessContainer
+from .space import MaximalSpace
+from .item_spec import ItemSpec
+
+def __getattr__(name):
+    """Import EnhancedContainer (and with it plotly and dash) on first access"""
+    if name == 'EnhancedContainer':
+        from .container import EnhancedContainer
+        return EnhancedContainer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,181 @@
+"""
+Face-contact graph between placed items
+"""
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from optigenix_module.models.item_tracking import shared_prefix
+
+# Matches the tolerance used by the container geometry checks
+TOLERANCE = 0.001
+
+class ContactEdge(NamedTuple):
+    """Contact between an item and one neighbour, seen from the item"""
+    area: float          # Shared face area over every adjacent axis (_calculate_contact_area)
+    base_overlap: float  # Overlap of the two footprints in the x-y plane
+    significant: bool    # Shared face covers at least 10% of the smaller face (_has_surface_contact)
+    supports: bool       # The neighbour's top face carries this item's base
+
+def _overlap(lo1, hi1, lo2, hi2):
+    """Length of the overlap of two intervals (0 if disjoint)"""
+    return max(0, min(hi1, hi2) - max(lo1, lo2))
+
+def face_contact(pos1, dims1, pos2, dims2):
+    """
+    Contact between two placed boxes
+
+    Returns:
+        tuple: (edge seen from box 1, edge seen from box 2), or None if no face of
+        one box touches a face of the other with positive area
+    """
+    x1, y1, z1 = pos1
+    w1, d1, h1 = dims1
+    x2, y2, z2 = pos2
+    w2, d2, h2 = dims2
+    ex = _overlap(x1, x1 + w1, x2, x2 + w2)
+    ey = _overlap(y1, y1 + d1, y2, y2 + d2)
+    ez = _overlap(z1, z1 + h1, z2, z2 + h2)
+
+    on_top = abs(z1 - (z2 + h2)) < TOLERANCE      # Box 1 rests on box 2
+    underneath = abs((z1 + h1) - z2) < TOLERANCE  # Box 2 rests on box 1
+    z_adjacent = on_top or underneath
+    y_adjacent = abs(y1 - (y2 + d2)) < TOLERANCE or abs((y1 + d1) - y2) < TOLERANCE
+    x_adjacent = abs(x1 - (x2 + w2)) < TOLERANCE or abs((x1 + w1) - x2) < TOLERANCE
+
+    touching = ((z_adjacent and ex > 0 and ey > 0) or (y_adjacent and ex > 0 and ez > 0) or
+                (x_adjacent and ey > 0 and ez > 0))
+    if not touching:
+        return None
+
+    significant = ((z_adjacent and ex * ey > min(w1 * d1, w2 * d2) * 0.1) or
+                   (y_adjacent and ex * ez > min(w1 * h1, w2 * h2) * 0.1) or
+                   (x_adjacent and ey * ez > min(d1 * h1, d2 * h2) * 0.1))
+    area = 0
+    if x_adjacent:
+        area += ey * ez
+    if y_adjacent:
+        area += ex * ez
+    if z_adjacent:
+        area += ex * ey
+    base_overlap = ex * ey
+    return (ContactEdge(area, base_overlap, significant, on_top and base_overlap > 0),
+            ContactEdge(area, base_overlap, significant, underneath and base_overlap > 0))
+
+class ContactGraph:
+    """
+    Adjacency graph of face contacts between placed items
+
+    Each placed item is a node; an edge joins two items whose faces touch with
+    positive area and records the shared area, the footprint overlap, whether
+    the contact is significant and which item supports the other. Edges are
+    found once, when an item is added, from the items near it, so per-item
+    queries cost O(degree) instead of a scan over all items.
+
+    The graph follows a container's item list: appended items are added and,
+    after a rollback, items beyond the common prefix are removed with their
+    edges in O(degree) each.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph"""
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all nodes and edges"""
+        self._nodes: Dict[int, int] = {}         # id(item) -> node index
+        self._edges: List[Dict[int, ContactEdge]] = []  # Per node: neighbour node -> edge
+        self._items = []
+        self._source = None  # Item list being tracked
+        self.edge_count = 0
+        self.significant_edge_count = 0
+
+    def add(self, item, nearby) -> List[ContactEdge]:
+        """
+        Add a placed item and its contacts with items already in the graph
+
+        Args:
+            item: Placed item
+            nearby: Candidate neighbours in placement order (a superset of the touching items)
+
+        Returns:
+            list: Edges of the new item, in neighbour placement order
+        """
+        node = len(self._items)
+        self._nodes[id(item)] = node
+        self._items.append(item)
+        edges = {}
+        self._edges.append(edges)
+        if not getattr(item, 'position', None):
+            return []
+        for other in nearby:
+            other_node = self._nodes.get(id(other))
+            if other_node is None or other_node == node or not other.position:
+                continue
+            contact = face_contact(item.position, item.dimensions, other.position, other.dimensions)
+            if contact is None:
+                continue
+            edges[other_node], self._edges[other_node][node] = contact
+            self.edge_count += 1
+            self.significant_edge_count += contact[0].significant
+        return list(edges.values())
+
+    def pop(self):
+        """Remove the most recently added item and its edges, and return it"""
+        item = self._items.pop()
+        node = len(self._items)
+        for other_node, edge in self._edges.pop().items():
+            del self._edges[other_node][node]
+            self.edge_count -= 1
+            self.significant_edge_count -= edge.significant
+        del self._nodes[id(item)]
+        return item
+
+    def sync(self, items, find_nearby: Callable) -> None:
+        """
+        Bring the graph up to date with a container's item list
+
+        Args:
+            items: The container's placed items
+            find_nearby: find_nearby(position, dimensions) -> candidate neighbours in placement order
+        """
+        common = shared_prefix(items, self._items, items is self._source)
+        self._source = items
+        while len(self._items) > common:
+            self.pop()
+        for item in items[common:]:
+            nearby = find_nearby(item.position, item.dimensions) if getattr(item, 'position', None) else []
+            self.add(item, nearby)
+
+    def node(self, item) -> Optional[int]:
+        """Node index of an item, or None if it is not in the graph"""
+        return self._nodes.get(id(item))
+
+    def edges(self, item) -> List[Tuple]:
+        """(neighbour item, ContactEdge) pairs of an item in the graph, in neighbour placement order"""
+        items = self._items
+        return [(items[other], edge) for other, edge in self._edges[self._nodes[id(item)]].items()]
+
+    def degree(self, item, significant_only=False) -> int:
+        """Number of items touching an item"""
+        edges = self._edges[self._nodes[id(item)]].values()
+        if significant_only:
+            return sum(1 for edge in edges if edge.significant)
+        return len(edges)
+
+    def support_area(self, item) -> float:
+        """Footprint area of an item resting on the items directly below it"""
+        area = 0
+        for edge in self._edges[self._nodes[id(item)]].values():
+            if edge.supports:
+                area += edge.base_overlap
+        return area
+
+    def supporters(self, item) -> List:
+        """Items directly below an item whose top faces carry it, in placement order"""
+        items = self._items
+        return [items[other] for other, edge in self._edges[self._nodes[id(item)]].items() if edge.supports]
+
+    def neighbours(self, item, significant_only=False) -> List:
+        """Items touching an item, in placement order"""
+        items = self._items
+        return [items[other] for other, edge in self._edges[self._nodes[id(item)]].items()
+                if edge.significant or not significant_only]
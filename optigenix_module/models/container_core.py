@@ -1,35 +1,90 @@
 """
 Core functionality for the EnhancedContainer class
 """
-import numpy as np
-from typing import List, Tuple
+import copy
+from typing import List, NamedTuple, Tuple
 
 from optigenix_module.models.item import Item
 from optigenix_module.models.space import MaximalSpace
+from optigenix_module.models.spatial_index import SpatialGrid
+from optigenix_module.models.height_map import HeightMap
+from optigenix_module.models.item_spec import PlacementTable
+from optigenix_module.models.contact_graph import ContactGraph
+from optigenix_module.models.metrics_accumulator import MetricsAccumulator
+from optigenix_module.models.orientation_table import OrientationTable
+from optigenix_module.models.space_manager import MaximalSpaceManager
 from modules.utils import check_overlap_2d
 
+class ContainerSnapshot(NamedTuple):
+    """Saved packing state of a container, see ContainerCore.snapshot()"""
+    state: tuple               # Placed items and free spaces (_capture_state)
+    unpacked_reasons: dict
+    weight_distribution: dict
+    metrics: tuple             # volume_utilization, total_weight, remaining_volume, center_of_gravity
+    packing_start: object = None  # Snapshot alternative arrangements are replayed from, if any
+
 class ContainerCore:
     """Contains core container operations and basic geometry checks"""
     
+    def _get_spatial_index(self) -> SpatialGrid:
+        """Return the spatial index of placed items, synced with self.items"""
+        index = getattr(self, '_spatial_index', None)
+        if index is None:
+            index = self._spatial_index = SpatialGrid(self.dimensions)
+        index.sync(self.items)
+        return index
+
+    def _get_placements(self) -> PlacementTable:
+        """Return the struct-of-arrays table of placed items, synced with self.items"""
+        table = getattr(self, '_placements', None)
+        if table is None:
+            table = self._placements = PlacementTable()
+        table.sync(self.items)
+        return table
+
+    def _get_contact_graph(self) -> ContactGraph:
+        """Return the face-contact graph of placed items, synced with self.items"""
+        graph = getattr(self, '_contact_graph', None)
+        if graph is None:
+            graph = self._contact_graph = ContactGraph()
+        graph.sync(self.items, self._get_items_near)
+        return graph
+
+    def _get_metrics(self) -> MetricsAccumulator:
+        """Return the running volume, weight and CoG totals, synced with self.items"""
+        totals = getattr(self, '_metrics', None)
+        if totals is None:
+            totals = self._metrics = MetricsAccumulator(self.dimensions)
+        totals.sync(self.items)
+        return totals
+
+    def enable_height_map(self, resolution=0.05) -> HeightMap:
+        """
+        Answer support queries from a top-surface height map instead of item scans
+
+        Args:
+            resolution: Cell size of the height map in metres
+
+        Returns:
+            HeightMap: The container's height map
+        """
+        self.height_map = HeightMap(self.dimensions, resolution)
+        return self.height_map
+
+    def _get_items_near(self, pos, dims, margin=0.001) -> List[Item]:
+        """Placed items that may touch or overlap the given box, in placement order"""
+        return self._get_spatial_index().query(*pos, *dims, margin=margin)
+
+    def _get_orientation_table(self) -> OrientationTable:
+        """Return the memoized table of valid item orientations for this container"""
+        table = getattr(self, '_orientation_table', None)
+        if table is None:
+            table = self._orientation_table = OrientationTable(self.dimensions)
+        return table
+
     def _get_valid_rotations(self, item):
-        """Get all valid rotations considering container constraints"""
-        rotations = []
-        l, w, h = item.dimensions
-        
-        # Base orientations
-        possible_rotations = [
-            (l, w, h), (l, h, w),
-            (w, l, h), (w, h, l),
-            (h, l, w), (h, w, l)
-        ]
-        
-        # Filter rotations based on container dimensions and item properties
-        for rot in possible_rotations:
-            if (all(d <= max_d for d, max_d in zip(rot, self.dimensions)) and
-                (item.fragility != 'HIGH' or rot[2] <= item.dimensions[2])):
-                rotations.append(rot)
-        
-        return rotations
+        """Get the distinct rotations that fit the container and respect the item's fragility"""
+        return list(self._get_orientation_table().orientations(item.dimensions, item.fragility == 'HIGH'))
 
     def _check_overlap_2d(self, rect1: Tuple[float, float, float, float], 
                        rect2: Tuple[float, float, float, float]) -> bool:
@@ -71,7 +126,8 @@ class ContainerCore:
             return False
             
         # Check overlap with other items
-        for placed_item in self.items:
+        index = self._get_spatial_index()
+        for placed_item in index.query(x, y, z, w, d, h, ordered=False):
             if self._check_overlap_3d(
                 (x, y, z, w, d, h),
                 (placed_item.position[0], placed_item.position[1], placed_item.position[2],
@@ -109,7 +165,7 @@ class ContainerCore:
                       # Check if current item can support weight above it based on its fragility
             if item.fragility == 'HIGH':
                 # Don't allow any items to be stacked on high fragility items
-                for placed_item in self.items:
+                for placed_item in index.query(x, y, z + h, w, d, self.dimensions[2] - (z + h), ordered=False):
                     if (placed_item.position and 
                         placed_item.position[2] > z + h and
                         check_overlap_2d(
@@ -127,7 +183,15 @@ class ContainerCore:
         w, d = dims
         items_below = []
         
-        for item in self.items:
+        candidates = None
+        height_map = getattr(self, 'height_map', None)
+        if height_map is not None:
+            height_map.sync(self.items)
+            candidates = height_map.items_below(x, y, z, w, d)
+        if candidates is None:
+            candidates = self._get_spatial_index().query(x, y, z, w, d, 0)
+        
+        for item in candidates:
             if (abs(item.position[2] + item.dimensions[2] - z) < 0.001 and
                 check_overlap_2d(
                     (x, y, w, d),
@@ -146,7 +210,7 @@ class ContainerCore:
         x, y, z = pos
         w, d, h = dims
           # Check if there's an item directly below
-        for item in self.items:
+        for item in self._get_spatial_index().query(x, y, z, w, d, 0, ordered=False):
             if (item.position[2] + item.dimensions[2] == z and
                 check_overlap_2d(
                     (x, y, w, d),
@@ -156,79 +220,132 @@ class ContainerCore:
                 return True
         return False
 
-    def _can_merge_spaces(self, s1: MaximalSpace, s2: MaximalSpace) -> bool:
-        """Check if two spaces can be merged"""
-        # Check if spaces are adjacent and have same dimensions in two directions
-        return ((s1.x + s1.width == s2.x or s2.x + s2.width == s1.x) and
-                s1.y == s2.y and s1.z == s2.z and
-                s1.height == s2.height and s1.depth == s2.depth)
-
-    def _merge_two_spaces(self, s1: MaximalSpace, s2: MaximalSpace) -> MaximalSpace:
-        """Merge two spaces into one"""
-        x = min(s1.x, s2.x)
-        width = s1.width + s2.width
-        return MaximalSpace(x, s1.y, s1.z, width, s1.height, s1.depth)
-
-    def _merge_spaces(self):
-        """Merge overlapping spaces"""
-        # First sort spaces by size and position to prioritize optimal merging
-        self.spaces.sort(key=lambda s: (-s.get_volume(), s.x, s.y, s.z))
-        
-        i = 0
-        while i < len(self.spaces):
-            j = i + 1
-            while j < len(self.spaces):
-                if self._can_merge_spaces(self.spaces[i], self.spaces[j]):
-                    self.spaces[i] = self._merge_two_spaces(self.spaces[i], self.spaces[j])
-                    self.spaces.pop(j)
-                else:
-                    j += 1
-            i += 1
-            
-        # Sort spaces by position and size for optimal placement
-        self.spaces.sort(key=lambda s: (
-            s.z,  # Prioritize lower heights first
-            s.x**2 + s.y**2,  # Prefer spaces closer to origin
-            -s.get_volume(),  # Prefer larger spaces for better fitting
-            min(s.width, s.depth)  # Prefer spaces with similar dimensions for better interlocking
-        ))
+    def _get_space_manager(self) -> MaximalSpaceManager:
+        """Return the manager holding the container's free spaces"""
+        manager = getattr(self, '_space_manager', None)
+        if manager is None:
+            manager = self._space_manager = MaximalSpaceManager(
+                dimensions=self.dimensions, count_adjacent=self._count_adjacent_items)
+        return manager
+
+    def _count_adjacent_items(self, bounds) -> int:
+        """Number of placed items touching the box given by its corner coordinates"""
+        x1, y1, z1, x2, y2, z2 = bounds
+        tolerance = 0.001
+        count = 0
+        for item in self._get_spatial_index().query(x1, y1, z1, x2 - x1, y2 - y1, z2 - z1, ordered=False):
+            ix, iy, iz = item.position
+            iw, id_, ih = item.dimensions
+            if (ix <= x2 + tolerance and x1 <= ix + iw + tolerance and
+                    iy <= y2 + tolerance and y1 <= iy + id_ + tolerance and
+                    iz <= z2 + tolerance and z1 <= iz + ih + tolerance):
+                count += 1
+        return count
+
+    def set_space_order(self, key) -> None:
+        """
+        Choose the order in which free spaces are offered for placement
+
+        Args:
+            key: Ordering policy from optigenix_module.models.space_manager,
+                e.g. origin_space_key (default) or interlocking_space_key
+        """
+        self._get_space_manager().reorder(key)
+
+    @property
+    def spaces(self) -> List[MaximalSpace]:
+        """Free spaces, ordered best candidate first"""
+        return self._get_space_manager().spaces
+
+    @spaces.setter
+    def spaces(self, spaces):
+        self._get_space_manager().reset(spaces)
 
     def _update_spaces(self, pos, dims, used_space=None):
-        """Update available spaces after placing an item"""
-        x, y, z = pos
-        w, d, h = dims
-        
-        if used_space:
-            # Remove used space
-            self.spaces.remove(used_space)
-            
-            # Generate new spaces
-            new_spaces = []
-            
-            # Space above the item
-            if used_space.height > h:
-                new_spaces.append(MaximalSpace(
-                    x, y, z + h,
-                    w, used_space.height - h, d
-                ))
-                
-            # Space to the right
-            if used_space.width > w:
-                new_spaces.append(MaximalSpace(
-                    x + w, y, z,
-                    used_space.width - w, used_space.height, used_space.depth
-                ))
-                
-            # Space to the front
-            if used_space.depth > d:
-                new_spaces.append(MaximalSpace(
-                    x, y + d, z,
-                    used_space.width, used_space.height, used_space.depth - d
-                ))
-            
-            # Add new spaces and merge overlapping ones
-            self.spaces.extend(new_spaces)
-            self._merge_spaces()
+        """
+        Update available spaces after placing an item
+
+        Every free space overlapping the placed item (not only the space it was
+        placed in) is split into the maximal spaces around the item. Without a
+        route temperature, temperature-safe spaces are pruned like any other.
+        """
+        flag_aware = getattr(self, 'route_temperature', None) is not None
+        self._get_space_manager().place_box(pos, dims, flag_aware)
+
+    def _capture_state(self):
+        """
+        Capture the mutable packing state (placed items and free spaces)
+
+        Placed items and space objects are never modified after creation, so
+        the item list is saved as a tuple and the free spaces as a
+        copy-on-write checkpoint of the space manager.
+        """
+        return (tuple(self.items), self._get_space_manager().checkpoint())
+
+    def _restore_state(self, state):
+        """Restore packing state captured by _capture_state"""
+        items, spaces = state
+        self.items[:] = items
+        self._get_space_manager().restore(spaces)
+
+    def snapshot(self) -> ContainerSnapshot:
+        """
+        Save the packing state so it can be restored with rollback() or fork()
+
+        Taking a snapshot copies only references: the item list, the free-space
+        checkpoint, the unpacked reasons and the weight distribution. Items
+        placed by pack_items after the snapshot keep their new positions on
+        rollback, so branches that must not disturb the original Item objects
+        should pack copies.
+        """
+        metrics = (getattr(self, 'volume_utilization', 0.0), getattr(self, 'total_weight', 0),
+                   getattr(self, 'remaining_volume', None), getattr(self, 'center_of_gravity', None))
+        return ContainerSnapshot(self._capture_state(), dict(getattr(self, 'unpacked_reasons', {})),
+                                 dict(getattr(self, 'weight_distribution', {})), metrics,
+                                 getattr(self, '_packing_start', None))
+
+    def rollback(self, snapshot: ContainerSnapshot) -> None:
+        """
+        Return to a state saved by snapshot()
+
+        The spatial index, placement table, contact graph and running metrics
+        undo only the placements made since the snapshot, so exploring a
+        branch and rolling it back costs time proportional to the changes.
+        """
+        self._restore_state(snapshot.state)
+        self.unpacked_reasons = dict(snapshot.unpacked_reasons)
+        self.weight_distribution = dict(snapshot.weight_distribution)
+        self.volume_utilization, self.total_weight, self.remaining_volume, self.center_of_gravity = snapshot.metrics
+        self._packing_start = snapshot.packing_start
+
+    def fork(self, snapshot: ContainerSnapshot = None):
+        """
+        Create an independent container in the current or a saved state
+
+        The fork has its own item list and free spaces (copy-on-write from the
+        snapshot) and shares this container's derived indexes, which follow
+        whichever container queries them by undoing and replaying only the
+        placements where the two differ. Use a container and its forks from
+        one thread at a time.
+
+        Args:
+            snapshot: State to start from (defaults to the current state)
+
+        Returns:
+            EnhancedContainer: The forked container
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        manager = self._get_space_manager()
+        clone = copy.copy(self)
+        clone.items = []
+        if isinstance(getattr(self, 'unpacked_items', None), list):
+            clone.unpacked_items = list(self.unpacked_items)
+        clone._space_manager = MaximalSpaceManager(key=manager.key, min_size=manager.min_size,
+                                                   dimensions=self.dimensions,
+                                                   count_adjacent=clone._count_adjacent_items)
+        clone.rollback(snapshot)
+        return clone
 
     def _check_stackability(self, item: Item, pos: Tuple[float, float, float]) -> bool:
         """Check if an item can be stacked at the given position"""
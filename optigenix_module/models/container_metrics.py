@@ -8,18 +8,20 @@ from modules.utils import calculate_overlap_area, check_overlap_2d
 class ContainerMetrics:
     """Contains methods for calculating metrics and scores"""
     
+    @property
+    def weight_map(self) -> np.ndarray:
+        """Grid of placed weight over the container floor (rows along y, columns along x)"""
+        return self._get_metrics().weight_map
+
     def _update_metrics(self):
         """Enhanced metrics calculation with error handling"""
         try:
-            # Calculate packed volume safely
-            packed_volume = sum(
-                max(0, item.dimensions[0]) * max(0, item.dimensions[1]) * max(0, item.dimensions[2])
-                for item in self.items
-            )
+            totals = self._get_metrics()
+            packed_volume = totals.packed_volume
             
             # Update metrics with bounds checking - store as decimal (0.0-1.0) not percentage
             self.volume_utilization = min(1.0, packed_volume / max(0.001, self.total_volume))
-            self.total_weight = sum(max(0, item.weight) for item in self.items)
+            self.total_weight = totals.total_weight
             self.remaining_volume = max(0, self.total_volume - packed_volume)
 
             # Update center of gravity
@@ -35,17 +37,11 @@ class ContainerMetrics:
 
     def _update_center_of_gravity(self):
         """Calculate center of gravity after each item placement"""
-        total_moment = np.array([0.0, 0.0, 0.0])
-        self.total_weight = 0
-        
-        for item in self.items:
-            pos = np.array(item.position)
-            center = pos + np.array(item.dimensions) / 2
-            total_moment += center * item.weight
-            self.total_weight += item.weight
+        totals = self._get_metrics()
+        self.total_weight = totals.total_weight
             
         if self.total_weight > 0:
-            self.center_of_gravity = total_moment / self.total_weight
+            self.center_of_gravity = np.array(totals.moments) / self.total_weight
 
     def _update_weight_distribution(self, item) -> None:
         """Update weight distribution when placing a new item"""
@@ -58,12 +54,6 @@ class ContainerMetrics:
         if section not in self.weight_distribution:
             self.weight_distribution[section] = 0
         self.weight_distribution[section] += item.weight
-        
-        # Update weight map for detailed balance calculation
-        col = int((x / self.dimensions[0]) * self.weight_map.shape[1])
-        row = int((item.position[1] / self.dimensions[1]) * self.weight_map.shape[0])
-        if 0 <= row < self.weight_map.shape[0] and 0 <= col < self.weight_map.shape[1]:
-            self.weight_map[row, col] += item.weight
 
     def _calculate_weight_balance_score(self) -> float:
         """Calculate overall weight balance score"""
@@ -87,13 +77,8 @@ class ContainerMetrics:
         if not self.items:
             return 0.0
             
-        total_contacts = 0
-        for item in self.items:
-            for other in self.items:
-                if item != other and self._has_surface_contact(
-                    item.position, item.dimensions, other
-                ):
-                    total_contacts += 1
+        # Every significant contact counts once for each of the two items
+        total_contacts = 2 * self._get_contact_graph().significant_edge_count
                     
         # Return normalized score (0-1, higher is better)
         max_possible_contacts = len(self.items) * 6  # Each item can touch 6 sides
@@ -105,23 +90,25 @@ class ContainerMetrics:
         w, d, h = dims
         score = 0
         
-        # Check support from below
-        support_area = 0
-        total_area = w * d
-        items_below = self._get_items_below(pos, (w, d))
-        
         # Ground placement is most stable
         if z == 0:
             return 1.0
             
-        # Calculate support from items below
-        for below_item in items_below:
-            overlap = self._calculate_overlap_area(
-                (x, y, w, d),
-                (below_item.position[0], below_item.position[1],
-                 below_item.dimensions[0], below_item.dimensions[1])
-            )
-            support_area += overlap
+        # Check support from below
+        total_area = w * d
+        graph = self._get_contact_graph()
+        if graph.node(item) is not None and tuple(item.position) == tuple(pos) and tuple(item.dimensions) == tuple(dims):
+            support_area = graph.support_area(item)
+        else:
+            # Hypothetical placement: scan the items below
+            support_area = 0
+            for below_item in self._get_items_below(pos, (w, d)):
+                overlap = self._calculate_overlap_area(
+                    (x, y, w, d),
+                    (below_item.position[0], below_item.position[1],
+                     below_item.dimensions[0], below_item.dimensions[1])
+                )
+                support_area += overlap
             
         # Calculate support ratio
         support_ratio = support_area / total_area
@@ -182,11 +169,9 @@ class ContainerMetrics:
 
     def _evaluate_cog_impact(self, item, pos):
         """Evaluate how an item placement affects center of gravity"""
-        temp_cog = np.array(self.center_of_gravity)
-        temp_weight = self.total_weight
-        
-        item_center = np.array(pos) + np.array(item.dimensions) / 2
-        new_cog = (temp_cog * temp_weight + item_center * item.weight) / (temp_weight + item.weight)
+        totals = self._get_metrics()
+        temp_cog = np.array(totals.center_of_gravity(default=(0, 0, 0)))
+        new_cog = np.array(totals.center_of_gravity_with(pos, item.dimensions, item.weight, default=(0, 0, 0)))
         
         # Prefer positions that keep COG near center
         target = np.array(self.dimensions) / 2
@@ -308,6 +293,7 @@ class ContainerMetrics:
             
         total_contact_area = 0.0
         total_surface_area = 0.0
+        graph = self._get_contact_graph()
         
         for item in self.items:
             if not (hasattr(item, 'position') and item.position and hasattr(item, 'dimensions')):
@@ -318,13 +304,9 @@ class ContainerMetrics:
             item_surface_area = 2 * (w*d + w*h + d*h)
             total_surface_area += item_surface_area
             
-            # Calculate contact area with other items
-            for other_item in self.items:
-                if item != other_item and hasattr(other_item, 'position') and other_item.position:
-                    contact_area = self._calculate_contact_area_between_items(
-                        item.position, item.dimensions, other_item
-                    )
-                    total_contact_area += contact_area
+            # Contact area with the items touching this one
+            for _, edge in graph.edges(item):
+                total_contact_area += edge.area
         
         # Avoid double counting (each contact is counted twice in the loop above)
         total_contact_area /= 2
@@ -371,7 +353,7 @@ class ContainerMetrics:
         w, d = base_dims
         
         items_below = []
-        for item in self.items:
+        for item in self._get_spatial_index().query(x, y, 0, w, d, z):
             if not (hasattr(item, 'position') and item.position):
                 continue
                 
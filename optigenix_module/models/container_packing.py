@@ -2,11 +2,12 @@
 Packing algorithms for the EnhancedContainer class
 """
 from typing import List, Tuple, Dict
-import numpy as np
+import copy
 import logging
 
 from optigenix_module.models.item import Item
 from optigenix_module.models.space import MaximalSpace
+from optigenix_module.models.placement_kernel import evaluate_candidates, layer_candidates
 from modules.utils import check_overlap_2d
 
 # Initialize logger
@@ -14,22 +15,36 @@ logger = logging.getLogger(__name__)
 
 """Converted to use utility function - contents moved to utils.py"""
 
+DEFAULT_CONSTRAINT_WEIGHTS = {
+    'volume_utilization_weight': 0.75,
+    'stability_score_weight': 0.50,
+    'contact_ratio_weight': 0.50,
+    'weight_balance_weight': 0.25,
+    'items_packed_ratio_weight': 0.25,
+    'temperature_constraint_weight': 0.30
+}
+
+# Orders used to re-pack the rest of a plan in alternative arrangements
+ALTERNATIVE_ORDERS = (
+    ('largest base first', lambda item: (-(item.dimensions[0] * item.dimensions[1]), item.dimensions[2])),
+    ('heaviest first', lambda item: -item.weight),
+    ('largest volume first', lambda item: -(item.dimensions[0] * item.dimensions[1] * item.dimensions[2])),
+    ('tallest first', lambda item: -item.dimensions[2]),
+    ('smallest first', lambda item: item.dimensions[0] * item.dimensions[1] * item.dimensions[2]),
+)
+
 class ContainerPacking:
     """Contains methods for packing items into the container"""
+
+    # Check and score layer candidates with the batched NumPy kernel instead of per-candidate loops
+    use_placement_kernel = True
     
     def pack_items(self, items: List[Item], route_temperature=None, constraint_weights=None):
         """Pack items with improved temperature constraint handling and constraint weights"""
         self.route_temperature = route_temperature  # Store route temperature for constraint checking
         
         # Initialize constraint weights with defaults if not provided
-        self.constraint_weights = constraint_weights or {
-            'volume_utilization_weight': 0.75,
-            'stability_score_weight': 0.50,
-            'contact_ratio_weight': 0.50,
-            'weight_balance_weight': 0.25,
-            'items_packed_ratio_weight': 0.25,
-            'temperature_constraint_weight': 0.30
-        }
+        self.constraint_weights = constraint_weights or dict(DEFAULT_CONSTRAINT_WEIGHTS)
         
         logger.info("Standard packing using constraint weights:")
         logger.info(f"  Volume: {self.constraint_weights['volume_utilization_weight']:.2f} | " +
@@ -120,10 +135,15 @@ class ContainerPacking:
                 self.dimensions[2]                    # height
             )
             safe_zone.temperature_safe = True
-            self.spaces.append(safe_zone)
+            self._get_space_manager().add(safe_zone)
             print(f"🌡️ Created temperature-safe zone: {wall_buffer:.2f}m from all walls")
             print(f"   Safe zone dimensions: {safe_zone.x:.2f}, {safe_zone.y:.2f}, {safe_zone.z:.2f}, {safe_zone.width:.2f}, {safe_zone.depth:.2f}, {safe_zone.height:.2f}")
         
+        # Starting point for alternative arrangements (generate_multiple_arrangements), taken
+        # before the first batch so later batches are replayed on top of it
+        if not self.items or getattr(self, '_packing_start', None) is None:
+            self._packing_start = self.snapshot()
+        
         # Pack each item with improved wall constraints
         for item in sorted_items:
             # If this is a temperature-sensitive item, print comprehensive debug info
@@ -133,31 +153,121 @@ class ContainerPacking:
                 print(f"   Temperature range: {item.temperature_sensitivity}")
                 print(f"   Temperature constraint: Must be > {wall_buffer:.2f}m from all walls")
             
-            # Try to pack at the bottom layer first
-            if not self._try_pack_in_layer(item, 0):
-                # Try on existing layers
-                packed = False
-                for height in sorted(set(i.position[2] + i.dimensions[2] 
-                                  for i in self.items if i.position)):
-                    if self._try_pack_in_layer(item, height):
-                        packed = True
-                        break
-                        
-                if not packed:
-                    base_name = item.name.rsplit('_', 1)[0] if '_' in item.name else item.name
-                    # Get detailed reason why packing failed
-                    reason = self._get_unpacking_reason(item)
-                    if getattr(item, 'needs_insulation', False):
-                        reason = f"Temperature-sensitive item could not be placed with proper wall clearance: {reason}"
-                    
-                    self.unpacked_reasons[item.name] = (reason, item)
-                    
-                    if getattr(item, 'needs_insulation', False):
-                        print(f"❌ Failed to place temperature-sensitive item {item.name}: {reason}")
+            if not self._pack_in_layers(item):
+                self._record_unpacked(item)
 
         # Calculate volume utilization and total weight
         self._update_metrics()
 
+    def _pack_in_layers(self, item: Item) -> bool:
+        """Try the bottom layer first, then the tops of the placed items from low to high"""
+        if self._try_pack_in_layer(item, 0):
+            return True
+        for height in sorted(set(i.position[2] + i.dimensions[2] 
+                          for i in self.items if i.position)):
+            if self._try_pack_in_layer(item, height):
+                return True
+        return False
+
+    def _record_unpacked(self, item: Item) -> None:
+        """Store the reason an item could not be packed"""
+        # Get detailed reason why packing failed
+        reason = self._get_unpacking_reason(item)
+        if getattr(item, 'needs_insulation', False):
+            reason = f"Temperature-sensitive item could not be placed with proper wall clearance: {reason}"
+        
+        self.unpacked_reasons[item.name] = (reason, item)
+        
+        if getattr(item, 'needs_insulation', False):
+            print(f"❌ Failed to place temperature-sensitive item {item.name}: {reason}")
+
+    def generate_multiple_arrangements(self, count=5, keep_fractions=(0.75, 0.5, 0.25)):
+        """
+        Generate alternative arrangements branching from the current plan
+
+        The current placements are replayed once from the start of packing,
+        taking a snapshot at each branch point. Each alternative forks one of
+        those snapshots, keeping the first part of the plan (the bottom
+        layers), and re-packs copies of the remaining and unpacked items in a
+        different order. N alternatives therefore cost one replay plus N
+        partial re-packs instead of N full packings, and this container is
+        left unchanged.
+
+        Args:
+            count: Number of alternatives to generate
+            keep_fractions: Fractions of the placed items kept, cycled over the alternatives
+
+        Returns:
+            list: (container, score) pairs sorted by score, best first
+        """
+        placed = [item for item in self.items if item.position]
+        unpacked = [item for _, item in self.unpacked_reasons.values()] or list(getattr(self, 'unpacked_items', []))
+        if not placed and not unpacked:
+            return []
+
+        # Replay from the start of packing unless the plan no longer extends it (e.g. after a rollback)
+        start = getattr(self, '_packing_start', None)
+        start_items = list(start.state[0]) if start is not None else []
+        if start is not None and start_items == placed[:len(start_items)]:
+            base = self.fork(start)
+            base.unpacked_reasons = {}  # Every unpacked item is re-packed by the alternatives
+        else:
+            base = type(self)(self.dimensions, getattr(self, 'route_temperature', None))
+            base.constraint_weights = getattr(self, 'constraint_weights', None)
+            start_items = []
+
+        # Replay the plan once, saving the state at every branch point; items already in the start stay
+        plans = [(max(len(start_items), int(len(placed) * keep_fractions[i % len(keep_fractions)])),
+                  ALTERNATIVE_ORDERS[i % len(ALTERNATIVE_ORDERS)])
+                 for i in range(count)]
+        branch_points = {keep for keep, _ in plans}
+        snapshots = {}
+        for index in range(len(start_items), len(placed) + 1):
+            item = placed[index] if index < len(placed) else None
+            if index in branch_points:
+                snapshots[index] = base.snapshot()
+            if item is None:
+                break
+            base.items.append(item)
+            base._update_spaces(item.position, item.dimensions)
+            base._update_weight_distribution(item)
+
+        arrangements = []
+        for keep, (order_name, order_key) in plans:
+            branch = base.fork(snapshots[keep])
+            remaining = []
+            for item in placed[keep:] + unpacked:
+                item_copy = copy.copy(item)  # Keep the original plan's items untouched
+                item_copy.position = None
+                remaining.append(item_copy)
+            for item in sorted(remaining, key=order_key):
+                if not branch._pack_in_layers(item):
+                    branch._record_unpacked(item)
+            branch.unpacked_items = [item for _, item in branch.unpacked_reasons.values()]
+            branch._update_metrics()
+            branch.arrangement_description = (f"Kept {keep} of {len(placed)} placements, "
+                                              f"re-packed {len(remaining)} items {order_name}")
+            arrangements.append((branch, branch._calculate_arrangement_score()))
+
+        arrangements.sort(key=lambda pair: pair[1], reverse=True)
+        return arrangements
+
+    def _calculate_arrangement_score(self) -> float:
+        """Constraint-weighted score of the arrangement (0-1, higher is better)"""
+        weights = getattr(self, 'constraint_weights', None) or DEFAULT_CONSTRAINT_WEIGHTS
+        total_items = len(self.items) + len(self.unpacked_reasons)
+        scores = {
+            'volume_utilization_weight': self.volume_utilization,
+            'stability_score_weight': self.calculate_overall_stability_score(),
+            'contact_ratio_weight': self.calculate_overall_contact_ratio(),
+            'weight_balance_weight': self._calculate_weight_balance_score(),
+            'items_packed_ratio_weight': len(self.items) / total_items if total_items else 0.0,
+        }
+        total_weight = sum(weights.get(key, 0) for key in scores)
+        if total_weight <= 0:
+            return 0.0
+        return sum(score * weights.get(key, 0) for key, score in scores.items()) / total_weight
+
     def _try_pack_in_layer(self, item: Item, height: float) -> bool:
         """Enhanced packing with better error handling and strict temperature control"""
         try:
@@ -183,9 +293,8 @@ class ContainerPacking:
                 print(f"   Temperature range: {item.temperature_sensitivity}")
                 print(f"   Route temperature: {self.route_temperature}°C")
 
-            # Get valid rotations with dimension checking
-            rotations = [rot for rot in self._get_valid_rotations(item)
-                        if all(d <= max_d for d, max_d in zip(rot, self.dimensions))]
+            # Distinct rotations that fit the container, from the orientation table
+            rotations = self._get_valid_rotations(item)
             
             if not rotations:
                 return False  # No valid rotation found
@@ -195,8 +304,18 @@ class ContainerPacking:
             best_score = float('-inf')
             best_space = None
             
-            # For each rotation, try to find best position
-            for rotation in rotations:
+            # Collect candidate (position, rotation, space) triples for each rotation
+            candidates = []
+            if self.use_placement_kernel:
+                spaces = self.spaces
+                excluded = [space.temperature_safe is False for space in spaces] if needs_temperature_protection else None
+                for rotation_index, space_index in layer_candidates(
+                        self._get_space_manager().extents(), rotations, height, self.dimensions,
+                        0.3 if needs_temperature_protection else None, excluded):
+                    space = spaces[space_index]
+                    candidates.append(((space.x, space.y, height), rotations[rotation_index], space))
+
+            for rotation in (rotations if not self.use_placement_kernel else ()):
                 # Skip if height + item height exceeds container height
                 if height + rotation[2] > self.dimensions[2]:
                     continue
@@ -239,23 +358,39 @@ class ContainerPacking:
                             top_wall_dist < wall_buffer):
                             # Skip this position entirely for temperature-sensitive items
                             continue
-                    
-                    if self._is_valid_placement(item, pos, rotation):
-                        # 🔒 TEMPERATURE CONSTRAINT ENFORCEMENT - PHASE 3 (DETAILED CHECK)
-                        # Additional temperature constraint checks
-                        if hasattr(self, 'route_temperature') and self.route_temperature is not None:
-                            if not self._check_temperature_constraints(item, pos, self.route_temperature):
-                                continue  # Failed temperature constraints
-                        
-                        # Calculate position score
-                        score = self._evaluate_position_enhanced(item, pos, rotation)
-                        
-                        # Update best position if this one has a better score
-                        if score > best_score:
-                            best_score = score
-                            best_pos = pos
-                            best_rot = rotation
-                            best_space = space
+
+                    candidates.append((pos, rotation, space))
+
+            # Check and score all candidates against the placed items in one batch
+            terms = None
+            if candidates and self.use_placement_kernel:
+                terms = evaluate_candidates(
+                    [pos for pos, _, _ in candidates], [rotation for _, rotation, _ in candidates],
+                    self._get_placements(), self.dimensions, item.weight, item.fragility == 'HIGH')
+
+            for index, (pos, rotation, space) in enumerate(candidates):
+                if terms is not None:
+                    if not terms.feasible[index]:
+                        continue
+                elif not self._is_valid_placement(item, pos, rotation):
+                    continue
+
+                # 🔒 TEMPERATURE CONSTRAINT ENFORCEMENT - PHASE 3 (DETAILED CHECK)
+                # Additional temperature constraint checks
+                if hasattr(self, 'route_temperature') and self.route_temperature is not None:
+                    if not self._check_temperature_constraints(item, pos, self.route_temperature):
+                        continue  # Failed temperature constraints
+                
+                # Calculate position score
+                score = self._evaluate_position_enhanced(item, pos, rotation,
+                                                         terms.row(index) if terms is not None else None)
+                
+                # Update best position if this one has a better score
+                if score > best_score:
+                    best_score = score
+                    best_pos = pos
+                    best_rot = rotation
+                    best_space = space
         
             if best_pos and best_rot and best_space:
                 # 🔒 TEMPERATURE CONSTRAINT ENFORCEMENT - PHASE 4 (FINAL VERIFICATION)
@@ -300,8 +435,20 @@ class ContainerPacking:
             print(f"Error packing item {item.name}: {str(e)}")
             return False
 
-    def _evaluate_position_enhanced(self, item, pos, dims):
-        """Enhanced position evaluation with weighted constraints"""
+    def _evaluate_position_enhanced(self, item, pos, dims, terms=None):
+        """
+        Enhanced position evaluation with weighted constraints
+
+        Args:
+            item: Item being placed
+            pos: Candidate position
+            dims: Candidate (rotated) dimensions
+            terms: Precomputed nearest distances and contact terms for the candidate
+                (a CandidateTerms row); computed with the scalar reference checks if omitted
+        """
+        if terms is None:
+            terms = self._candidate_terms(pos, dims)
+
         # Base scores for each constraint category
         constraint_scores = {
             'volume_utilization': 0,
@@ -326,7 +473,7 @@ class ContainerPacking:
         container_volume = self.dimensions[0] * self.dimensions[1] * self.dimensions[2]
         
         # Find nearest items in all 6 directions
-        nearest_distances = self._find_nearest_distances(pos, dims)
+        nearest_distances = terms['nearest_distances']
         wasted_space = sum(nearest_distances)
         
         # Lower wasted space means better volume utilization
@@ -354,13 +501,8 @@ class ContainerPacking:
                 wall_distance_score = 50 + min(50, (min_wall_distance - wall_buffer) * 50)  # 50-100 range
             
             # Count surrounding items for insulation
-            surrounding_items = 0
-            insulating_items = 0
-            for placed_item in self.items:
-                if self._has_surface_contact(pos, dims, placed_item):
-                    surrounding_items += 1
-                    if not getattr(placed_item, 'needs_insulation', False):
-                        insulating_items += 1
+            surrounding_items = terms['contact_count']
+            insulating_items = terms['insulating_count']
             
             # Calculate insulation score
             insulation_score = min(100, (surrounding_items * 10) + (insulating_items * 20))
@@ -369,15 +511,9 @@ class ContainerPacking:
             constraint_scores['temperature_constraint'] = (wall_distance_score * 0.7) + (insulation_score * 0.3)
         
         # --- CONTACT RATIO ---
-        contact_count = 0
-        contact_area = 0
+        contact_area = terms['contact_area']
         total_surface_area = 2 * (w*d + w*h + d*h)
         
-        for placed_item in self.items:
-            if self._has_surface_contact(pos, dims, placed_item):
-                contact_count += 1
-                contact_area += self._calculate_contact_area(pos, dims, placed_item)
-        
         contact_ratio = min(1.0, contact_area / total_surface_area)
         constraint_scores['contact_ratio'] = contact_ratio * 100
         
@@ -419,6 +555,29 @@ class ContainerPacking:
         
         return weighted_score
 
+    def _candidate_terms(self, pos, dims):
+        """
+        Nearest distances and contact terms of one candidate (scalar reference path)
+
+        Returns:
+            dict: Same keys as CandidateTerms.row
+        """
+        contact_count = 0
+        insulating_count = 0
+        contact_area = 0
+        for placed_item in self.items:
+            if self._has_surface_contact(pos, dims, placed_item):
+                contact_count += 1
+                contact_area += self._calculate_contact_area(pos, dims, placed_item)
+                if not getattr(placed_item, 'needs_insulation', False):
+                    insulating_count += 1
+        return {
+            'nearest_distances': self._find_nearest_distances(pos, dims),
+            'contact_area': contact_area,
+            'contact_count': contact_count,
+            'insulating_count': insulating_count,
+        }
+
     def _calculate_support_score(self, item, pos, dims):
         """Calculate support score with reduced constraints"""
         x, y, z = pos
@@ -779,7 +938,7 @@ class ContainerPacking:
             
         items_below = []
         
-        for item in self.items:
+        for item in self._get_spatial_index().query(x, y, z, w, d, 0):
             # Skip items that are not below
             if item.position is None or item.position[2] + item.dimensions[2] > z:
                 continue
@@ -807,15 +966,15 @@ class ContainerPacking:
             return
             
         # Calculate metrics
+        totals = self._get_metrics()
         container_volume = self.dimensions[0] * self.dimensions[1] * self.dimensions[2]
-        used_volume = sum(item.dimensions[0] * item.dimensions[1] * item.dimensions[2] 
-                          for item in self.items if item.position)
+        used_volume = totals.packed_volume
                           
         self.volume_utilization = used_volume / container_volume if container_volume > 0 else 0
         self.remaining_volume = container_volume - used_volume
         
         # Calculate total weight and validate against container max payload
-        self.total_weight = sum(item.weight for item in self.items if item.position)
+        self.total_weight = totals.total_weight
         
         # Check if we have container type information for weight validation
         if hasattr(self, 'container_type') and self.container_type:
@@ -845,8 +1004,17 @@ class ContainerPacking:
             self.dimensions[2] - (z + h)    # Distance to top
         ]
         
-        # Check all items for closer distances
-        for item in self.items:
+        # Only items in the six slabs between the box and the walls can be closer
+        index = self._get_spatial_index()
+        candidates = []  # Duplicates across slabs do not change the minimums
+        for slab in ((0, y, z, x, d, h), (x, 0, z, w, y, h),
+                     (x + w, y, z, self.dimensions[0] - (x + w), d, h),
+                     (x, y + d, z, w, self.dimensions[1] - (y + d), h),
+                     (x, y, 0, w, d, z), (x, y, z + h, w, d, self.dimensions[2] - (z + h))):
+            candidates.extend(index.query(*slab, ordered=False))
+        
+        # Check nearby items for closer distances
+        for item in candidates:
             if item.position is None:
                 continue
                 
@@ -919,61 +1087,14 @@ class ContainerPacking:
 
     def _calculate_current_cog(self):
         """Calculate current center of gravity of packed items"""
-        total_weight = 0
-        weighted_x = 0
-        weighted_y = 0
-        weighted_z = 0
-        
-        for item in self.items:
-            if item.position is None:
-                continue
-                
-            x, y, z = item.position
-            w, d, h = item.dimensions
-            
-            # Calculate item's center position
-            center_x = x + w/2
-            center_y = y + d/2
-            center_z = z + h/2
-            
-            weighted_x += center_x * item.weight
-            weighted_y += center_y * item.weight
-            weighted_z += center_z * item.weight
-            total_weight += item.weight
-        
-        if total_weight == 0:
-            # If no items yet, return container center
-            return (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
-        
-        return (weighted_x/total_weight, weighted_y/total_weight, weighted_z/total_weight)
+        # If no items yet, return container center
+        center = (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
+        return self._get_metrics().center_of_gravity(default=center)
 
     def _calculate_cog_with_new_item(self, item, pos):
         """Calculate what the CoG would be with a new item added"""
-        x, y, z = pos
-        w, d, h = item.dimensions
-        
-        # Calculate total weight and weighted position sums with existing items
-        total_weight = item.weight
-        weighted_x = (x + w/2) * item.weight
-        weighted_y = (y + d/2) * item.weight
-        weighted_z = (z + h/2) * item.weight
-        
-        for packed_item in self.items:
-            if packed_item.position is None:
-                continue
-                
-            ix, iy, iz = packed_item.position
-            iw, id, ih = packed_item.dimensions
-            
-            weighted_x += (ix + iw/2) * packed_item.weight
-            weighted_y += (iy + id/2) * packed_item.weight
-            weighted_z += (iz + ih/2) * packed_item.weight
-            total_weight += packed_item.weight
-        
-        if total_weight == 0:
-            return (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
-        
-        return (weighted_x/total_weight, weighted_y/total_weight, weighted_z/total_weight)
+        center = (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
+        return self._get_metrics().center_of_gravity_with(pos, item.dimensions, item.weight, default=center)
 
     def _calculate_distance(self, point1, point2):
         """Calculate distance between two 3D points"""
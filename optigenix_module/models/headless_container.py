@@ -0,0 +1,73 @@
+"""
+Compute-only container without visualization or reporting dependencies
+"""
+from optigenix_module.models.space import MaximalSpace
+from optigenix_module.models.container_core import ContainerCore
+from optigenix_module.models.container_metrics import ContainerMetrics
+from optigenix_module.models.container_packing import ContainerPacking
+
+class HeadlessContainer(ContainerCore, ContainerMetrics, ContainerPacking):
+    """
+    Container with the geometry, metrics and packing mixins only
+
+    Importing it does not load pandas, plotly or dash, so GA workers and
+    fitness evaluation use it instead of EnhancedContainer, which adds the
+    visualization and reporting mixins on top.
+    """
+    
+    def __init__(self, dimensions, route_temperature=None):
+        """Initialize container with specified dimensions and optional route temperature"""
+        # Validate dimensions
+        if not all(isinstance(d, (int, float)) and d > 0 for d in dimensions):
+            raise ValueError("Container dimensions must be positive numbers")
+        if len(dimensions) != 3:
+            raise ValueError("Container must have exactly 3 dimensions (length, width, height)")
+            
+        self.dimensions = tuple(float(d) for d in dimensions)
+        self.items = []
+        self.height_map = None  # Optional support acceleration, see enable_height_map()
+        
+        # Store route temperature for temperature-sensitive item handling
+        self.route_temperature = route_temperature
+        
+        # Create completely separate space systems for temperature-sensitive and normal items
+        wall_buffer = 0.1  # 10cm buffer from walls
+        
+        # 1. Standard space - for regular items (includes positions near walls)
+        standard_space = MaximalSpace(0, 0, 0, dimensions[0], dimensions[1], dimensions[2])
+        standard_space.temperature_safe = False
+        
+        # 2. Temperature-safe space - with buffer from all walls
+        # This is used exclusively for temperature-sensitive items
+        temp_safe_space = MaximalSpace(
+            wall_buffer,                         # x with buffer from left wall
+            wall_buffer,                         # y with buffer from front wall
+            0,                                   # z starts at bottom
+            dimensions[0] - (2 * wall_buffer),   # width with buffer from both sides
+            dimensions[1] - (2 * wall_buffer),   # depth with buffer from front/back
+            dimensions[2] - wall_buffer          # height with buffer from top
+        )
+        temp_safe_space.temperature_safe = True
+        
+        # Initialize with both spaces - they'll be kept separate throughout packing
+        self.spaces = [standard_space, temp_safe_space]
+        
+        # Initialize other container properties
+        self.weight_distribution = {}
+        self.volume_utilization = 0.0
+        self.layer_height = 0
+        self.center_of_gravity = [0, 0, 0]
+        self.unpacked_reasons = {}
+        self.total_weight = 0
+        self.unused_spaces = []  # Track remaining spaces
+        self.unpacked_reasons = {}  # Enhanced reasons tracking
+        self.total_volume = dimensions[0] * dimensions[1] * dimensions[2]
+        self.remaining_volume = self.total_volume
+        self.support_mechanisms = []  # Track support mechanisms used
+        
+        if route_temperature is not None:
+            print(f"\n🌡️ CONTAINER INITIALIZED WITH TEMPERATURE SYSTEM")
+            print(f"   Route temperature: {route_temperature}°C")
+            print(f"   Temperature-sensitive items will use temperature-safe spaces")
+            print(f"   Wall buffer: {wall_buffer*100:.1f}cm from all container walls")
+            print(f"   Available space for temperature-sensitive items: {temp_safe_space.width:.2f}m × {temp_safe_space.depth:.2f}m × {temp_safe_space.height:.2f}m\n")
@@ -0,0 +1,115 @@
+"""
+Height map (skyline) of the top surface of packed items
+"""
+import math
+from typing import List, Optional
+
+import numpy as np
+
+from optigenix_module.models.item_tracking import shared_prefix
+
+# Matches the tolerance used by the container geometry checks
+TOLERANCE = 0.001
+
+class HeightMap:
+    """
+    Discretized top-surface height map of a container floor
+
+    Each cell stores the highest item top over it, the placement index of that
+    item and how many items have their top within 2 * TOLERANCE of it. Support
+    queries for a footprint at height z are answered with NumPy slices over the
+    footprint cells instead of scanning placed items.
+
+    This is an optional acceleration layer that gives the same answers as the
+    exact scan or none at all: when part of the footprint lies under a higher
+    surface, or a footprint cell near height z is shared by items of (nearly)
+    the same height, the map cannot tell which of them are below and queries
+    return None so callers fall back to the exact checks.
+    """
+
+    def __init__(self, dimensions, resolution=0.05):
+        """Initialize a flat height map over the container floor"""
+        self.dimensions = tuple(float(d) for d in dimensions)
+        self.resolution = float(resolution)
+        self.shape = (max(1, math.ceil(self.dimensions[0] / self.resolution)),
+                      max(1, math.ceil(self.dimensions[1] / self.resolution)))
+        self.clear()
+
+    def clear(self) -> None:
+        """Reset the map to an empty floor"""
+        self.heights = np.zeros(self.shape)
+        self.top_ids = np.full(self.shape, -1, dtype=np.int32)
+        self.top_counts = np.zeros(self.shape, dtype=np.int32)  # Items with their top near the cell height
+        self._items = []
+        self._undo = []      # Per item: footprint cells and their previous heights, top ids and counts
+        self._source = None  # Item list being tracked
+
+    def _footprint(self, x, y, w, d):
+        """Slices of the cells a footprint covers with positive area"""
+        res = self.resolution
+        i0 = max(0, math.floor(x / res + TOLERANCE))
+        i1 = min(self.shape[0], math.ceil((x + w) / res - TOLERANCE))
+        j0 = max(0, math.floor(y / res + TOLERANCE))
+        j1 = min(self.shape[1], math.ceil((y + d) / res - TOLERANCE))
+        return slice(i0, max(i0, i1)), slice(j0, max(j0, j1))
+
+    def place(self, item) -> None:
+        """Raise the cells under a placed item to its top face"""
+        index = len(self._items)
+        self._items.append(item)
+        if not getattr(item, 'position', None):
+            self._undo.append(None)
+            return
+        x, y, z = item.position
+        w, d, h = item.dimensions
+        cells = self._footprint(x, y, w, d)
+        heights, top_ids, top_counts = self.heights[cells], self.top_ids[cells], self.top_counts[cells]
+        self._undo.append((cells, heights.copy(), top_ids.copy(), top_counts.copy()))
+        top = z + h
+        # Well above the cell: the item is the only one near the new height
+        higher = top > heights + 2 * TOLERANCE
+        # Near the cell height: one more item shares it
+        tied = ~higher & (top >= heights - 2 * TOLERANCE)
+        top_counts[tied] += 1
+        top_counts[higher] = 1
+        raised = higher | (tied & (top > heights))
+        top_ids[raised] = index
+        heights[raised] = top
+
+    def pop(self):
+        """Undo the most recent placement and return its item"""
+        undo = self._undo.pop()
+        if undo is not None:
+            cells, heights, top_ids, top_counts = undo
+            self.heights[cells] = heights
+            self.top_ids[cells] = top_ids
+            self.top_counts[cells] = top_counts
+        return self._items.pop()
+
+    def sync(self, items) -> None:
+        """Bring the map up to date with a container's item list"""
+        common = shared_prefix(items, self._items, items is self._source)
+        self._source = items
+        while len(self._items) > common:
+            self.pop()
+        for item in items[common:]:
+            self.place(item)
+
+    def items_below(self, x, y, z, w, d) -> Optional[List]:
+        """
+        Items whose top face is within TOLERANCE of height z under the footprint, in placement order
+
+        Returns:
+            list or None: None if part of the footprint is covered by a surface above z
+            (e.g. the footprint of an already placed item) or a footprint cell near z
+            holds more than one item top, where callers should fall back to an exact scan
+        """
+        cells = self._footprint(x, y, w, d)
+        heights = self.heights[cells]
+        if (heights > z + TOLERANCE).any():
+            return None
+        near = heights >= z - TOLERANCE
+        if (self.top_counts[cells][near] > 1).any():
+            return None
+        ids = np.unique(self.top_ids[cells][near & (np.abs(heights - z) < TOLERANCE)])
+        return [self._items[i] for i in ids.tolist() if i >= 0]
@@ -0,0 +1,247 @@
+"""
+Compact item tables and placement records for fitness evaluation
+"""
+import numpy as np
+
+from optigenix_module.models.item_tracking import shared_prefix
+
+FRAGILITY_CODES = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2}
+
+def parse_temperature_range(value):
+    """
+    Parse a temperature sensitivity string such as "2°C to 8°C"
+
+    Returns:
+        tuple: (min_temp, max_temp), or (nan, nan) if the item has no range
+    """
+    if not value or 'n/a' in str(value).lower():
+        return float('nan'), float('nan')
+    try:
+        low, high = str(value).replace('°C', '').split(' to ')[:2]
+        return float(low), float(high)
+    except ValueError:
+        return float('nan'), float('nan')
+
+class PlacedItem:
+    """
+    Slotted stand-in for Item used inside evaluation containers
+
+    Carries only the attributes the container geometry and metric code reads,
+    so a placement costs one small object instead of a full Item with its
+    colour, bundling and stacking bookkeeping.
+    """
+    __slots__ = ('row', 'name', 'position', 'dimensions', 'weight', 'fragility', 'stackable',
+                 'load_bearing', 'needs_insulation', 'temperature_sensitivity')
+
+    def __init__(self, row, name, position, dimensions, weight, fragility, stackable,
+                 load_bearing, needs_insulation, temperature_sensitivity):
+        self.row = row
+        self.name = name
+        self.position = position
+        self.dimensions = dimensions
+        self.weight = weight
+        self.fragility = fragility
+        self.stackable = stackable
+        self.load_bearing = load_bearing
+        self.needs_insulation = needs_insulation
+        self.temperature_sensitivity = temperature_sensitivity
+
+    def __repr__(self):
+        return f"PlacedItem(name='{self.name}', pos={self.position}, dims={self.dimensions})"
+
+class ItemSpec:
+    """
+    Immutable struct-of-arrays table of the items being packed
+
+    Row i holds the packing-relevant properties of items[i] (bundled dimensions,
+    weight, fragility code, stackable flag, load bearing, insulation flag and
+    temperature range) as read-only NumPy columns. Items with identical rows
+    share a type id.
+    """
+
+    def __init__(self, items):
+        """
+        Build the table from Item objects
+
+        Args:
+            items: Items to pack; rows follow the list order
+        """
+        self.names = [item.name for item in items]
+        self._rows = []
+        dims, weights, fragility, stackable, load_bearing, insulation, temps, type_ids = [], [], [], [], [], [], [], []
+        signatures = {}
+        for item in items:
+            # Same bundle dimensions as the Item constructor, whose weight is already the bundle's total
+            bundled = item.bundle == 'YES' and item.quantity > 1
+            item_dims = item._calculate_bundle_dimensions() if bundled else item.original_dims
+            weight = item.weight
+            needs_insulation = bool(getattr(item, 'needs_insulation', False))
+            temperature_sensitivity = getattr(item, 'temperature_sensitivity', None)
+            row = (item.name, tuple(item_dims), weight, item.fragility, item.stackable,
+                   item.load_bearing, needs_insulation, temperature_sensitivity)
+            self._rows.append(row)
+
+            signature = row[1:]
+            type_ids.append(signatures.setdefault(signature, len(signatures)))
+            dims.append(item_dims)
+            weights.append(weight)
+            fragility.append(FRAGILITY_CODES.get(item.fragility, 0))
+            stackable.append(item.stackable not in (False, 'NO'))
+            load_bearing.append(item.load_bearing)
+            insulation.append(needs_insulation)
+            temps.append(parse_temperature_range(temperature_sensitivity))
+
+        self.dims = self._frozen(dims, float, (-1, 3))
+        self.volume = self._frozen(np.prod(self.dims, axis=1), float)
+        self.weight = self._frozen(weights, float)
+        self.fragility = self._frozen(fragility, np.int8)
+        self.stackable = self._frozen(stackable, bool)
+        self.load_bearing = self._frozen(load_bearing, float)
+        self.needs_insulation = self._frozen(insulation, bool)
+        self.temp_range = self._frozen(temps, float, (-1, 2))
+        self.type_ids = self._frozen(type_ids, np.int32)
+        self.type_count = len(signatures)
+        self._templates = [self.record(row) for row in range(len(self._rows))]
+
+    @staticmethod
+    def _frozen(values, dtype, shape=None):
+        """Read-only array of values"""
+        array = np.array(values, dtype=dtype)
+        if shape is not None:
+            array = array.reshape(shape)
+        array.flags.writeable = False
+        return array
+
+    def __len__(self):
+        return len(self._rows)
+
+    def record(self, row, position=None, dimensions=None) -> PlacedItem:
+        """
+        Create a placement record for a row
+
+        Args:
+            row: Row index
+            position: (x, y, z) of the placed item, or None if not placed
+            dimensions: Rotated dimensions used for the placement (defaults to the row's dimensions)
+        """
+        name, dims, weight, fragility, stackable, load_bearing, needs_insulation, temperature_sensitivity = self._rows[row]
+        return PlacedItem(row, name, position, dimensions or dims, weight, fragility, stackable,
+                          load_bearing, needs_insulation, temperature_sensitivity)
+
+    def template(self, row) -> PlacedItem:
+        """Shared unplaced record of a row (must not be modified or placed)"""
+        return self._templates[row]
+
+class PlacementTable:
+    """
+    Struct-of-arrays view of the items placed in a container
+
+    Positions, dimensions, weights, handling flags and spec rows are kept in growable NumPy arrays that
+    follow a container's item list: appended items are added and, after a
+    rollback, rows beyond the common prefix are dropped.
+    """
+
+    def __init__(self, capacity=64):
+        """Initialize an empty table"""
+        self._positions = np.zeros((capacity, 3))
+        self._dims = np.zeros((capacity, 3))
+        self._weights = np.zeros(capacity)
+        self._load_bearing = np.zeros(capacity)
+        self._flags = np.zeros((capacity, 3), dtype=bool)  # HIGH fragility, stackable, needs insulation
+        self._rows = np.full(capacity, -1, dtype=np.int32)
+        self._source = None  # Item list being tracked
+        self._items = []     # Tracked items in row order
+        self.count = 0
+
+    def clear(self) -> None:
+        """Remove all placements"""
+        self._source = None
+        self._items = []
+        self.count = 0
+
+    def _grow(self) -> None:
+        """Double the array capacity"""
+        capacity = 2 * len(self._rows)
+        for name in ('_positions', '_dims', '_weights', '_load_bearing', '_flags', '_rows'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, item) -> None:
+        """Append a placed item"""
+        if self.count == len(self._rows):
+            self._grow()
+        index = self.count
+        self._positions[index] = item.position or (0.0, 0.0, 0.0)
+        self._dims[index] = item.dimensions
+        self._weights[index] = item.weight
+        self._load_bearing[index] = getattr(item, 'load_bearing', 0) or 0
+        # Truthiness matches the container geometry checks
+        self._flags[index] = (item.fragility == 'HIGH', bool(item.stackable),
+                              bool(getattr(item, 'needs_insulation', False)))
+        self._rows[index] = getattr(item, 'row', -1)
+        self.count += 1
+        self._items.append(item)
+
+    def truncate(self, count) -> None:
+        """Drop the placements after the first count"""
+        del self._items[count:]
+        self.count = min(self.count, count)
+
+    def sync(self, items) -> None:
+        """Bring the table up to date with a container's item list"""
+        common = shared_prefix(items, self._items, items is self._source)
+        self._source = items
+        self.truncate(common)
+        for item in items[common:]:
+            self.add(item)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(n, 3) array of placed item positions"""
+        return self._positions[:self.count]
+
+    @property
+    def dims(self) -> np.ndarray:
+        """(n, 3) array of placed (rotated) item dimensions"""
+        return self._dims[:self.count]
+
+    @property
+    def weights(self) -> np.ndarray:
+        """(n,) array of placed item weights"""
+        return self._weights[:self.count]
+
+    @property
+    def load_bearing(self) -> np.ndarray:
+        """(n,) array of placed item load bearing capacities"""
+        return self._load_bearing[:self.count]
+
+    @property
+    def fragile(self) -> np.ndarray:
+        """(n,) mask of placed items with HIGH fragility"""
+        return self._flags[:self.count, 0]
+
+    @property
+    def stackable(self) -> np.ndarray:
+        """(n,) mask of placed items that can carry other items"""
+        return self._flags[:self.count, 1]
+
+    @property
+    def needs_insulation(self) -> np.ndarray:
+        """(n,) mask of placed items that need insulation"""
+        return self._flags[:self.count, 2]
+
+    @property
+    def rows(self) -> np.ndarray:
+        """(n,) array of ItemSpec rows (-1 for items without one)"""
+        return self._rows[:self.count]
+
+    def packed_volume(self) -> float:
+        """Total volume of the placed items"""
+        dims = self.dims
+        return float((dims[:, 0] * dims[:, 1] * dims[:, 2]).sum())
+
+    def total_weight(self) -> float:
+        """Total weight of the placed items"""
+        return float(self.weights.sum())
@@ -0,0 +1,30 @@
+"""
+Helpers for structures that follow a container's item list
+"""
+
+def shared_prefix(items, tracked, same_list=False) -> int:
+    """
+    Number of leading items that a tracking structure can keep
+
+    Structures derived from a container's items (spatial index, placement
+    table, contact graph, running metrics, height map) catch up by adding the
+    items after this prefix and undo the tracked items beyond it, so switching
+    between a state and a rollback or fork of it costs time proportional to
+    where the two item lists differ.
+
+    Args:
+        items: The container's current item list
+        tracked: Items the structure currently holds, in the order they were added
+        same_list: True if items is the list object the structure last synced with
+
+    Returns:
+        int: Length of the longest common prefix of items and tracked (by identity)
+    """
+    count = len(tracked)
+    if same_list and len(items) >= count and (count == 0 or items[count - 1] is tracked[-1]):
+        return count  # Items were only appended
+    limit = min(count, len(items))
+    common = 0
+    while common < limit and items[common] is tracked[common]:
+        common += 1
+    return common
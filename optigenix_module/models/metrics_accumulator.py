@@ -0,0 +1,138 @@
+"""
+Running volume, weight and centre-of-gravity totals for placed items
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from optigenix_module.models.item_tracking import shared_prefix
+
+class MetricsAccumulator:
+    """
+    Running totals of the items placed in a container
+
+    Keeps the packed volume, total weight, first moments of weight (for the
+    centre of gravity) and a weight map grid. Placing or removing the last
+    item updates the totals in O(1), and what-if centre-of-gravity queries
+    for a candidate placement cost O(1) instead of a pass over all items.
+
+    Totals are stored after every placement and summed in placement order, so
+    they are bit-identical to the full recomputations they replace and
+    removing items restores the earlier totals exactly. The accumulator
+    follows a container's item list: appended items are added, a list cut
+    back to a prefix of the tracked items (a rollback) is popped, and
+    anything else is replayed from the first differing item.
+    """
+
+    def __init__(self, dimensions, grid_shape=(10, 10)):
+        """
+        Initialize empty totals
+
+        Args:
+            dimensions: Container (length, width, height), used to bin the weight map
+            grid_shape: (rows, cols) of the weight map over the container floor (y, x)
+        """
+        self.dimensions = dimensions
+        self.weight_map = np.zeros(grid_shape)
+        self._items = []
+        self._cells = []      # Weight map cell of each tracked item (None if outside the grid)
+        self._totals = [(0, 0, 0, 0, 0)]  # (volume, weight, moment x, moment y, moment z) after each item
+        self._source = None   # Item list being tracked
+
+    @property
+    def count(self) -> int:
+        """Number of tracked items"""
+        return len(self._items)
+
+    @property
+    def packed_volume(self) -> float:
+        """Total volume of the placed items"""
+        return self._totals[-1][0]
+
+    @property
+    def total_weight(self) -> float:
+        """Total weight of the placed items"""
+        return self._totals[-1][1]
+
+    @property
+    def moments(self) -> Tuple[float, float, float]:
+        """First moments of weight (sum of weight * centre) along x, y and z"""
+        return self._totals[-1][2:]
+
+    def add(self, item) -> None:
+        """Add a placed item to the totals"""
+        volume, weight, mx, my, mz = self._totals[-1]
+        cell = None
+        if getattr(item, 'position', None):
+            x, y, z = item.position
+            w, d, h = item.dimensions
+            item_weight = item.weight
+            volume += w * d * h
+            weight += item_weight
+            mx += (x + w/2) * item_weight
+            my += (y + d/2) * item_weight
+            mz += (z + h/2) * item_weight
+            rows, cols = self.weight_map.shape
+            row = int((y / self.dimensions[1]) * rows)
+            col = int((x / self.dimensions[0]) * cols)
+            if 0 <= row < rows and 0 <= col < cols:
+                cell = (row, col)
+                self.weight_map[cell] += item_weight
+        self._items.append(item)
+        self._cells.append(cell)
+        self._totals.append((volume, weight, mx, my, mz))
+
+    def pop(self):
+        """Remove the most recently added item from the totals and return it"""
+        item = self._items.pop()
+        cell = self._cells.pop()
+        self._totals.pop()
+        if cell is not None:
+            self.weight_map[cell] -= item.weight
+        return item
+
+    def clear(self) -> None:
+        """Remove all items"""
+        self._items = []
+        self._cells = []
+        self._totals = [(0, 0, 0, 0, 0)]
+        self._source = None
+        self.weight_map[:] = 0
+
+    def sync(self, items) -> None:
+        """Bring the totals up to date with a container's item list"""
+        common = shared_prefix(items, self._items, items is self._source)
+        self._source = items
+        while len(self._items) > common:
+            self.pop()
+        if common == 0:
+            self.weight_map[:] = 0  # Drop rounding left by the subtractions
+        for item in items[common:]:
+            self.add(item)
+
+    def center_of_gravity(self, default=None) -> Optional[Tuple[float, float, float]]:
+        """Weighted centre of the placed items, or default if they carry no weight"""
+        _, weight, mx, my, mz = self._totals[-1]
+        if weight == 0:
+            return default
+        return (mx/weight, my/weight, mz/weight)
+
+    def center_of_gravity_with(self, position, dimensions, weight, default=None):
+        """
+        Centre of gravity if one more item were placed
+
+        Args:
+            position: (x, y, z) of the candidate placement
+            dimensions: (w, d, h) of the candidate placement
+            weight: Weight of the candidate item
+            default: Returned if the total weight would be zero
+        """
+        x, y, z = position
+        w, d, h = dimensions
+        _, total_weight, mx, my, mz = self._totals[-1]
+        total_weight += weight
+        if total_weight == 0:
+            return default
+        return ((mx + (x + w/2) * weight) / total_weight,
+                (my + (y + d/2) * weight) / total_weight,
+                (mz + (z + h/2) * weight) / total_weight)
@@ -0,0 +1,74 @@
+"""
+Valid item orientations for a container, computed once per item shape
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+# Axis permutations in rotation-flag order: (l, w, h), (l, h, w), (w, l, h), (w, h, l), (h, l, w), (h, w, l)
+ROTATION_PERMUTATIONS = ((0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0))
+
+class OrientationTable:
+    """
+    Memoized table of the orientations an item may be placed in
+
+    An orientation is valid if it fits inside the container and, for HIGH
+    fragility items, does not raise the item above its upright height.
+    Orientations giving the same dimensions (cubes, square faces) are listed
+    once, in rotation-flag order, so an index into the list selects a distinct
+    placement.
+    """
+
+    def __init__(self, container_dims):
+        """
+        Initialize an empty table
+
+        Args:
+            container_dims: Container (length, width, height)
+        """
+        self.container_dims = tuple(container_dims)
+        self._orientations: Dict[Tuple, Tuple[Tuple[float, float, float], ...]] = {}
+
+    def __len__(self):
+        return len(self._orientations)
+
+    def orientations(self, dims: Sequence[float], fragile=False) -> Tuple[Tuple[float, float, float], ...]:
+        """
+        Valid, de-duplicated orientations of an item
+
+        Args:
+            dims: Upright (length, width, height) of the item
+            fragile: True for HIGH fragility items, which must not be placed taller than upright
+
+        Returns:
+            tuple: Rotated dimensions, in rotation-flag order (empty if the item fits no way)
+        """
+        key = (tuple(dims), bool(fragile))
+        orientations = self._orientations.get(key)
+        if orientations is None:
+            upright_height = dims[2]
+            valid = []
+            for permutation in ROTATION_PERMUTATIONS:
+                rotated = tuple(dims[axis] for axis in permutation)
+                if rotated in valid:
+                    continue
+                if all(d <= max_d for d, max_d in zip(rotated, self.container_dims)) and \
+                   (not fragile or rotated[2] <= upright_height):
+                    valid.append(rotated)
+            orientations = self._orientations[key] = tuple(valid)
+        return orientations
+
+    def select(self, dims: Sequence[float], fragile, gene: int) -> Optional[Tuple[float, float, float]]:
+        """
+        Orientation chosen by a rotation gene
+
+        Args:
+            dims: Upright (length, width, height) of the item
+            fragile: True for HIGH fragility items
+            gene: Non-negative rotation gene; taken modulo the number of valid orientations
+
+        Returns:
+            tuple: Rotated dimensions, or None if the item fits the container no way
+        """
+        orientations = self.orientations(dims, fragile)
+        if not orientations:
+            return None
+        return orientations[gene % len(orientations)]
@@ -0,0 +1,168 @@
+"""
+Batched NumPy kernel for checking and scoring candidate placements
+"""
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+# Matches the tolerance used by the container geometry checks
+TOLERANCE = 0.001
+
+class CandidateTerms(NamedTuple):
+    """Per-candidate results of evaluate_candidates (arrays indexed by candidate)"""
+    feasible: np.ndarray           # Same result as ContainerCore._is_valid_placement
+    wall_distances: np.ndarray     # (m, 6) left, front, right, back, bottom, top
+    nearest_distances: np.ndarray  # (m, 6) same order, as ContainerPacking._find_nearest_distances
+    contact_area: np.ndarray       # Sum of _calculate_contact_area over items in surface contact
+    contact_count: np.ndarray      # Items in surface contact (_has_surface_contact)
+    insulating_count: np.ndarray   # Items in surface contact that do not need insulation
+
+    def row(self, index) -> Dict:
+        """Scoring terms of one candidate as Python scalars"""
+        return {
+            'nearest_distances': self.nearest_distances[index].tolist(),
+            'contact_area': float(self.contact_area[index]),
+            'contact_count': int(self.contact_count[index]),
+            'insulating_count': int(self.insulating_count[index]),
+        }
+
+def _interval_overlap(lo1, hi1, lo2, hi2):
+    """Length of the overlap of two intervals (0 if disjoint)"""
+    return np.maximum(0, np.minimum(hi1, hi2) - np.maximum(lo1, lo2))
+
+def layer_candidates(extents, rotations, height, container_dims, wall_buffer=None, excluded=None):
+    """
+    Find the (rotation, space) pairs that can hold an item at a layer height
+
+    Applies the same filters as the per-space loop in _try_pack_in_layer:
+    the rotation must stay below the roof, fit the space (can_fit_item) and
+    the space must start at the layer height.
+
+    Args:
+        extents: (s, 6) x, y, z, width, height, depth of the free spaces
+        rotations: Candidate (w, d, h) rotations
+        height: Layer height
+        container_dims: Container (width, depth, height)
+        wall_buffer: If set, reject positions closer than this to the side walls or the roof
+        excluded: Optional (s,) mask of spaces to skip
+
+    Returns:
+        list: (rotation index, space index) pairs, rotation-major in space order
+    """
+    extents = np.asarray(extents, dtype=float).reshape(-1, 6)
+    x, y, z = extents[:, 0], extents[:, 1], extents[:, 2]
+    at_layer = ~(np.abs(z - height) > TOLERANCE)
+    if excluded is not None:
+        at_layer &= ~np.asarray(excluded, dtype=bool)
+    pairs = []
+    for rotation_index, (w, d, h) in enumerate(rotations):
+        if height + h > container_dims[2]:
+            continue
+        mask = at_layer & (extents[:, 3] >= w) & (extents[:, 4] >= d) & (extents[:, 5] >= h)
+        if wall_buffer is not None:
+            mask &= ~((x < wall_buffer) | (y < wall_buffer) |
+                      (container_dims[0] - (x + w) < wall_buffer) |
+                      (container_dims[1] - (y + d) < wall_buffer) |
+                      (container_dims[2] - (height + h) < wall_buffer))
+        pairs.extend((rotation_index, space_index) for space_index in np.flatnonzero(mask).tolist())
+    return pairs
+
+def evaluate_candidates(positions, dims, placements, container_dims, item_weight, item_fragile) -> CandidateTerms:
+    """
+    Check and score all candidate placements of one item in a single pass
+
+    Every candidate is compared with every placed box through (m, n)
+    broadcasts, reproducing the scalar checks in ContainerCore and
+    ContainerPacking: boundaries, 3D overlap, support, fragility and load
+    bearing for feasibility, and the six nearest distances, face contacts and
+    contact areas used by _evaluate_position_enhanced. Contact areas are
+    accumulated in placement order so the sums match the scalar loops exactly.
+
+    Args:
+        positions: (m, 3) candidate positions
+        dims: (m, 3) candidate (rotated) dimensions
+        placements: PlacementTable of the placed items
+        container_dims: Container (width, depth, height)
+        item_weight: Weight of the item being placed
+        item_fragile: True if the item has HIGH fragility
+
+    Returns:
+        CandidateTerms: Feasibility mask and scoring terms for each candidate
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    dims = np.asarray(dims, dtype=float).reshape(-1, 3)
+    length, width, height = container_dims
+    lo = positions
+    hi = positions + dims
+    x, y, z = lo[:, 0], lo[:, 1], lo[:, 2]
+
+    wall_distances = np.column_stack((x, y, length - hi[:, 0], width - hi[:, 1], z, height - hi[:, 2]))
+    feasible = (lo >= 0).all(axis=1) & (hi[:, 0] <= length) & (hi[:, 1] <= width) & (hi[:, 2] <= height)
+
+    count = placements.count
+    m = len(positions)
+    if count == 0:
+        feasible &= z <= 0
+        zeros = np.zeros(m)
+        return CandidateTerms(feasible, wall_distances, wall_distances.copy(), zeros,
+                              zeros.astype(int), zeros.astype(int))
+
+    # (m, n) views: candidate along axis 0, placed item along axis 1
+    c_lo, c_hi, c_dims = lo[:, None, :], hi[:, None, :], dims[:, None, :]
+    p_lo = placements.positions[None, :, :]
+    p_dims = placements.dims[None, :, :]
+    p_hi = p_lo + p_dims
+
+    strict = (c_lo < p_hi) & (p_lo < c_hi)  # Interiors overlap along each axis
+    overlap_2d = strict[..., 0] & strict[..., 1]
+    feasible &= ~(overlap_2d & strict[..., 2]).any(axis=1)
+
+    # Support from items whose top face is at the candidate's base
+    p_top = p_hi[..., 2]
+    below = overlap_2d & (np.abs(p_top - z[:, None]) < TOLERANCE)
+    extent = _interval_overlap(c_lo, c_hi, p_lo, p_hi)  # (m, n, 3) overlap lengths
+    base_overlap = extent[..., 0] * extent[..., 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight_ratio = base_overlap / (p_dims[..., 0] * p_dims[..., 1])
+    load_bearing = placements.load_bearing[None, :]
+    overloaded = (load_bearing > 0) & (item_weight > load_bearing * weight_ratio)
+    bad_support = below & (placements.fragile[None, :] | ~placements.stackable[None, :] | overloaded)
+    raised = z > 0
+    unsupported = ~below.any(axis=1) | bad_support.any(axis=1)
+    if item_fragile:
+        unsupported |= (overlap_2d & (p_lo[..., 2] > c_hi[..., 2])).any(axis=1)
+    feasible &= ~(raised & unsupported)
+
+    # Nearest items in the six directions (walls are the default)
+    nearest = wall_distances.copy()
+    overlap_yz = strict[..., 1] & strict[..., 2]
+    overlap_xz = strict[..., 0] & strict[..., 2]
+    for column, mask, gap in (
+        (0, overlap_yz & (p_hi[..., 0] <= c_lo[..., 0]), c_lo[..., 0] - p_hi[..., 0]),
+        (1, overlap_xz & (p_hi[..., 1] <= c_lo[..., 1]), c_lo[..., 1] - p_hi[..., 1]),
+        (2, overlap_yz & (p_lo[..., 0] >= c_hi[..., 0]), p_lo[..., 0] - c_hi[..., 0]),
+        (3, overlap_xz & (p_lo[..., 1] >= c_hi[..., 1]), p_lo[..., 1] - c_hi[..., 1]),
+        (4, overlap_2d & (p_hi[..., 2] <= c_lo[..., 2]), c_lo[..., 2] - p_hi[..., 2]),
+        (5, overlap_2d & (p_lo[..., 2] >= c_hi[..., 2]), p_lo[..., 2] - c_hi[..., 2]),
+    ):
+        nearest[:, column] = np.minimum(nearest[:, column], np.where(mask, gap, np.inf).min(axis=1))
+
+    # Face adjacency along each axis (either side)
+    adjacent = ((np.abs(c_lo - p_hi) < TOLERANCE) | (np.abs(c_hi - p_lo) < TOLERANCE))
+    c_w, c_d, c_h = c_dims[..., 0], c_dims[..., 1], c_dims[..., 2]
+    p_w, p_d, p_h = p_dims[..., 0], p_dims[..., 1], p_dims[..., 2]
+    ex, ey, ez = extent[..., 0], extent[..., 1], extent[..., 2]
+
+    # _has_surface_contact: a shared face covering at least 10% of the smaller face
+    contact = ((adjacent[..., 2] & (ex * ey > np.minimum(c_w * c_d, p_w * p_d) * 0.1)) |
+               (adjacent[..., 1] & (ex * ez > np.minimum(c_w * c_h, p_w * p_h) * 0.1)) |
+               (adjacent[..., 0] & (ey * ez > np.minimum(c_d * c_h, p_d * p_h) * 0.1)))
+
+    # _calculate_contact_area: shared area over every adjacent axis
+    area = (np.where(adjacent[..., 0], ey * ez, 0.0) + np.where(adjacent[..., 1], ex * ez, 0.0)
+            + np.where(adjacent[..., 2], ex * ey, 0.0))
+    contact_area = np.cumsum(np.where(contact, area, 0.0), axis=1)[:, -1]
+
+    contact_count = contact.sum(axis=1)
+    insulating_count = (contact & ~placements.needs_insulation[None, :]).sum(axis=1)
+    return CandidateTerms(feasible, wall_distances, nearest, contact_area, contact_count, insulating_count)
@@ -1,6 +1,8 @@
 """Space model for container packing"""
 
 class MaximalSpace:
+    __slots__ = ('x', 'y', 'z', 'width', 'height', 'depth', 'temperature_safe')
+
     def __init__(self, x, y, z, width, height, depth):
         self.x = x
         self.y = y
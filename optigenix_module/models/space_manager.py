@@ -0,0 +1,275 @@
+"""
+Maximal empty space management for container packing
+"""
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+
+from optigenix_module.models.space import MaximalSpace
+
+# Matches the tolerance used by the container geometry checks
+TOLERANCE = 0.001
+
+def _bounds(space):
+    """Corner coordinates of a space along x, y and z (width, height, depth respectively)"""
+    return (space.x, space.y, space.z,
+            space.x + space.width, space.y + space.height, space.z + space.depth)
+
+def _touches(a, b) -> bool:
+    """Whether two bounds touch or overlap (within tolerance)"""
+    return (a[0] <= b[3] + TOLERANCE and b[0] <= a[3] + TOLERANCE and
+            a[1] <= b[4] + TOLERANCE and b[1] <= a[4] + TOLERANCE and
+            a[2] <= b[5] + TOLERANCE and b[2] <= a[5] + TOLERANCE)
+
+# Ordering policies. A key function receives the space, the number of placed
+# items touching it and the container dimensions; smaller keys come first.
+# Keys that read the adjacency count set uses_adjacency so the manager tracks it.
+
+def origin_space_key(space, adjacency, dimensions):
+    """Lower spaces first, then spaces closer to the origin, then larger spaces"""
+    return (space.z, space.x**2 + space.y**2, -space.get_volume())
+
+def interlocking_space_key(space, adjacency, dimensions):
+    """Lower spaces first, then corners and walls, then spaces touching many items, then near the origin"""
+    x1, y1, z1, x2, y2, z2 = _bounds(space)
+    wall_contacts = (sum(1 for val in (x1, y1, z1) if val == 0) +
+                     sum(1 for val, limit in zip((x2, y2, z2), dimensions) if val == limit))
+    return (z1, -wall_contacts, -adjacency, x1**2 + y1**2 + z1**2)
+
+interlocking_space_key.uses_adjacency = True
+
+default_space_key = origin_space_key
+
+class MaximalSpaceManager:
+    """
+    Priority-ordered set of maximal empty spaces
+
+    Spaces use the MaximalSpace.can_fit_item convention: width, height and
+    depth are the extents along x, y and z. When a box is placed, every space
+    it overlaps is replaced by the (up to six) maximal sub-spaces left around
+    the box, and new spaces contained in another space with the same
+    temperature_safe flag are dropped.
+
+    Spaces are kept sorted by a pluggable key, so iterating the manager visits
+    the best candidates first without re-sorting. Each entry's key is stored
+    alongside it; for keys that use adjacency, only spaces touching a newly
+    placed box have their key recomputed.
+
+    checkpoint() and restore() save and reinstate the set in O(1): the saved
+    lists are shared and only copied before the next in-place change.
+    """
+
+    def __init__(self, spaces: Iterable[MaximalSpace] = (), key: Callable = default_space_key, min_size=0.01,
+                 dimensions=None, count_adjacent: Optional[Callable] = None):
+        """
+        Initialize the manager
+
+        Args:
+            spaces: Initial free spaces
+            key: Ordering policy, key(space, adjacency, dimensions) (smallest first)
+            min_size: Spaces thinner than this along any axis are discarded
+            dimensions: Container dimensions passed to the key
+            count_adjacent: Callable returning the number of placed items touching a
+                space's bounds (required for keys that use adjacency)
+        """
+        self.key = key
+        self.min_size = min_size
+        self.dimensions = dimensions
+        self.count_adjacent = count_adjacent
+        self.spaces: List[MaximalSpace] = []
+        self._keys = []        # Sort key of each entry in self.spaces
+        self._adjacency = {}   # id(space) -> number of placed items touching it
+        self._extents = None   # Cached array for extents(), cleared whenever the spaces change
+        self._shared = False   # The lists are referenced by a checkpoint (copy before changing them)
+        self.reset(spaces)
+
+    @property
+    def tracks_adjacency(self) -> bool:
+        """Whether the current key depends on adjacency counts"""
+        return getattr(self.key, 'uses_adjacency', False) and self.count_adjacent is not None
+
+    def _key_of(self, space):
+        """Current sort key of a space"""
+        return self.key(space, self._adjacency.get(id(space), 0), self.dimensions)
+
+    def reset(self, spaces: Iterable[MaximalSpace]) -> None:
+        """Replace all spaces"""
+        spaces = list(spaces)
+        self._adjacency = {}
+        if self.tracks_adjacency:
+            for space in spaces:
+                self._adjacency[id(space)] = self.count_adjacent(_bounds(space))
+        entries = sorted(((self._key_of(space), i) for i, space in enumerate(spaces)))
+        self._keys = [entry[0] for entry in entries]
+        self.spaces = [spaces[entry[1]] for entry in entries]
+        self._extents = None
+        self._shared = False
+
+    def checkpoint(self):
+        """Capture the current spaces, ordering and adjacency counts for restore()"""
+        self._shared = True
+        return (self.spaces, self._keys, self._adjacency, self.key, self._extents)
+
+    def restore(self, state) -> None:
+        """Reinstate spaces captured by checkpoint()"""
+        self.spaces, self._keys, self._adjacency, self.key, self._extents = state
+        self._shared = True
+
+    def _unshare(self) -> None:
+        """Copy lists still referenced by a checkpoint before changing them in place"""
+        if self._shared:
+            self.spaces = list(self.spaces)
+            self._keys = list(self._keys)
+            self._adjacency = dict(self._adjacency)
+            self._shared = False
+
+    def reorder(self, key: Callable) -> None:
+        """Switch to another ordering policy"""
+        if key is not self.key:
+            self.key = key
+            self.reset(self.spaces)
+
+    def add(self, space: MaximalSpace) -> None:
+        """Insert a space at its ordered position"""
+        self._unshare()
+        if self.tracks_adjacency and id(space) not in self._adjacency:
+            self._adjacency[id(space)] = self.count_adjacent(_bounds(space))
+        key = self._key_of(space)
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self.spaces.insert(index, space)
+        self._extents = None
+
+    def _index_of(self, space) -> int:
+        """Position of a space in the ordered list"""
+        index = bisect_left(self._keys, self._key_of(space))
+        while self.spaces[index] is not space:
+            index += 1
+        return index
+
+    def remove(self, space: MaximalSpace) -> None:
+        """Remove a space"""
+        self._unshare()
+        index = self._index_of(space)
+        del self._keys[index]
+        del self.spaces[index]
+        self._adjacency.pop(id(space), None)
+        self._extents = None
+
+    def extents(self) -> np.ndarray:
+        """(n, 6) array of x, y, z, width, height, depth of the spaces, in order"""
+        if self._extents is None:
+            self._extents = np.array([(space.x, space.y, space.z, space.width, space.height, space.depth)
+                                      for space in self.spaces], dtype=float).reshape(-1, 6)
+        return self._extents
+
+    def __iter__(self):
+        return iter(self.spaces)
+
+    def __len__(self):
+        return len(self.spaces)
+
+    def _split(self, space, box):
+        """Maximal sub-spaces of space left free around box"""
+        sx1, sy1, sz1, sx2, sy2, sz2 = _bounds(space)
+        bx1, by1, bz1, bx2, by2, bz2 = box
+        pieces = (
+            (sx1, sy1, sz1, bx1, sy2, sz2),  # Left of the box
+            (bx2, sy1, sz1, sx2, sy2, sz2),  # Right of the box
+            (sx1, sy1, sz1, sx2, by1, sz2),  # In front of the box
+            (sx1, by2, sz1, sx2, sy2, sz2),  # Behind the box
+            (sx1, sy1, sz1, sx2, sy2, bz1),  # Below the box
+            (sx1, sy1, bz2, sx2, sy2, sz2),  # Above the box
+        )
+        children = []
+        for x1, y1, z1, x2, y2, z2 in pieces:
+            if min(x2 - x1, y2 - y1, z2 - z1) < self.min_size:
+                continue
+            child = MaximalSpace(x1, y1, z1, x2 - x1, y2 - y1, z2 - z1)
+            child.temperature_safe = space.temperature_safe
+            children.append(child)
+        return children
+
+    @staticmethod
+    def _containment(outer, inner, flag_aware=True):
+        """
+        Containment matrix between two sets of spaces
+
+        Args:
+            outer, inner: Arrays of shape (n, 7) holding a flag code and the six bounds
+            flag_aware: Only count containment between spaces with the same flag
+
+        Returns:
+            np.ndarray: m[i, j] is True when outer[j] contains inner[i]
+        """
+        contained = np.all(outer[None, :, 1:4] <= inner[:, None, 1:4] + TOLERANCE, axis=2)
+        contained &= np.all(inner[:, None, 4:7] <= outer[None, :, 4:7] + TOLERANCE, axis=2)
+        if flag_aware:
+            contained &= inner[:, None, 0] == outer[None, :, 0]
+        return contained
+
+    @staticmethod
+    def _as_array(spaces):
+        """Flag code and bounds of each space as an (n, 7) array"""
+        codes = {None: 0.0, False: 1.0, True: 2.0}
+        return np.array([(codes.get(space.temperature_safe, 3.0),) + _bounds(space) for space in spaces],
+                        dtype=float).reshape(-1, 7)
+
+    def place_box(self, pos, dims, flag_aware=True) -> None:
+        """
+        Update the free spaces after a box is placed
+
+        Args:
+            pos: (x, y, z) of the placed box
+            dims: (width, depth, height) extents of the placed box along x, y and z
+            flag_aware: Keep spaces that differ in temperature_safe flag even when one
+                contains the other (only needed when temperature constraints apply)
+        """
+        self._unshare()
+        x, y, z = pos
+        w, d, h = dims
+        box = (x, y, z, x + w, y + d, z + h)
+
+        kept, kept_keys, touching, children = [], [], [], []
+        for space, key in zip(self.spaces, self._keys):
+            bounds = _bounds(space)
+            if (bounds[0] < box[3] - TOLERANCE and box[0] < bounds[3] - TOLERANCE and
+                    bounds[1] < box[4] - TOLERANCE and box[1] < bounds[4] - TOLERANCE and
+                    bounds[2] < box[5] - TOLERANCE and box[2] < bounds[5] - TOLERANCE):
+                children.extend(self._split(space, box))
+                self._adjacency.pop(id(space), None)
+                continue
+            kept.append(space)
+            kept_keys.append(key)
+            # Every new space touches the box, so only touching spaces can contain one
+            if _touches(bounds, box):
+                touching.append(space)
+        self.spaces, self._keys = kept, kept_keys
+        self._extents = None
+
+        # The placed box is a new neighbour of every space it touches
+        if self.tracks_adjacency:
+            for space in touching:
+                adjacency = self._adjacency.get(id(space), 0)
+                self.remove(space)
+                self._adjacency[id(space)] = adjacency + 1
+                self.add(space)
+
+        if not children:
+            return
+
+        # Untouched spaces were maximal before, so only new spaces can be redundant
+        child_array = self._as_array(children)
+        redundant = np.zeros(len(children), dtype=bool)
+        if touching:
+            redundant |= self._containment(self._as_array(touching), child_array, flag_aware).any(axis=1)
+        inside = self._containment(child_array, child_array, flag_aware)
+        np.fill_diagonal(inside, False)
+        # Drop children inside another child; of identical children keep the first
+        earlier = np.tril(np.ones_like(inside), k=-1)
+        redundant |= (inside & (earlier | ~inside.T)).any(axis=1)
+
+        for child, drop in zip(children, redundant.tolist()):
+            if not drop:
+                self.add(child)
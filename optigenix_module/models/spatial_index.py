@@ -0,0 +1,119 @@
+"""
+Spatial index for placed items in a container
+"""
+import math
+from typing import List
+
+from optigenix_module.models.item_tracking import shared_prefix
+
+# Matches the tolerance used by the container geometry checks
+TOLERANCE = 0.001
+
+class SpatialGrid:
+    """
+    Uniform 3D grid over the container volume
+
+    Each placed item is registered in every cell its bounding box touches, so a
+    box query only inspects items in the cells the box covers instead of every
+    placed item. Queries return a superset of the items that intersect the box
+    (expanded by a margin); callers keep their exact geometry checks.
+
+    The grid tracks a container's item list: appended items are inserted and,
+    after a rollback, items beyond the common prefix are removed again, so only
+    the changed items are touched.
+    """
+
+    def __init__(self, dimensions, cell_size=0.5):
+        """Initialize an empty grid covering the container dimensions"""
+        self.dimensions = tuple(float(d) for d in dimensions)
+        self.cell_size = float(cell_size)
+        self.shape = tuple(max(1, math.ceil(d / self.cell_size)) for d in self.dimensions)
+        self._cells = {}
+        self._source = None   # Item list being tracked
+        self._items = []      # Tracked items in insertion order
+        self.count = 0
+
+    def _cell_keys(self, x, y, z, w, d, h, margin):
+        """Flat keys of all cells touched by the box expanded by margin (clamped to the grid)"""
+        nx, ny, nz = self.shape
+        size = self.cell_size
+        i0 = min(nx - 1, max(0, int((x - margin) // size)))
+        i1 = min(nx - 1, max(0, int((x + w + margin) // size)))
+        j0 = min(ny - 1, max(0, int((y - margin) // size)))
+        j1 = min(ny - 1, max(0, int((y + d + margin) // size)))
+        k0 = min(nz - 1, max(0, int((z - margin) // size)))
+        k1 = min(nz - 1, max(0, int((z + h + margin) // size)))
+        return [(i * ny + j) * nz + k
+                for i in range(i0, i1 + 1)
+                for j in range(j0, j1 + 1)
+                for k in range(k0, k1 + 1)]
+
+    def insert(self, item) -> None:
+        """Register a placed item in every cell its bounding box touches"""
+        seq = self.count
+        self.count += 1
+        self._items.append(item)
+        if not getattr(item, 'position', None):
+            return
+        entry = (seq, item)
+        cells = self._cells
+        for key in self._cell_keys(*item.position, *item.dimensions, 0.0):
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [entry]
+            else:
+                cell.append(entry)
+
+    def pop(self):
+        """Remove the most recently inserted item and return it"""
+        item = self._items.pop()
+        self.count -= 1
+        if getattr(item, 'position', None):
+            cells = self._cells
+            # Later items were removed first, so the item is last in each of its cells
+            for key in self._cell_keys(*item.position, *item.dimensions, 0.0):
+                cell = cells[key]
+                cell.pop()
+                if not cell:
+                    del cells[key]
+        return item
+
+    def sync(self, items) -> None:
+        """Bring the grid up to date with a container's item list"""
+        common = shared_prefix(items, self._items, items is self._source)
+        self._source = items
+        while self.count > common:
+            self.pop()
+        for item in items[common:]:
+            self.insert(item)
+
+    def clear(self) -> None:
+        """Remove all items from the grid"""
+        self._cells = {}
+        self._source = None
+        self._items = []
+        self.count = 0
+
+    def query(self, x, y, z, w, d, h, margin=TOLERANCE, ordered=True) -> List:
+        """
+        Find placed items whose cells touch the given box
+
+        Args:
+            x, y, z: Box origin
+            w, d, h: Box extent along x, y and z
+            margin: Amount to grow the box by on every side
+            ordered: Return items in placement order (needed when callers accumulate floats)
+
+        Returns:
+            list: Candidate items (a superset of the items intersecting the box)
+        """
+        cells = self._cells
+        found = {}
+        for key in self._cell_keys(x, y, z, w, d, h, margin):
+            cell = cells.get(key)
+            if cell:
+                for seq, item in cell:
+                    found[seq] = item
+        if ordered:
+            return [found[seq] for seq in sorted(found)]
+        return list(found.values())
@@ -0,0 +1,117 @@
+"""
+Prefix-sharing support for incremental genome decoding.
+Genomes produced by order crossover often share long decode prefixes. Container
+state is snapshotted at checkpoints along the decode sequence and stored in a
+bounded trie, so a later genome can resume decoding from its longest matching prefix.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Sequence, Tuple
+
+class _TrieNode:
+    """Node in the snapshot trie; one node per decode step"""
+    __slots__ = ('children', 'snapshot', 'parent', 'step')
+
+    def __init__(self, parent=None, step=None):
+        self.children = {}
+        self.snapshot = None
+        self.parent = parent
+        self.step = step
+
+class PrefixSnapshotTrie:
+    """
+    Bounded trie of decode snapshots keyed by decode steps
+
+    A step is any hashable value that fully determines how one item is placed
+    (e.g. an item type id and rotation flag). Snapshots are attached at every
+    checkpoint_interval-th step and evicted least-recently-used once more than
+    max_snapshots are held.
+    """
+
+    def __init__(self, max_snapshots=512, checkpoint_interval=4):
+        """Initialize an empty trie"""
+        self.max_snapshots = max_snapshots
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.root = _TrieNode()
+        self._snapshot_nodes = OrderedDict()  # id(node) -> node, in LRU order
+        self.lookups = 0
+        self.resumed_steps = 0
+        self.total_steps = 0
+
+    def longest_prefix(self, steps: Sequence[Hashable]) -> Tuple[int, _TrieNode, Optional[Any]]:
+        """
+        Find the deepest snapshot along the given step sequence
+
+        Returns:
+            tuple: (depth, node at that depth, snapshot) - (0, root, None) if nothing matches
+        """
+        self.lookups += 1
+        self.total_steps += len(steps)
+        node = self.root
+        best_depth, best_node = 0, self.root
+        for depth, step in enumerate(steps, 1):
+            node = node.children.get(step)
+            if node is None:
+                break
+            if node.snapshot is not None:
+                best_depth, best_node = depth, node
+        if best_node.snapshot is None:
+            return 0, self.root, None
+        self._snapshot_nodes.move_to_end(id(best_node))
+        self.resumed_steps += best_depth
+        return best_depth, best_node, best_node.snapshot
+
+    def child(self, node: _TrieNode, step: Hashable) -> _TrieNode:
+        """Return the child of node for step, creating it if needed"""
+        child = node.children.get(step)
+        if child is None:
+            child = _TrieNode(node, step)
+            node.children[step] = child
+        return child
+
+    def is_checkpoint(self, depth: int) -> bool:
+        """Whether a snapshot should be taken after decoding depth steps"""
+        return depth % self.checkpoint_interval == 0
+
+    def attach(self, node: _TrieNode, snapshot: Any) -> None:
+        """Attach a snapshot to node, evicting the least recently used snapshots if needed"""
+        if self.max_snapshots <= 0:
+            return
+        node.snapshot = snapshot
+        self._snapshot_nodes[id(node)] = node
+        self._snapshot_nodes.move_to_end(id(node))
+        while len(self._snapshot_nodes) > self.max_snapshots:
+            _, evicted = self._snapshot_nodes.popitem(last=False)
+            evicted.snapshot = None
+            self._prune(evicted)
+
+    def _prune(self, node: _TrieNode) -> None:
+        """Remove childless, snapshot-free nodes up the branch"""
+        while node.parent is not None and not node.children and node.snapshot is None:
+            del node.parent.children[node.step]
+            node = node.parent
+
+    def clear(self) -> None:
+        """Drop all snapshots and reset counters"""
+        self.root = _TrieNode()
+        self._snapshot_nodes.clear()
+        self.lookups = 0
+        self.resumed_steps = 0
+        self.total_steps = 0
+
+    def stats(self):
+        """Return lookup counters and the share of decode steps skipped"""
+        return {
+            'lookups': self.lookups,
+            'snapshots': len(self._snapshot_nodes),
+            'resumed_steps': self.resumed_steps,
+            'total_steps': self.total_steps,
+            'skipped_ratio': (self.resumed_steps / self.total_steps) if self.total_steps else 0.0
+        }
+
+class DecodeAborted(Exception):
+    """Raised when a decode stops early because its fitness bound cannot reach the abort threshold"""
+
+    def __init__(self, bound, metrics):
+        super().__init__(f"fitness bound {bound:.4f} below the abort threshold")
+        self.bound = bound
+        self.metrics = metrics
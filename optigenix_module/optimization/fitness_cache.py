@@ -0,0 +1,76 @@
+"""
+Fitness memoization for genetic algorithm genome evaluation.
+Equivalent genomes (same canonical decode sequence and fitness weights) always
+decode to the same packing, so their fitness and metrics can be reused across generations.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+def genome_fingerprint(order, rotation_flags, fitness_weights) -> Tuple:
+    """
+    Build a canonical, hashable key for a genome evaluation
+
+    Args:
+        order: Buffer of item-table indices or item type ids (e.g. an int32 array)
+        rotation_flags: Buffer of rotation flags (0-5) aligned with order
+        fitness_weights: Dict of active fitness weights
+
+    Returns:
+        tuple: (order bytes, rotation bytes, sorted weight items)
+    """
+    weights_key = tuple(sorted((fitness_weights or {}).items()))
+    return bytes(order), bytes(rotation_flags), weights_key
+
+class FitnessCache:
+    """
+    Bounded LRU cache of genome fitness and metrics
+
+    Entries are evicted least-recently-used first once max_size is reached.
+    Hit and miss counters are kept for reporting.
+    """
+
+    def __init__(self, max_size=4096):
+        """Initialize an empty cache holding at most max_size entries"""
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Return (fitness, metrics) for key, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, fitness: float, metrics: Dict[str, Any]) -> None:
+        """Store an evaluation result, evicting the oldest entry if full"""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (fitness, metrics)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'size': len(self._entries),
+            'max_size': self.max_size
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -6,8 +6,8 @@ import os
 import logging
 from typing import List, Dict, Any
 
-from optigenix_module.models.container import EnhancedContainer
 from optigenix_module.models.item import Item
+from optigenix_module.models.space_manager import interlocking_space_key
 from optigenix_module.optimization.temperature import TemperatureConstraintHandler
 from optigenix_module.optimization.packer import GeneticPacker
 
@@ -26,8 +26,19 @@ logger.info("=" * 70)
 
 def optimize_packing_with_genetic_algorithm(items, container_dims, 
                                          population_size=10, generations=8,
-                                        fitness_weights=None, route_temperature=None):
-    """Main function to optimize packing using genetic algorithm"""
+                                        fitness_weights=None, route_temperature=None, workers=None,
+                                        time_budget=None, target_fitness=None, stagnation_limit=None,
+                                        stop_at_volume_bound=False):
+    """
+    Main function to optimize packing using genetic algorithm
+
+    Args:
+        workers: Number of processes used to evaluate genomes (None uses the GA_WORKERS env var)
+        time_budget: Wall-clock seconds for the GA; the best solution so far is packed when it runs out
+        target_fitness: Stop the GA once the best fitness reaches this value
+        stagnation_limit: Stop the GA after this many generations without improvement
+        stop_at_volume_bound: Stop the GA once volume utilization cannot improve further
+    """
     # Set route temperature from environment variable
     from optigenix_module.utils.llm_connector import get_llm_client
       # First, handle item quantities and sort by volume/weight for smarter initialization
@@ -128,7 +139,9 @@ def optimize_packing_with_genetic_algorithm(items, container_dims,
     # Sort items with temperature-sensitive ones first
     expanded_items.sort(key=lambda x: (getattr(x, 'temperature_priority', 0)), reverse=True)
       # Initialize genetic packer with temperature constraints
-    genetic_packer = GeneticPacker(container_dims, population_size, generations, route_temperature)
+    genetic_packer = GeneticPacker(container_dims, population_size, generations, route_temperature,
+                                   workers=workers, time_budget=time_budget, target_fitness=target_fitness,
+                                   stagnation_limit=stagnation_limit, stop_at_volume_bound=stop_at_volume_bound)
     if temp_handler:
         genetic_packer.temp_handler = temp_handler
     
@@ -165,32 +178,20 @@ def final_packing(best_genome, container_dims, expanded_items, route_temperature
     if route_temperature is not None:
         temp_handler = TemperatureConstraintHandler(route_temperature)
     
-    # Create container for final packing
+    # Create container for final packing (the full container class, imported here
+    # so loading the GA does not pull in the visualization libraries)
+    from optigenix_module.models.container import EnhancedContainer
     container = EnhancedContainer(container_dims)
     if route_temperature is not None:
         container.route_temperature = route_temperature
     
-    # Sort spaces after each item placement for better utilization
-    def sort_spaces_by_fitness(container):
-        """Sort spaces by a fitness score that prefers spaces with better interlocking potential"""
-        container.spaces.sort(key=lambda space: (
-            # First prioritize bottom spaces for stability
-            space.z,
-            # Then prioritize spaces with multiple contact surfaces (corners, against walls)
-            -(sum(1 for val in [space.x, space.y, space.z] if val == 0) + 
-              sum(1 for dim, val in zip(range(3), [space.x+space.width, space.y+space.depth, space.z+space.height]) 
-                  if val == container.dimensions[dim])),
-            # Then prioritize spaces adjacent to existing items for interlocking
-            -len([item for item in container.items 
-                 if (abs(space.x - (item.position[0] + item.dimensions[0])) < 0.001 or
-                     abs(space.x + space.width - item.position[0]) < 0.001 or
-                     abs(space.y - (item.position[1] + item.dimensions[1])) < 0.001 or
-                     abs(space.y + space.depth - item.position[1]) < 0.001 or
-                     abs(space.z - (item.position[2] + item.dimensions[2])) < 0.001 or
-                     abs(space.z + space.height - item.position[2]) < 0.001)]),
-            # Then prefer spaces closer to origin for compact packing
-            space.x**2 + space.y**2 + space.z**2
-        ))
+    # Offer spaces with better interlocking potential first: bottom spaces, then
+    # corners and walls, then spaces touching more placed items, then near the origin.
+    # The order is maintained incrementally as items are placed.
+    container.set_space_order(interlocking_space_key)
+    
+    # Starting point for alternative arrangements (generate_multiple_arrangements)
+    container._packing_start = container.snapshot()
     
     # Track which items couldn't be packed for better reporting
     unpacked_items = []
@@ -217,12 +218,11 @@ def final_packing(best_genome, container_dims, expanded_items, route_temperature
         if hasattr(item, 'needs_insulation'):
             item_copy.needs_insulation = item.needs_insulation
         
-        # Apply rotation using genetic packer's rotation method
-        rotated_dims = GeneticPacker._get_rotation(None, item_copy.dimensions, rotation_flag)
-        item_copy.dimensions = rotated_dims
-        
-        # Sort spaces before trying to place this item
-        sort_spaces_by_fitness(container)
+        # Apply the valid orientation the rotation gene selects, as in fitness evaluation
+        rotated_dims = container._get_orientation_table().select(
+            item_copy.dimensions, item_copy.fragility == 'HIGH', int(rotation_flag))
+        if rotated_dims is not None:  # Otherwise the item fits no way and stays unpacked
+            item_copy.dimensions = rotated_dims
         
         # Print data about temperature-sensitive items for debugging - only at DEBUG level
         if hasattr(item_copy, 'needs_insulation') and item_copy.needs_insulation:
@@ -294,8 +294,6 @@ def final_packing(best_genome, container_dims, expanded_items, route_temperature
                                         insulating_items += 1
                             logger.info(f"     Not in central area, but has {surrounding_items} surrounding items ({insulating_items} insulating)")
                     
-                    # Sort spaces immediately after placing an item to use the newly created spaces
-                    sort_spaces_by_fitness(container)
                     placed = True
                     successful_packs += 1
                     break
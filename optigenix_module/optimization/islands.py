@@ -0,0 +1,306 @@
+"""
+Island-model genetic algorithm across CPU cores.
+Each island is an independent population evolved in its own process with its
+own mutation focus, so the islands explore different regions of the search
+space. Every few generations the islands exchange their top genomes (ring or
+all-to-all); only compact index/rotation encodings cross process boundaries.
+"""
+import logging
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("packer")
+
+# Mutation focus of island i is ISLAND_FOCI[i % len(ISLAND_FOCI)]
+ISLAND_FOCI = ('rotation', 'swap', 'subsequence', 'aggressive')
+MIGRATION_TOPOLOGIES = ('ring', 'all_to_all')
+
+class _IslandState:
+    """Population and search state of the island living in a worker process"""
+
+    def __init__(self, packer, focus, migration_size):
+        self.packer = packer
+        self.focus = focus
+        self.migration_size = migration_size
+        self.population = None  # Seeded on the first epoch
+        self.best = None  # (order, rotation flags, fitness, metrics) of the best genome found
+        self.stagnation = 0
+        self.generations = 0
+        self.surrogate = packer._create_surrogate()
+
+# The island of an island worker process (each island has a single-worker pool)
+_island = None
+
+def _init_island(container_dims, route_temperature, items, use_height_map, population_size, seed_fraction,
+                 seed_strategies, surrogate_fraction, early_abort, metric_tiers, focus, migration_size, rng_seed):
+    """Initialize an island worker with the shared item table and its own random stream"""
+    global _island
+    from optigenix_module.optimization.packer import GeneticPacker
+
+    random.seed(rng_seed)
+    packer = GeneticPacker(container_dims, population_size=population_size, route_temperature=route_temperature,
+                           workers=1, llm_budget=0, seed_fraction=seed_fraction, seed_strategies=seed_strategies,
+                           islands=1, surrogate_fraction=surrogate_fraction, early_abort=early_abort,
+                           metric_tiers=metric_tiers)
+    packer.items_to_pack = items
+    packer.use_height_map = use_height_map
+    packer._item_spec, packer._decode_table = packer._build_decode_table(items)
+    packer._item_types = packer._build_item_types(packer._item_spec, packer._decode_table)
+    _island = _IslandState(packer, focus, migration_size)
+
+def _receive_immigrants(island, immigrants) -> int:
+    """Replace the island's worst genomes, never its elite, with immigrants; returns how many were accepted"""
+    from optigenix_module.optimization.packer import PackingGenome
+
+    packer, population = island.packer, island.population
+    elite_count = max(1, int(packer.population_size * packer.elite_percentage))
+    worst_first = sorted(range(len(population)), key=lambda i: population[i].fitness)
+    accepted = 0
+    for slot, (order, rotation_flags, fitness) in zip(worst_first[:len(population) - elite_count], immigrants):
+        genome = PackingGenome.from_compact(packer.items_to_pack, order, rotation_flags)
+        genome.fitness = fitness
+        population[slot] = genome
+        accepted += 1
+    return accepted
+
+def _run_island_epoch(payload) -> Dict[str, Any]:
+    """
+    Evolve the worker's island for a number of generations
+
+    Args:
+        payload: Tuple of (immigrants as (order, rotation flags, fitness) tuples,
+            generations, fitness weights, deadline or None)
+
+    Returns:
+        dict: generations and evaluations completed, the island's best genome as
+        (order, rotation flags, fitness, metrics), its top genomes as emigrants,
+        the average fitness of its last generation and the epoch's metric profile
+    """
+    from optigenix_module.optimization.packer import PackingGenome
+
+    immigrants, generations, fitness_weights, deadline = payload
+    island = _island
+    packer = island.packer
+    packer.fitness_weights = fitness_weights
+    packer.metric_profile = {}
+    items = packer.items_to_pack
+
+    completed = evaluations = accepted = 0
+    emigrants, average_fitness = [], 0.0
+    for _ in range(generations):
+        if island.population is None:
+            island.population = packer._seed_population(items, deadline)
+            island.population += [PackingGenome(items) for _ in range(packer.population_size - len(island.population))]
+        else:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if immigrants:
+                accepted = _receive_immigrants(island, immigrants)
+                immigrants = None
+            packer._abort_below = packer._abort_threshold(island.population)
+            island.population = packer._next_generation(island.population, island.focus, island.surrogate)
+
+        evaluated = packer._evaluate_population(island.population, None, deadline)
+        completed += 1
+        island.generations += 1
+        if island.surrogate is not None:
+            island.surrogate.observe(evaluated, island.generations)
+        evaluations += len(evaluated)
+        ranked = sorted(evaluated, key=lambda x: x.fitness, reverse=True)
+        average_fitness = sum(g.fitness for g in evaluated) / len(evaluated)
+        emigrants = [(g.order.copy(), g.rotation_flags.copy(), g.fitness) for g in ranked[:island.migration_size]]
+        if island.best is None or ranked[0].fitness > island.best[2]:
+            best = ranked[0]
+            island.best = (best.order.copy(), best.rotation_flags.copy(), best.fitness,
+                           dict(getattr(best, 'metrics', None) or {}))
+            island.stagnation = 0
+        else:
+            island.stagnation += 1
+
+        # Same escape from stagnation as a single population, without LLM advice
+        if island.stagnation >= 5:
+            strategy = packer._get_aggressive_mutation_strategy(island.stagnation)
+            for genome in island.population:
+                genome.mutate(operation_focus=strategy["operation_focus"],
+                              rate_modifier=strategy["mutation_rate_modifier"])
+
+    return {
+        'generations': completed,
+        'evaluations': evaluations,
+        'immigrants_accepted': accepted,
+        'best': island.best,
+        'emigrants': emigrants,
+        'average_fitness': average_fitness,
+        'surrogate': island.surrogate.stats() if island.surrogate is not None else None,
+        'metric_profile': packer.metric_profile,
+    }
+
+class IslandModel:
+    """
+    Run a GeneticPacker's search as an island model
+
+    The packer's `islands` populations of `population_size` genomes each live
+    in their own single-process pool, so every island keeps its population,
+    fitness cache and decode trie between epochs. Islands run
+    `migration_interval` generations at a time in parallel; between epochs
+    each island's top `migration_size` genomes replace the worst genomes of
+    the next island (ring) or of every other island (all_to_all). Fitness
+    weights stay fixed for the run and no LLM advice is requested.
+    """
+
+    def __init__(self, packer, items):
+        """
+        Initialize the island model
+
+        Args:
+            packer: GeneticPacker with its decode tables and fitness weights set for items
+            items: Item table shared by every island
+        """
+        self.packer = packer
+        self.items = items
+        self.count = packer.islands
+        self.foci = [ISLAND_FOCI[island % len(ISLAND_FOCI)] for island in range(self.count)]
+        self.stats: List[Dict[str, Any]] = []  # Per-island generations, evaluations and best fitness
+
+    def _start_islands(self) -> Optional[List[ProcessPoolExecutor]]:
+        """Start one single-worker pool per island, or None if processes are unavailable"""
+        packer = self.packer
+        executors = []
+        try:
+            for island in range(self.count):
+                executors.append(ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_island,
+                    initargs=(packer.container_dims, packer.route_temperature, self.items, packer.use_height_map,
+                              packer.population_size, packer.seed_fraction,
+                              packer.seed_strategies[island::self.count], packer.surrogate_fraction, packer.early_abort,
+                              packer.metric_tiers, self.foci[island], packer.migration_size, random.getrandbits(64))
+                ))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not start island processes: {e}")
+            for executor in executors:
+                executor.shutdown(wait=False)
+            return None
+        return executors
+
+    def _migrants_for(self, results) -> Dict[int, list]:
+        """Immigrants of every island for the next epoch, by the packer's topology"""
+        islands = sorted(results)
+        immigrants = {}
+        for position, island in enumerate(islands):
+            if len(islands) < 2:
+                sources = []
+            elif self.packer.migration_topology == 'ring':
+                sources = [islands[position - 1]]
+            else:  # all_to_all
+                sources = [source for source in islands if source != island]
+            immigrants[island] = [genome for source in sources for genome in results[source]['emigrants']]
+        return immigrants
+
+    def run(self, deadline=None, volume_bound=None) -> Optional[Tuple[Any, float]]:
+        """
+        Evolve the islands for the packer's number of generations
+
+        The packer's stopping criteria are checked between epochs and
+        packer.generation_count, generation_history and stop_reason are
+        updated as for a single population.
+
+        Args:
+            deadline: time.monotonic() value at which the time budget runs out, or None
+            volume_bound: Upper bound on volume utilization, or None if that criterion is off
+
+        Returns:
+            tuple: (best genome, best fitness), or None if no island could run
+        """
+        from optigenix_module.optimization.packer import PackingGenome
+
+        packer = self.packer
+        executors = self._start_islands()
+        if executors is None:
+            return None
+        logger.info(f"🏝️  Island model: {self.count} islands ({', '.join(self.foci)}), migrating "
+                    f"{packer.migration_size} genome(s) every {packer.migration_interval} generation(s) "
+                    f"({packer.migration_topology})")
+        self.stats = [{'island': island, 'focus': focus, 'generations': 0, 'evaluations': 0,
+                       'immigrants_accepted': 0, 'best_fitness': float('-inf')}
+                      for island, focus in enumerate(self.foci)]
+
+        best_genome, best_fitness = None, float('-inf')
+        stagnation_counter = 0
+        immigrants = {island: [] for island in range(self.count)}
+        alive = list(range(self.count))
+        try:
+            while packer.generation_count < packer.generations and alive:
+                span = min(packer.migration_interval, packer.generations - packer.generation_count)
+                futures = {island: executors[island].submit(
+                    _run_island_epoch, (immigrants.get(island), span, packer.fitness_weights, deadline))
+                    for island in alive}
+                results = {}
+                for island, future in futures.items():
+                    try:
+                        results[island] = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Island {island} failed and leaves the model: {e}")
+                        alive.remove(island)
+                results = {island: result for island, result in results.items() if result['best'] is not None}
+                completed = max((result['generations'] for result in results.values()), default=0)
+                if completed == 0:
+                    break
+                packer.generation_count += completed
+
+                improved = False
+                for island, result in results.items():
+                    stats = self.stats[island]
+                    for key in ('generations', 'evaluations', 'immigrants_accepted'):
+                        stats[key] += result[key]
+                    order, rotation_flags, fitness, metrics = result['best']
+                    stats['best_fitness'] = fitness
+                    if result['surrogate'] is not None:
+                        stats['surrogate'] = result['surrogate']
+                    packer._merge_metric_profile(result['metric_profile'])
+                    if fitness > best_fitness:
+                        best_genome = PackingGenome.from_compact(self.items, order, rotation_flags)
+                        best_genome.fitness, best_genome.metrics = fitness, metrics
+                        best_fitness = fitness
+                        improved = True
+
+                logger.info(f"🏝️  Generation {packer.generation_count}/{packer.generations}: island best fitness "
+                            + " | ".join(f"{self.foci[island]} {result['best'][2]:.4f}"
+                                         for island, result in sorted(results.items())))
+                best_metrics = getattr(best_genome, 'metrics', None) or {}
+                packer.generation_history.append({
+                    'generation': packer.generation_count,
+                    'best_fitness': best_fitness,
+                    'average_fitness': sum(r['average_fitness'] for r in results.values()) / len(results),
+                    'volume_utilization': best_metrics.get('volume_utilization', 0.0),
+                })
+                if improved:
+                    stagnation_counter = 0
+                    logger.info(f"    🎯 NEW BEST SOLUTION! Fitness: {best_fitness:.4f}")
+                else:
+                    stagnation_counter += completed
+
+                packer.stop_reason = packer._check_stopping_criteria(deadline, best_genome, best_fitness,
+                                                                     stagnation_counter, volume_bound)
+                if packer.stop_reason:
+                    logger.info(f"    🛑 Stopping early: {packer.stop_reason}")
+                    break
+
+                immigrants = self._migrants_for(results)
+                migrated = sum(len(genomes) for genomes in immigrants.values())
+                if migrated:
+                    logger.info(f"    🔁 Migrated {migrated} genome(s) between {len(results)} islands")
+        finally:
+            for executor in executors:
+                # Do not wait for epochs still running when the time budget ran out
+                executor.shutdown(wait=packer.stop_reason != 'time_budget', cancel_futures=True)
+
+        if best_genome is None:
+            return None
+        for stats in self.stats:
+            logger.info(f"  🏝️  Island {stats['island']} ({stats['focus']}): best {stats['best_fitness']:.4f} after "
+                        f"{stats['generations']} generations, {stats['evaluations']} evaluations, "
+                        f"{stats['immigrants_accepted']} immigrants accepted")
+        return best_genome, best_fitness
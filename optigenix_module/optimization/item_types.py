@@ -0,0 +1,106 @@
+"""
+Item-type layer for genome symmetry breaking.
+Manifests list identical boxes with a quantity, and the GA expands them into
+distinct items. Genomes that differ only in which copy of a box sits where, or
+in rotation genes that select the same orientation, decode to the same packing.
+This table maps every genome to its canonical form so such genomes share
+fitness cache entries and decode snapshots.
+"""
+from math import lgamma, log
+from typing import Sequence, Tuple
+
+import numpy as np
+
+ROTATION_COUNT = 6
+
+class ItemTypeTable:
+    """
+    Type ids, multiplicities and orientations of the items being packed
+
+    Items with identical spec rows share a type id and a list of valid,
+    de-duplicated orientations; a rotation gene indexes into that list. A
+    genome decodes to the sequence of (type id, orientation) left after the
+    decoder's stable pre-sort, so two genomes with the same canonical decode
+    sequence always produce the same packing and fitness.
+    """
+
+    def __init__(self, type_ids, sort_keys: Sequence, orientations: Sequence):
+        """
+        Build the table
+
+        Args:
+            type_ids: (n,) type id of each item-table row
+            sort_keys: Decoder pre-sort key of each row (decoding sorts them in descending order)
+            orientations: Valid, de-duplicated orientations of each row (see OrientationTable)
+        """
+        self.type_ids = np.asarray(type_ids, dtype=np.int32)
+        self.type_count = int(self.type_ids.max()) + 1 if len(self.type_ids) else 0
+        self.multiplicities = np.bincount(self.type_ids, minlength=self.type_count)
+
+        # Rows of each type in ascending row order, grouped by type
+        self._rows_by_type = np.argsort(self.type_ids, kind='stable').astype(np.int32)
+
+        # Dense decode rank: rank 0 is decoded first
+        distinct_keys = sorted(set(sort_keys), reverse=True)
+        rank_of = {key: rank for rank, key in enumerate(distinct_keys)}
+        self._ranks = np.array([rank_of[key] for key in sort_keys], dtype=np.int32)
+
+        # Orientations per type; a rotation gene selects orientation gene % count
+        self.orientations = [()] * self.type_count
+        for row, type_id in enumerate(self.type_ids.tolist()):
+            self.orientations[type_id] = tuple(orientations[row])
+        counts = np.array([len(options) for options in self.orientations], dtype=np.int64)[self.type_ids]
+        genes = np.arange(ROTATION_COUNT)
+        self._canonical_rotations = (genes[None, :] % np.maximum(counts, 1)[:, None]).astype(np.uint8)
+
+    def __len__(self):
+        return len(self.type_ids)
+
+    def search_space_reduction(self) -> float:
+        """log10 of the number of item orderings that collapse onto one type ordering"""
+        return sum(lgamma(int(count) + 1) for count in self.multiplicities) / log(10)
+
+    def orientation(self, row, rotation_flag):
+        """Rotated dimensions a rotation gene selects for a row, or None if the item fits no way"""
+        options = self.orientations[self.type_ids[row]]
+        return options[rotation_flag % len(options)] if options else None
+
+    def canonical_rotation(self, row, rotation_flag) -> int:
+        """Smallest rotation gene selecting the same orientation of a row as rotation_flag"""
+        return int(self._canonical_rotations[row, rotation_flag])
+
+    def canonical_rotations(self, order, rotation_flags) -> np.ndarray:
+        """Rotation genes with every gene replaced by the smallest gene selecting the same orientation"""
+        return self._canonical_rotations[order, rotation_flags]
+
+    def canonical_order(self, order) -> np.ndarray:
+        """
+        Order with the copies of each item type relabelled in ascending row order
+
+        The positions holding a type keep that type, so the relabelled order
+        decodes to the same packing.
+        """
+        positions = np.argsort(self.type_ids[order], kind='stable')
+        canonical = np.empty_like(order)
+        canonical[positions] = self._rows_by_type
+        return canonical
+
+    def decode_ranks(self, order) -> np.ndarray:
+        """Decode rank of each item in order; the decoder keeps items of equal rank in genome order"""
+        return self._ranks[np.asarray(order)]
+
+    def decode_sequence(self, order, rotation_flags) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Canonical decode sequence of a genome
+
+        Args:
+            order: Item-table indices in genome order
+            rotation_flags: Rotation flags aligned with order
+
+        Returns:
+            tuple: (type ids, canonical rotation flags) in the order the decoder places them
+        """
+        order = np.asarray(order)
+        positions = np.argsort(self.decode_ranks(order), kind='stable')
+        decode_order = order[positions]
+        return self.type_ids[decode_order], self.canonical_rotations(decode_order, np.asarray(rotation_flags)[positions])
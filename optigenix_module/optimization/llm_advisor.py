@@ -0,0 +1,141 @@
+"""
+Background LLM requests for the genetic algorithm.
+LLM calls can take seconds (and retry with sleeps), so the GA issues them on a
+background thread and keeps evaluating generations. Advice is applied only if it
+arrives within a latency budget; otherwise the caller falls back to its
+built-in strategy.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("packer")
+
+class LLMAdvisor:
+    """
+    Runs LLM requests in the background with a per-request latency budget
+
+    Each kind of advice (e.g. 'mutation_strategy', 'fitness_weights') has at
+    most one request in flight. A response is usable only if it completed
+    within `budget` seconds of submission; late responses are ignored when
+    they are collected. Latency, timeout, error and applied/ignored counts are
+    kept per kind.
+    """
+
+    def __init__(self, budget=5.0, max_workers=3):
+        """
+        Initialize the advisor
+
+        Args:
+            budget: Seconds a response may take, from submission, to be applied
+            max_workers: Background threads (one per kind of advice is enough)
+        """
+        self.budget = budget
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending: Dict[str, tuple] = {}  # kind -> (future, submitted at)
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _kind_stats(self, kind) -> Dict[str, Any]:
+        """Counters of one kind of advice"""
+        return self._stats.setdefault(kind, {'requests': 0, 'applied': 0, 'ignored': 0, 'timeouts': 0,
+                                             'errors': 0, 'latencies': []})
+
+    def submit(self, kind: str, request: Callable, *args) -> bool:
+        """
+        Start a request in the background
+
+        Args:
+            kind: Kind of advice
+            request: Callable returning the raw LLM response
+            *args: Arguments for request
+
+        Returns:
+            bool: False if a request of this kind is still in flight (nothing is submitted)
+        """
+        if kind in self._pending and not self._pending[kind][0].done():
+            return False
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm-advisor")
+        submitted_at = time.monotonic()
+        future = self._executor.submit(request, *args)
+        future.add_done_callback(lambda done: setattr(done, 'finished_at', time.monotonic()))
+        self._pending[kind] = (future, submitted_at)
+        self._kind_stats(kind)['requests'] += 1
+        return True
+
+    def collect(self, kind: str, wait=False) -> Optional[Any]:
+        """
+        Take the response of the pending request of a kind, if it is usable
+
+        Args:
+            kind: Kind of advice
+            wait: Block until the response arrives or the budget runs out
+
+        Returns:
+            The raw response, or None if there is no request, it is still within
+            budget and wait is False, it missed the budget or it failed
+        """
+        entry = self._pending.get(kind)
+        if entry is None:
+            return None
+        future, submitted_at = entry
+        stats = self._kind_stats(kind)
+        if not future.done():
+            remaining = submitted_at + self.budget - time.monotonic()
+            if remaining > 0 and not wait:
+                return None  # Still within budget; try again at the next decision point
+            if remaining > 0:
+                try:
+                    future.exception(timeout=remaining)
+                except Exception:
+                    pass
+            if not future.done():
+                del self._pending[kind]  # Left to finish in the background; its response is never used
+                stats['timeouts'] += 1
+                stats['ignored'] += 1
+                logger.info(f"    ⏱️  LLM {kind} advice missed its {self.budget:.1f}s budget; using the fallback")
+                return None
+
+        del self._pending[kind]
+        latency = getattr(future, 'finished_at', time.monotonic()) - submitted_at
+        stats['latencies'].append(latency)
+        if future.exception() is not None:
+            stats['errors'] += 1
+            stats['ignored'] += 1
+            logger.warning(f"    ⚠️  LLM {kind} request failed after {latency:.2f}s: {future.exception()}")
+            return None
+        if latency > self.budget:
+            stats['timeouts'] += 1
+            stats['ignored'] += 1
+            logger.info(f"    ⏱️  LLM {kind} advice arrived after {latency:.2f}s (budget {self.budget:.1f}s); ignored")
+            return None
+        return future.result()
+
+    def record(self, kind: str, applied: bool) -> None:
+        """Count a collected response as applied or ignored (e.g. unparseable)"""
+        self._kind_stats(kind)['applied' if applied else 'ignored'] += 1
+
+    def discard(self, kind: str) -> None:
+        """Drop the pending request of a kind; its response will not be used"""
+        if self._pending.pop(kind, None) is not None:
+            self._kind_stats(kind)['ignored'] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-kind counters with mean and max latency in seconds"""
+        summary = {}
+        for kind, stats in self._stats.items():
+            latencies = stats['latencies']
+            summary[kind] = {key: value for key, value in stats.items() if key != 'latencies'}
+            summary[kind]['mean_latency'] = sum(latencies) / len(latencies) if latencies else 0.0
+            summary[kind]['max_latency'] = max(latencies, default=0.0)
+        return summary
+
+    def shutdown(self) -> None:
+        """Stop accepting requests without waiting for those still running"""
+        for kind in list(self._pending):
+            self.discard(kind)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
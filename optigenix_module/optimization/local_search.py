@@ -0,0 +1,207 @@
+"""
+Memetic local search on the genetic algorithm's best genome.
+The GA finds good regions of the search space but rarely the best packing
+within them. This stage refines the final genome with first-improvement hill
+climbing over small neighbourhoods, re-decoding each neighbour only from the
+first decode position it changes.
+
+The decoder stably pre-sorts items by volume, weight and stackability, so
+sequence moves between items of different sort keys are undone before
+placement. Sequence neighbourhoods therefore only rearrange items within a
+run of equal sort keys; rotation flips apply to every item.
+"""
+import logging
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from optigenix_module.optimization.decoder import PrefixSnapshotTrie
+from optigenix_module.optimization.fitness_cache import genome_fingerprint
+
+logger = logging.getLogger("packer")
+
+NEIGHBOURHOODS = ('rotation_flip', 'swap', 'insert', 'block_move')
+BLOCK_SIZES = (2, 3)
+
+class LocalSearch:
+    """
+    First-improvement local search with a time budget
+
+    The incumbent genome is rewritten in decode order, so a move's first
+    changed genome position is also its first changed decode step. The
+    incumbent's container state is snapshotted after every decode step in a
+    private decode trie, and each neighbour resumes from the snapshot in front
+    of its first change without adding snapshots of its own. Moves are tried
+    in random order; the first improving neighbour becomes the incumbent and
+    the search restarts from it, until no neighbour improves (a local optimum)
+    or the budget runs out.
+    """
+
+    def __init__(self, packer, items, neighbourhoods=NEIGHBOURHOODS):
+        """
+        Initialize the local search
+
+        Args:
+            packer: GeneticPacker with its decode tables and fitness weights set for items
+            items: Item table of the genome being refined
+            neighbourhoods: Neighbourhoods to explore, from NEIGHBOURHOODS
+        """
+        self.packer = packer
+        self.items = items
+        self.item_types = packer._item_types
+        self.neighbourhoods = tuple(neighbourhoods)
+        self.stats: Dict[str, Any] = {}
+
+    def _groups(self, order) -> List[Tuple[int, int]]:
+        """(start, end) of every run of equal decode rank holding more than one item type"""
+        ranks = self.item_types.decode_ranks(order)
+        types = self.item_types.type_ids[order]
+        groups, start = [], 0
+        for end in range(1, len(order) + 1):
+            if end == len(order) or ranks[end] != ranks[start]:
+                if len(set(types[start:end].tolist())) > 1:
+                    groups.append((start, end))
+                start = end
+        return groups
+
+    def _moves(self, order, rotation_flags) -> List[Tuple[str, tuple]]:
+        """Every move of the enabled neighbourhoods from a decode-ordered genome"""
+        moves = []
+        if 'rotation_flip' in self.neighbourhoods:
+            for position, row in enumerate(order.tolist()):
+                options = self.item_types.orientations[self.item_types.type_ids[row]]
+                current = self.item_types.canonical_rotation(row, rotation_flags[position])
+                moves.extend(('rotation_flip', (position, gene)) for gene in range(len(options)) if gene != current)
+        types = self.item_types.type_ids[order]
+        for start, end in self._groups(order):
+            for first in range(start, end):
+                for second in range(first + 1, end):
+                    if 'swap' in self.neighbourhoods and types[first] != types[second]:
+                        moves.append(('swap', (first, second)))
+                    if 'insert' in self.neighbourhoods and second > first + 1:
+                        moves.append(('insert', (first, second)))
+                        moves.append(('insert', (second, first)))
+            if 'block_move' in self.neighbourhoods:
+                for size in BLOCK_SIZES:
+                    for first in range(start, end - size + 1):
+                        for target in range(start, end - size + 1):
+                            if target != first:
+                                moves.append(('block_move', (first, size, target)))
+        return moves
+
+    @staticmethod
+    def _apply(move, order, rotation_flags) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbour (order, rotation flags) produced by a move"""
+        kind, args = move
+        order, rotation_flags = order.copy(), rotation_flags.copy()
+        if kind == 'rotation_flip':
+            position, gene = args
+            rotation_flags[position] = gene
+            return order, rotation_flags
+        if kind == 'swap':
+            first, second = args
+            for values in (order, rotation_flags):
+                values[first], values[second] = values[second], values[first]
+            return order, rotation_flags
+        if kind == 'insert':
+            source, target = args
+            block = [source]
+        else:  # block_move
+            source, size, target = args
+            block = list(range(source, source + size))
+        rest = [i for i in range(len(order)) if i not in block]
+        indices = np.array(rest[:target] + block + rest[target:])
+        return order[indices], rotation_flags[indices]
+
+    def _decode_incumbent(self, genome) -> float:
+        """Evaluate the incumbent from scratch, snapshotting the container after every step"""
+        self.packer.decode_trie.clear()
+        return self.packer._evaluate_fitness(genome)
+
+    def run(self, genome, deadline) -> Tuple[Any, float]:
+        """
+        Refine a genome until a local optimum or the deadline
+
+        Args:
+            genome: Genome to refine (not modified)
+            deadline: time.monotonic() value at which the search stops
+
+        Returns:
+            tuple: (best genome, its fitness under the packer's current weights)
+        """
+        from optigenix_module.optimization.packer import PackingGenome
+
+        packer, item_types = self.packer, self.item_types
+        started = time.monotonic()
+        saved_trie = packer.decode_trie
+        packer.decode_trie = PrefixSnapshotTrie(max_snapshots=len(self.items) + 1, checkpoint_interval=1)
+        stats = {name: {'tried': 0, 'improved': 0, 'fitness_gain': 0.0} for name in self.neighbourhoods}
+        evaluations = skipped = 0
+        local_optimum = False
+        try:
+            # Rewrite the incumbent in decode order so genome positions are decode steps
+            order, rotation_flags = genome.to_compact()
+            positions = np.argsort(item_types.decode_ranks(order), kind='stable')
+            incumbent = PackingGenome.from_compact(self.items, order[positions], rotation_flags[positions])
+            incumbent.canonicalize(item_types)
+            start_fitness = fitness = self._decode_incumbent(incumbent)
+
+            while time.monotonic() < deadline:
+                order, rotation_flags = incumbent.to_compact()
+                seen = {genome_fingerprint(*item_types.decode_sequence(order, rotation_flags), packer.fitness_weights)}
+                moves = self._moves(order, rotation_flags)
+                random.shuffle(moves)
+                improved = False
+                for move in moves:
+                    if time.monotonic() >= deadline:
+                        break
+                    new_order, new_flags = self._apply(move, order, rotation_flags)
+                    key = genome_fingerprint(*item_types.decode_sequence(new_order, new_flags), packer.fitness_weights)
+                    if key in seen:
+                        skipped += 1  # Decodes to a packing already tried from this incumbent
+                        continue
+                    seen.add(key)
+                    neighbour = PackingGenome.from_compact(self.items, new_order, new_flags)
+                    cached = packer.fitness_cache.get(key)
+                    if cached is not None:
+                        neighbour.fitness, neighbour.metrics = cached[0], dict(cached[1])
+                    else:
+                        # With early abort, neighbours that cannot beat the incumbent stop decoding early
+                        packer._evaluate_fitness(neighbour, record_prefixes=False,
+                                                 abort_below=fitness if packer.early_abort else None)
+                        if not neighbour.metrics.get('incomplete'):
+                            packer.fitness_cache.put(key, neighbour.fitness, dict(neighbour.metrics))
+                        evaluations += 1
+                    stats[move[0]]['tried'] += 1
+                    if neighbour.fitness > fitness + 1e-12:
+                        stats[move[0]]['improved'] += 1
+                        stats[move[0]]['fitness_gain'] += neighbour.fitness - fitness
+                        incumbent, fitness = neighbour, neighbour.fitness
+                        self._decode_incumbent(incumbent)
+                        improved = True
+                        break
+                if not improved:
+                    local_optimum = time.monotonic() < deadline
+                    break
+        finally:
+            trie_stats = packer.decode_trie.stats()
+            packer.decode_trie = saved_trie
+
+        seconds = time.monotonic() - started
+        self.stats = {
+            'seconds': seconds,
+            'start_fitness': start_fitness,
+            'final_fitness': fitness,
+            'fitness_gain': fitness - start_fitness,
+            'gain_per_second': (fitness - start_fitness) / seconds if seconds > 0 else 0.0,
+            'improvements': sum(s['improved'] for s in stats.values()),
+            'neighbours': sum(s['tried'] for s in stats.values()),
+            'evaluations': evaluations,
+            'duplicates_skipped': skipped,
+            'local_optimum': local_optimum,
+            'resumed_ratio': trie_stats['skipped_ratio'],
+            'neighbourhoods': stats,
+        }
+        return incumbent, fitness
@@ -1,22 +1,33 @@
 """
 Genetic algorithm implementation for container packing optimization.
 """
+import os
 import random
 import time
 import json
 import logging
+import math
 import multiprocessing
 from copy import deepcopy
 from typing import List, Dict, Tuple, Any, Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import numpy as np
 
-from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.headless_container import HeadlessContainer
 from optigenix_module.models.item import Item
-from optigenix_module.utils.llm_connector import get_llm_client
+from optigenix_module.models.item_spec import ItemSpec
+from optigenix_module.models.orientation_table import OrientationTable
 from optigenix_module.optimization.temperature import TemperatureConstraintHandler
 from optigenix_module.optimization.max_utilization_fitness import apply_max_volume_fitness, detect_demo_dataset
+from optigenix_module.optimization.fitness_cache import FitnessCache, genome_fingerprint
+from optigenix_module.optimization.decoder import DecodeAborted, PrefixSnapshotTrie
+from optigenix_module.optimization.item_types import ItemTypeTable
+from optigenix_module.optimization.islands import MIGRATION_TOPOLOGIES, IslandModel
+from optigenix_module.optimization.llm_advisor import LLMAdvisor
+from optigenix_module.optimization.local_search import LocalSearch
+from optigenix_module.optimization.seeding import SEED_STRATEGIES, HeuristicSeeder
+from optigenix_module.optimization.surrogate import SurrogateModel
+from optigenix_module.utils.llm_cache import bucket, count_bucket, get_llm_cache, magnitude_bucket, make_cache_key
 
 # Configure logging
 logging.basicConfig(
@@ -32,26 +43,96 @@ if multiprocessing.current_process().name == 'MainProcess':
     logger.info("AI-ENHANCED GENETIC PACKER MODULE LOADED")
     logger.info("=" * 70)
 
-# Initialize LLM client
-llm_client = get_llm_client()
+# LLM client, created on first use so importing the packer (e.g. in GA workers)
+# does not load the Gemini SDK
+llm_client = None
+
+# Bump when a prompt template changes so cached responses to the old wording are not reused
+LLM_PROMPT_VERSION = 1
+
+# Fitness metrics grouped by evaluation cost. The first tier is computed for every
+# genome; a later tier only for metrics with a non-zero weight, and only while the
+# genome can still reach the early-abort threshold (see _evaluate_fitness).
+METRIC_TIERS = (
+    ('volume_utilization', 'items_packed_ratio', 'contact_ratio', 'weight_capacity'),
+    ('temperature_constraint', 'weight_balance'),
+    ('stability_score',),
+)
+
+def _get_llm_client():
+    """Return the shared LLM client, creating it on first use"""
+    global llm_client
+    if llm_client is None:
+        from optigenix_module.utils.llm_connector import get_llm_client
+        llm_client = get_llm_client()
+    return llm_client
+
+def _genome_rng():
+    """
+    Create a NumPy generator for a genome operation
+
+    Seeded from the `random` module so that seeding `random` keeps GA runs reproducible.
+    """
+    return np.random.default_rng(random.getrandbits(64))
 
 class PackingGenome:
     """
     Genome class for genetic algorithm-based packing optimization
     
     Represents a potential solution to the packing problem with a specific
-    item sequence and rotation configuration.
+    item sequence and rotation configuration. The sequence is stored as an int32
+    array of indices into a shared, immutable item table, and rotations as a
+    uint8 array aligned with it.
     """
     
     def __init__(self, items, mutation_rate=0.1):
         """Initialize genome with items and mutation rate"""
-        self.items = items  # Store the original items list
-        self.item_sequence = items.copy()
-        # Use array for rotation flags instead of list for better memory usage
-        self.rotation_flags = array('B', [random.randint(0, 5) for _ in items])
+        self.items = items  # Shared item table (never modified)
+        self.order = np.arange(len(items), dtype=np.int32)
+        self.rotation_flags = _genome_rng().integers(0, 6, size=len(items), dtype=np.uint8)
         self.mutation_rate = mutation_rate
         self.fitness = 0.0
 
+    @property
+    def item_sequence(self):
+        """Items in genome order (a new list; modify the genome through order instead)"""
+        items = self.items
+        return [items[i] for i in self.order.tolist()]
+
+    def to_compact(self):
+        """Encode the genome as (index sequence, rotation flags) for cheap transfer to worker processes"""
+        return self.order, self.rotation_flags
+
+    @classmethod
+    def from_compact(cls, items, order, rotation_flags, mutation_rate=0.1):
+        """Rebuild a genome from a compact encoding against the shared item table"""
+        genome = cls.__new__(cls)
+        genome.items = items
+        genome.order = np.asarray(order, dtype=np.int32)
+        genome.rotation_flags = np.asarray(rotation_flags, dtype=np.uint8)
+        genome.mutation_rate = mutation_rate
+        genome.fitness = 0.0
+        return genome
+
+    def canonicalize(self, item_types):
+        """
+        Rewrite the genome in its canonical form without changing the packing it decodes to
+
+        Copies of each item type are relabelled in ascending item-table order and
+        rotation flags are collapsed to the smallest flag giving the same dimensions,
+        so crossover lines up equivalent genes of equivalent parents.
+
+        Args:
+            item_types: ItemTypeTable of the genome's item table
+        """
+        self.order = item_types.canonical_order(self.order)
+        self.rotation_flags = item_types.canonical_rotations(self.order, self.rotation_flags)
+
+    def _swap(self, rng):
+        """Swap two random positions in the sequence"""
+        idx1, idx2 = rng.choice(len(self.order), size=2, replace=False)
+        self.order[idx1], self.order[idx2] = self.order[idx2], self.order[idx1]
+
     def mutate(self, operation_focus=None, rate_modifier=0):
         """
         Apply mutation operators to modify the genome
@@ -91,77 +172,92 @@ class PackingGenome:
             subsequence_prob = 1.0
             aggressive_prob = 0.0
         
+        rng = _genome_rng()
+        size = len(self.order)
+
         # Rotation mutation
-        for i in range(len(self.item_sequence)):
-            if random.random() < effective_rate * rotation_prob:
-                self.rotation_flags[i] = random.randint(0, 5)
+        mask = rng.random(size) < effective_rate * rotation_prob
+        self.rotation_flags[mask] = rng.integers(0, 6, size=int(mask.sum()), dtype=np.uint8)
 
         # Sequence mutation - swap items
-        if random.random() < effective_rate * swap_prob * 2:
-            if len(self.item_sequence) >= 2:
-                idx1, idx2 = random.sample(range(len(self.item_sequence)), 2)
-                self.item_sequence[idx1], self.item_sequence[idx2] = \
-                    self.item_sequence[idx2], self.item_sequence[idx1]
+        if rng.random() < effective_rate * swap_prob * 2:
+            if size >= 2:
+                self._swap(rng)
             
         # Sequence mutation - shift subsequence
-        if random.random() < effective_rate * subsequence_prob:
-            if len(self.item_sequence) > 3:
-                seq_length = random.randint(2, max(2, len(self.item_sequence) // 2))
-                start_idx = random.randint(0, len(self.item_sequence) - seq_length - 1)
-                target_idx = random.randint(0, len(self.item_sequence) - seq_length)
-                
-                # Extract subsequence
-                subsequence = self.item_sequence[start_idx:start_idx+seq_length]
-                rotation_subseq = list(self.rotation_flags[start_idx:start_idx+seq_length])
-                
-                # Remove subsequence
-                self.item_sequence = self.item_sequence[:start_idx] + \
-                                    self.item_sequence[start_idx+seq_length:]
-                
-                # Create new rotation flags array
-                new_rotation_flags = (list(self.rotation_flags[:start_idx]) + 
-                                    list(self.rotation_flags[start_idx+seq_length:]))
+        if rng.random() < effective_rate * subsequence_prob:
+            if size > 3:
+                seq_length = int(rng.integers(2, max(2, size // 2), endpoint=True))
+                start_idx = int(rng.integers(0, size - seq_length - 1, endpoint=True))
+                target_idx = int(rng.integers(0, size - seq_length, endpoint=True))
                 
-                # Insert at target location
-                self.item_sequence = self.item_sequence[:target_idx] + \
-                                    subsequence + \
-                                    self.item_sequence[target_idx:]
-                
-                # Insert rotation subsequence and rebuild array
-                final_rotations = (new_rotation_flags[:target_idx] + 
-                                 rotation_subseq + 
-                                 new_rotation_flags[target_idx:])
-                self.rotation_flags = array('B', final_rotations)
+                # Remove the subsequence and reinsert it at the target location
+                end_idx = start_idx + seq_length
+                for name in ('order', 'rotation_flags'):
+                    values = getattr(self, name)
+                    rest = np.concatenate((values[:start_idx], values[end_idx:]))
+                    setattr(self, name, np.concatenate((rest[:target_idx], values[start_idx:end_idx], rest[target_idx:])))
         
         # Aggressive mutations - only applied when specified
-        if aggressive_prob > 0 and random.random() < effective_rate * aggressive_prob:
+        if aggressive_prob > 0 and rng.random() < effective_rate * aggressive_prob:
             # Multiple aggressive mutations to escape local optima
             
             # 1. Large sequence reversal - reverse a significant chunk of the sequence
-            if len(self.item_sequence) > 10:
-                chunk_size = random.randint(len(self.item_sequence)//4, len(self.item_sequence)//2)
-                start = random.randint(0, len(self.item_sequence) - chunk_size)
+            if size > 10:
+                chunk_size = int(rng.integers(size // 4, size // 2, endpoint=True))
+                start = int(rng.integers(0, size - chunk_size, endpoint=True))
                 
                 # Reverse the subsequence
-                self.item_sequence[start:start+chunk_size] = reversed(self.item_sequence[start:start+chunk_size])
+                self.order[start:start+chunk_size] = self.order[start:start+chunk_size][::-1]
                 
                 # Also randomize rotations in that subsequence
-                for i in range(start, start + chunk_size):
-                    self.rotation_flags[i] = random.randint(0, 5)
+                self.rotation_flags[start:start+chunk_size] = rng.integers(0, 6, size=chunk_size, dtype=np.uint8)
             
             # 2. Complete rotation randomization with high probability
-            if random.random() < 0.7:  # 70% chance
-                for i in range(len(self.rotation_flags)):
-                    if random.random() < 0.5:  # Randomize about half of all rotations
-                        self.rotation_flags[i] = random.randint(0, 5)
+            if rng.random() < 0.7:  # 70% chance
+                mask = rng.random(size) < 0.5  # Randomize about half of all rotations
+                self.rotation_flags[mask] = rng.integers(0, 6, size=int(mask.sum()), dtype=np.uint8)
             
             # 3. Multiple swaps - perform several random swaps to significantly change the sequence
-            swap_count = random.randint(3, max(3, len(self.item_sequence) // 5))
-            for _ in range(swap_count):
-                if len(self.item_sequence) >= 2:
-                    idx1, idx2 = random.sample(range(len(self.item_sequence)), 2)
-                    self.item_sequence[idx1], self.item_sequence[idx2] = \
-                        self.item_sequence[idx2], self.item_sequence[idx1]
+            swap_count = int(rng.integers(3, max(3, size // 5), endpoint=True))
+            if size >= 2:
+                for _ in range(swap_count):
+                    self._swap(rng)
+
+# Per-process packer used by the evaluation pool. Each worker receives the item
+# table once at start-up, so only compact genomes cross the process boundary.
+_worker_packer = None
+
+def _init_evaluation_worker(container_dims, route_temperature, items, use_height_map=False, metric_tiers=METRIC_TIERS):
+    """Initialize an evaluation worker with the shared item table"""
+    global _worker_packer
+    _worker_packer = GeneticPacker(container_dims, route_temperature=route_temperature, workers=1,
+                                   metric_tiers=metric_tiers)
+    _worker_packer.items_to_pack = items
+    _worker_packer.use_height_map = use_height_map
+    _worker_packer._item_spec, _worker_packer._decode_table = _worker_packer._build_decode_table(items)
+    _worker_packer._item_types = _worker_packer._build_item_types(_worker_packer._item_spec, _worker_packer._decode_table)
+
+def _evaluate_compact_genome(payload):
+    """
+    Evaluate a compact genome inside a worker process
+
+    Args:
+        payload: Tuple of (index sequence, rotation flags, fitness weights, abort threshold or None)
+
+    Returns:
+        tuple: (fitness, metrics, metric profile of this evaluation) or (0.0, None, {}) if evaluation failed
+    """
+    order, rotation_flags, fitness_weights, abort_below = payload
+    _worker_packer.fitness_weights = fitness_weights
+    _worker_packer.metric_profile = {}
+    genome = PackingGenome.from_compact(_worker_packer.items_to_pack, order, rotation_flags)
+    try:
+        fitness = _worker_packer._evaluate_fitness(genome, abort_below=abort_below)
+    except Exception as e:
+        logger.error(f"❌ Worker failed to evaluate genome: {e}")
+        return 0.0, None, {}
+    return fitness, genome.metrics, _worker_packer.metric_profile
 
 class GeneticPacker:
     """
@@ -170,11 +266,63 @@ class GeneticPacker:
     Uses evolutionary algorithms to find efficient item arrangements.
     """
     
-    def __init__(self, container_dims, population_size=10, generations=8, route_temperature=None):
-        """Initialize genetic packer with container dimensions and algorithm parameters"""
+    def __init__(self, container_dims, population_size=10, generations=8, route_temperature=None,
+                 workers=None, time_budget=None, target_fitness=None, stagnation_limit=None,
+                 stop_at_volume_bound=False, llm_budget=None, seed_fraction=None, seed_strategies=None,
+                 islands=None, migration_interval=None, migration_size=2, migration_topology=None,
+                 local_search_budget=None, surrogate_fraction=None, early_abort=None, metric_tiers=None):
+        """
+        Initialize genetic packer with container dimensions and algorithm parameters
+
+        Setting any of the stopping criteria runs optimize() in anytime mode:
+        it returns the best genome found so far, with its metrics, as soon as one
+        criterion is met, and after at most `generations` generations.
+
+        Args:
+            workers: Number of evaluation processes (defaults to GA_WORKERS env var, or 1 for serial)
+            time_budget: Wall-clock seconds for optimize() (positive and finite); evaluation stops
+                mid-generation when it runs out
+            target_fitness: Stop once the best fitness reaches this value
+            stagnation_limit: Stop after this many generations without improvement
+            stop_at_volume_bound: Stop once the best volume utilization reaches its upper
+                bound (every item packed, or the container full)
+            llm_budget: Seconds an LLM request may take before its advice is ignored
+                (defaults to GA_LLM_BUDGET env var, or 5); 0 calls the LLM synchronously
+            seed_fraction: Share of the initial population built by heuristic seeding
+                strategies (defaults to GA_SEED_FRACTION env var, or 0.3); 0 starts fully random
+            seed_strategies: Seeding strategies to draw from, in order (defaults to SEED_STRATEGIES)
+            islands: Populations evolved in parallel processes, each with its own mutation focus
+                (defaults to GA_ISLANDS env var, or 1 for a single population); capped at the
+                number of CPU cores
+            migration_interval: Generations between migrations of top genomes between islands
+                (defaults to GA_MIGRATION_INTERVAL env var, or 2)
+            migration_size: Top genomes each island sends per migration
+            migration_topology: 'ring' (to the next island) or 'all_to_all'
+                (defaults to GA_MIGRATION_TOPOLOGY env var, or 'ring')
+            local_search_budget: Seconds of local search refining the GA's best genome
+                (defaults to GA_LOCAL_SEARCH_BUDGET env var, or 0 to skip it); with a
+                time_budget, the GA stops this much earlier to leave it the time
+            surrogate_fraction: Share of bred offspring fully evaluated after ranking by a
+                surrogate fitness model (defaults to GA_SURROGATE_FRACTION env var, or 1 to
+                evaluate every child)
+            early_abort: Stop decoding a child once an upper bound on its fitness falls below
+                the weakest elite's fitness (defaults to GA_EARLY_ABORT env var, or off)
+            metric_tiers: Fitness metrics grouped into tiers computed cheapest first, as a
+                sequence of name tuples or a "name,name;name" string (defaults to
+                GA_METRIC_TIERS env var, or METRIC_TIERS)
+        """
         self.container_dims = container_dims
         self.population_size = population_size
         self.generations = generations
+        if time_budget is not None and not (math.isfinite(time_budget) and time_budget > 0):
+            raise ValueError(f"time_budget must be a positive number of seconds, got {time_budget!r}")
+        self.time_budget = time_budget
+        self.target_fitness = target_fitness
+        self.stagnation_limit = stagnation_limit
+        self.stop_at_volume_bound = stop_at_volume_bound
+        self.stop_reason = None  # Why the last optimize run stopped
+        self.generation_count = 0  # Generations completed by the last optimize run
+        self.generation_history = []  # Per-generation best/average fitness of the last optimize run
         self.best_solution = None
         self.mutation_rates = {
             'rotation': 0.2,    # Higher rate for rotation mutations
@@ -185,7 +333,81 @@ class GeneticPacker:
         self.route_temperature = route_temperature
         self.items_to_pack = None  # Will be set in optimize method
         self.fitness_weights = None  # Will be set in optimize method
-        
+
+        # Parallel evaluation settings
+        if workers is None:
+            workers = int(os.environ.get("GA_WORKERS", 1))
+        self.workers = max(1, workers)
+        self.parallel_min_population = 8  # Smaller batches are evaluated serially
+
+        # Heuristic seeds for part of the initial population
+        if seed_fraction is None:
+            seed_fraction = float(os.environ.get("GA_SEED_FRACTION", 0.3))
+        self.seed_fraction = min(1.0, max(0.0, seed_fraction))
+        self.seed_strategies = tuple(seed_strategies) if seed_strategies is not None else SEED_STRATEGIES
+
+        # Island model: populations in separate processes exchanging top genomes
+        if islands is None:
+            islands = int(os.environ.get("GA_ISLANDS", 1))
+        cores = os.cpu_count() or 1
+        if islands > cores:
+            # Islands sharing a core only add process and migration overhead
+            logger.warning(f"{islands} islands requested but only {cores} CPU core(s) available; "
+                           + (f"using {cores} islands" if cores > 1 else "using a single population"))
+            islands = cores
+        self.islands = max(1, islands)
+        if migration_interval is None:
+            migration_interval = int(os.environ.get("GA_MIGRATION_INTERVAL", 2))
+        self.migration_interval = max(1, migration_interval)
+        self.migration_size = max(0, migration_size)
+        self.migration_topology = migration_topology or os.environ.get("GA_MIGRATION_TOPOLOGY", "ring")
+        if self.migration_topology not in MIGRATION_TOPOLOGIES:
+            raise ValueError(f"Unknown migration topology {self.migration_topology!r}; "
+                             f"expected one of {', '.join(MIGRATION_TOPOLOGIES)}")
+        self.island_stats = []  # Per-island generations, evaluations and best fitness of the last optimize run
+
+        # Memetic refinement of the best genome after the GA
+        if local_search_budget is None:
+            local_search_budget = float(os.environ.get("GA_LOCAL_SEARCH_BUDGET", 0))
+        self.local_search_budget = max(0.0, local_search_budget)
+        self.local_search_stats = {}  # Fitness gained, time spent and moves tried by the last local search
+
+        # Surrogate pre-screening: breed 1/surrogate_fraction times the offspring, decode the most promising
+        if surrogate_fraction is None:
+            surrogate_fraction = float(os.environ.get("GA_SURROGATE_FRACTION", 1.0))
+        self.surrogate_fraction = min(1.0, max(0.05, surrogate_fraction))
+        self.surrogate_stats = {}  # Screening counts and surrogate/fitness correlation of the last optimize run
+
+        # Branch-and-bound: abort decodes that can no longer reach the elite
+        if early_abort is None:
+            early_abort = os.environ.get("GA_EARLY_ABORT", "0").lower() in ("1", "true", "yes")
+        self.early_abort = early_abort
+        self._abort_below = None  # Fitness threshold of the generation being evaluated, or None
+        self.early_abort_stats = {}  # Aborted decodes and decode steps skipped in the last optimize run
+
+        # Lazy metrics: expensive tiers only for weighted metrics of genomes that can still make the cut
+        if metric_tiers is None:
+            metric_tiers = os.environ.get("GA_METRIC_TIERS") or METRIC_TIERS
+        self.metric_tiers = self._parse_metric_tiers(metric_tiers)
+        self.metric_profile = {}  # Per-metric computations, skips and seconds in the last optimize run
+
+        # LLM requests run in the background while generations are evaluated
+        if llm_budget is None:
+            llm_budget = float(os.environ.get("GA_LLM_BUDGET", 5.0))
+        self.llm_budget = llm_budget
+        self._llm_advisor = None  # LLMAdvisor of the running optimize call, if the LLM is enabled
+        self.llm_stats = {}  # Per-kind LLM request counts and latencies of the last optimize run
+
+        # Memoized fitness/metrics keyed by genome fingerprint (reset for each optimize run)
+        self.fitness_cache = FitnessCache(max_size=4096)
+
+        # Container snapshots along shared decode prefixes (reset for each optimize run)
+        self.decode_trie = PrefixSnapshotTrie(max_snapshots=512, checkpoint_interval=4)
+        self._item_spec = None  # ItemSpec of the items being packed, set in optimize
+        self._item_types = None  # ItemTypeTable of the same items, set in optimize
+        self._decode_table = None  # id(item) -> (sort key, type id, spec row), set in optimize
+        self.use_height_map = False  # Answer support queries from a height map during evaluation
+
         # Initialize temperature constraint handler
         self.temp_handler = TemperatureConstraintHandler(route_temperature)
 
@@ -243,18 +465,31 @@ class GeneticPacker:
     def _get_initial_dynamic_fitness_weights(self, initial_metrics=None):
         """
         Get initial dynamic fitness function weights from LLM.
-        Uses module-level llm_client and logger.
+        Uses the shared LLM client and module-level logger.
         """
-        global llm_client, logger # Access module-level instances
+        llm_client = _get_llm_client()
 
         if not llm_client or not hasattr(llm_client, 'get_llm_completion'):
             logger.info("LLM client not available for initial dynamic fitness weights.")
             return None
 
+        try:
+            if initial_metrics is None:
+                initial_metrics = self._calculate_initial_metrics()
+            response_text = self._ask_llm('initial_weights', 'get_llm_completion',
+                                          self._build_initial_weights_prompt(initial_metrics),
+                                          self._initial_weights_state(initial_metrics))
+            return self._parse_fitness_weights(response_text, "initial")
+        except Exception as e:
+            logger.error(f"Error getting initial dynamic fitness weights from LLM: {e}", exc_info=True)
+            return None
+
+    def _build_initial_weights_prompt(self, initial_metrics=None) -> str:
+        """Prompt asking the LLM for the fitness weights of a new run"""
         if initial_metrics is None:
             initial_metrics = self._calculate_initial_metrics() # Ensure items_to_pack is set before calling this
         
-        prompt = f"""
+        return f"""
         Provide a set of fitness weights for a genetic algorithm optimizing 3D bin packing.
         Consider the following initial metrics:
         - Estimated volume utilization: {initial_metrics.get('initial_volume_utilization_estimate', 0.0)}
@@ -273,27 +508,37 @@ class GeneticPacker:
 
         Ensure the numeric weights sum up to 1.0.
         """
-        
-        try:
-            response_text = llm_client.get_llm_completion(prompt)
-            logger.info(f"LLM response for initial dynamic weights: {response_text}")
-            
-            if not response_text:
-                logger.warning("LLM returned an empty response for initial dynamic weights.")
-                return None
 
+    def _parse_fitness_weights(self, response_text, label="dynamic") -> Optional[Dict[str, float]]:
+        """
+        Parse and normalize fitness weights returned by the LLM
+
+        Args:
+            response_text: Raw LLM response (a JSON object)
+            label: "initial" or "dynamic"; initial weights also carry weight_capacity_weight
+
+        Returns:
+            dict: Weights summing to 1.0, or None if the response is empty or unusable
+        """
+        logger.info(f"LLM response for {label} dynamic weights: {response_text}")
+        if not response_text:
+            logger.warning(f"LLM returned an empty response for {label} dynamic weights.")
+            return None
+
+        try:
             # It's good practice to strip whitespace before parsing JSON
             weights_data = json.loads(response_text.strip()) 
             
-            explanation = weights_data.pop("explanation", "No explanation provided by LLM for initial weights.")
-            logger.info(f"LLM Explanation for initial weights: {explanation}")
+            explanation = weights_data.pop("explanation", f"No explanation provided by LLM for {label} weights.")
+            logger.info(f"LLM Explanation for {label} weights: {explanation}")
 
             expected_weight_keys = [
                 'volume_utilization_weight', 'stability_score_weight', 
                 'contact_ratio_weight', 'weight_balance_weight', 
-                'items_packed_ratio_weight', 'temperature_constraint_weight',
-                'weight_capacity_weight' # Added
+                'items_packed_ratio_weight', 'temperature_constraint_weight'
             ]
+            if label == "initial":
+                expected_weight_keys.append('weight_capacity_weight')
             
             parsed_weights = {}
             for key in expected_weight_keys:
@@ -302,22 +547,22 @@ class GeneticPacker:
             total_weight = sum(parsed_weights.values())
 
             if abs(total_weight) < 1e-6: # Check if sum is effectively zero
-                 logger.warning("Sum of initial weights from LLM is zero. Cannot normalize. Returning None.")
+                 logger.warning(f"Sum of {label} weights from LLM is zero. Cannot normalize. Returning None.")
                  return None
 
             if abs(total_weight - 1.0) > 0.01: # Normalize if not already summing to 1.0
-                logger.info(f"Normalizing LLM initial weights. Original sum: {total_weight}")
+                logger.info(f"Normalizing LLM {label} weights. Original sum: {total_weight}")
                 for key in parsed_weights:
                     parsed_weights[key] /= total_weight # Normalize
             
-            logger.info(f"Successfully obtained and processed initial dynamic fitness weights: {parsed_weights}")
+            logger.info(f"Successfully obtained and processed {label} dynamic fitness weights: {parsed_weights}")
             return parsed_weights
             
         except json.JSONDecodeError:
-            logger.error("Error decoding JSON response from LLM for initial dynamic fitness weights.", exc_info=True)
+            logger.error(f"Error decoding JSON response from LLM for {label} dynamic fitness weights.", exc_info=True)
             return None
         except Exception as e:
-            logger.error(f"Error getting initial dynamic fitness weights from LLM: {e}", exc_info=True)
+            logger.error(f"Error parsing {label} dynamic fitness weights from LLM: {e}", exc_info=True)
             return None
 
     def _get_default_fitness_weights(self):
@@ -332,273 +577,525 @@ class GeneticPacker:
             'weight_capacity_weight': 0.00 # Default to 0, can be adjusted by LLM
         }
 
-    def _evaluate_fitness(self, genome):
+    @staticmethod
+    def _eval_sort_key(item_obj):
+        """Key used to pre-sort items by volume, weight and stackability before decoding"""
+        return (
+            -(item_obj.dimensions[0] * item_obj.dimensions[1] * item_obj.dimensions[2]) if hasattr(item_obj, 'dimensions') and len(item_obj.dimensions) == 3 else 0,
+            -item_obj.weight if hasattr(item_obj, 'weight') else 0,
+            not item_obj.stackable if hasattr(item_obj, 'stackable') else True
+        )
+
+    def _build_decode_table(self, items):
         """
-        Evaluate fitness of a genome considering fitness weights.
-        
+        Build the item spec table and per-item decode information
+
+        Items that are placed identically (same dimensions, weight and handling
+        properties) share a type id, so decode prefixes of interchangeable items
+        match in the snapshot trie.
+
+        Returns:
+            tuple: (ItemSpec, dict of id(item) -> (sort key, type id, spec row))
+        """
+        spec = ItemSpec(items)
+        decode_table = {}
+        for row, item in enumerate(items):
+            decode_table[id(item)] = (self._eval_sort_key(spec.template(row)), int(spec.type_ids[row]), row)
+        return spec, decode_table
+
+    def _build_item_types(self, spec, decode_table):
+        """
+        Build the item-type table used to canonicalize genomes
+
         Args:
-            genome: PackingGenome to evaluate
-            
+            spec: ItemSpec of the items being packed
+            decode_table: Decode table from _build_decode_table for the same items
+
         Returns:
-            float: Fitness score of the genome
+            ItemTypeTable: Type ids, multiplicities and valid orientations of the spec rows
         """
-        fitness = 0.0  # Initialize fitness to 0.0 at the beginning
+        sort_keys = [None] * len(spec)
+        for sort_key, _, row in decode_table.values():
+            sort_keys[row] = sort_key
+        orientation_table = OrientationTable(self.container_dims)
+        orientations = []
+        for row in range(len(spec)):
+            template = spec.template(row)
+            orientations.append(orientation_table.orientations(template.dimensions, template.fragility == 'HIGH'))
+        return ItemTypeTable(spec.type_ids, sort_keys, orientations)
+
+    def _place_eval_item(self, container, spec, row, rotated_dims_for_check):
+        """
+        Place one item during fitness evaluation using the best scoring space
+
+        Args:
+            container: Evaluation container
+            spec: ItemSpec holding the item
+            row: Row of the item in spec
+            rotated_dims_for_check: Orientation selected by the genome (see ItemTypeTable.orientation)
 
-        container = EnhancedContainer(self.container_dims)
+        Returns:
+            tuple: (contact area added, surface area added) - zeros if the item did not fit
+        """
+        item_obj = spec.template(row)  # Shared record, only read until the item is placed
+        
+        best_pos_eval = None
+        best_rot_applied = None # Store the actual dimensions used for packing
+        best_space_eval = None
+        best_score_eval = float('-inf')
+        
+        is_temperature_sensitive_eval = hasattr(item_obj, 'needs_insulation') and item_obj.needs_insulation and self.route_temperature is not None
+        
+        seen_positions = set()  # Overlapping maximal spaces often share a corner
+        for space_candidate in container.spaces:
+            if is_temperature_sensitive_eval and hasattr(space_candidate, 'temperature_safe') and not space_candidate.temperature_safe:
+                continue
+                
+            if space_candidate.can_fit_item(rotated_dims_for_check):
+                pos_candidate = (space_candidate.x, space_candidate.y, space_candidate.z)
+                if pos_candidate in seen_positions:
+                    continue
+                seen_positions.add(pos_candidate)
+                # Pass rotated_dims_for_check for validation
+                if container._is_valid_placement(item_obj, pos_candidate, rotated_dims_for_check):
+                    if is_temperature_sensitive_eval:
+                        wall_buffer = 0.3
+                        x_pos, y_pos, z_pos = pos_candidate
+                        w_dim, d_dim, h_dim = rotated_dims_for_check # Use rotated dimensions for checks
+                        
+                        # Check proximity to all six walls
+                        if not (x_pos >= wall_buffer and \
+                                y_pos >= wall_buffer and \
+                                z_pos >= wall_buffer and \
+                                container.dimensions[0] - (x_pos + w_dim) >= wall_buffer and \
+                                container.dimensions[1] - (y_pos + d_dim) >= wall_buffer and \
+                                container.dimensions[2] - (z_pos + h_dim) >= wall_buffer):
+                            continue
+                    
+                    contact_score_eval = 0.0
+                    wall_contacts_eval = 0
+                    # Use rotated_dims_for_check for contact calculations
+                    if pos_candidate[0] == 0 or pos_candidate[0] + rotated_dims_for_check[0] == container.dimensions[0]:
+                        wall_contacts_eval += 1
+                    if pos_candidate[1] == 0 or pos_candidate[1] + rotated_dims_for_check[1] == container.dimensions[1]:
+                        wall_contacts_eval += 1
+                    if pos_candidate[2] == 0:
+                        wall_contacts_eval += 1
+                    
+                    for placed_item_instance in container._get_items_near(pos_candidate, rotated_dims_for_check):
+                        if hasattr(container, '_has_surface_contact') and hasattr(container, '_calculate_overlap_area') and \
+                           container._has_surface_contact(pos_candidate, rotated_dims_for_check, placed_item_instance):
+                            overlap_area_eval = container._calculate_overlap_area(
+                                (pos_candidate[0], pos_candidate[1], rotated_dims_for_check[0], rotated_dims_for_check[1]),
+                                (placed_item_instance.position[0], placed_item_instance.position[1],
+                                 placed_item_instance.dimensions[0], placed_item_instance.dimensions[1])
+                            )
+                            contact_score_eval += overlap_area_eval
+                    
+                    current_placement_score = 0.0
+                    if is_temperature_sensitive_eval:
+                        center_x_container = container.dimensions[0] / 2
+                        center_y_container = container.dimensions[1] / 2
+                        # Use rotated_dims_for_check for item center calculation
+                        item_center_x_eval = pos_candidate[0] + rotated_dims_for_check[0]/2
+                        item_center_y_eval = pos_candidate[1] + rotated_dims_for_check[1]/2
+                        
+                        distance_from_center_sq = ((item_center_x_eval - center_x_container)**2 + 
+                                              (item_center_y_eval - center_y_container)**2)
+                        max_distance_sq = ((container.dimensions[0]/2)**2 + (container.dimensions[1]/2)**2)
+                        normalized_distance = (distance_from_center_sq / max_distance_sq) if max_distance_sq > 0 else 0.0
+                                              
+                        central_bonus_eval = 50 * (1 - normalized_distance) # Max 50 points
+                        current_placement_score = contact_score_eval * 3 + central_bonus_eval
+                    else:
+                        current_placement_score = contact_score_eval * 2 + wall_contacts_eval * 1.5
+                    
+                    if current_placement_score > best_score_eval:
+                        best_score_eval = current_placement_score
+                        best_pos_eval = pos_candidate
+                        best_rot_applied = rotated_dims_for_check # This is the dimension set to use
+                        best_space_eval = space_candidate
+        
+        if not (best_pos_eval and best_rot_applied): # Ensure best_rot_applied is also found
+            return 0.0, 0.0
+
+        item_obj = spec.record(row, best_pos_eval, best_rot_applied) # Record the rotated dimensions used for packing
+        container.items.append(item_obj)
+        container._update_spaces(best_pos_eval, best_rot_applied, best_space_eval)
+        
+        item_surface_area = 2 * (
+            item_obj.dimensions[0] * item_obj.dimensions[1] +
+            item_obj.dimensions[1] * item_obj.dimensions[2] +
+            item_obj.dimensions[0] * item_obj.dimensions[2]
+        )
+        
+        # Footprint overlap with every significant contact, found once by the contact graph
+        contact_area = 0.0
+        for _, edge in container._get_contact_graph().edges(item_obj):
+            if edge.significant:
+                contact_area += edge.base_overlap
+        
+        return contact_area, item_surface_area
+
+    def _create_eval_container(self):
+        """Empty container configured like the ones genomes are decoded into"""
+        container = HeadlessContainer(self.container_dims)
+        if self.use_height_map:
+            container.enable_height_map()
         
         # Set route temperature if available
         if self.route_temperature is not None:
             container.route_temperature = self.route_temperature
-        
-        # Sort spaces by their distance from container origin for better packing
-        def sort_spaces_local(current_container_instance): # Renamed to avoid conflict
-            current_container_instance.spaces.sort(key=lambda space: (
-                space.z,  # Prioritize lower heights first
-                space.x**2 + space.y**2,  # Prefer spaces closer to origin
-                -(space.width * space.height * space.depth)  # Prefer larger spaces
-            ))
-        
-        # Make a local copy of items to avoid modifying the originals
+        return container
+
+    def _seed_population(self, items, deadline=None) -> List[PackingGenome]:
+        """
+        Heuristic seed genomes for the initial population
+
+        Seeds are taken from self.seed_strategies in order, one per strategy,
+        for seed_fraction of the population. Seeding stops early once the
+        deadline has passed.
+
+        Args:
+            items: Item table shared by the population
+            deadline: time.monotonic() value after which no more seeds are built
+
+        Returns:
+            list: Seed genomes, each tagged with its seed_strategy
+        """
+        count = min(len(self.seed_strategies), int(round(self.population_size * self.seed_fraction)))
+        if count <= 0 or not items:
+            return []
+        seeder = HeuristicSeeder(self, items)
+        seeds = []
+        for strategy in self.seed_strategies[:count]:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            order, rotation_flags = seeder.seed(strategy)
+            genome = PackingGenome.from_compact(items, order, rotation_flags)
+            genome.seed_strategy = strategy
+            seeds.append(genome)
+        logger.info(f"🌱 Seeded {len(seeds)}/{self.population_size} genomes: {', '.join(g.seed_strategy for g in seeds)}")
+        return seeds
+
+    def _decode_genome(self, genome, record_prefixes=True, abort_below=None):
+        """
+        Decode a genome into a packed container
+
+        Items are pre-sorted and placed one by one as compact records from the
+        item spec table, each in the valid orientation its rotation gene selects.
+        When the genome's items are in the decode table, container state is
+        snapshotted at trie checkpoints and decoding resumes from the longest
+        previously decoded prefix; the result is identical to decoding
+        from scratch.
+
+        With abort_below, decoding stops as soon as an item fails to fit and the
+        fitness upper bound (see _fitness_upper_bound) drops below the threshold.
+
+        Args:
+            genome: PackingGenome to decode
+            record_prefixes: Add the genome's decode steps and snapshots to the trie
+                (False still resumes from existing snapshots)
+            abort_below: Optional fitness the genome must still be able to reach
+
+        Returns:
+            tuple: (container, total contact area, total surface area)
+
+        Raises:
+            DecodeAborted: The fitness bound fell below abort_below
+        """
+        container = self._create_eval_container()
+
         # Ensure items in genome.item_sequence are full Item objects
-        items_to_pack_for_eval = []
-        for item_in_seq, rotation_flag_val in zip(genome.item_sequence, genome.rotation_flags):
+        decode_plan = []
+        for item_in_seq, rotation_flag_val in zip(genome.item_sequence, genome.rotation_flags.tolist()):
             if isinstance(item_in_seq, Item): # Make sure it's an Item object
-                 # Create a copy of the item for modification during evaluation
-                item_copy = Item(
-                    name=item_in_seq.name,
-                    length=item_in_seq.original_dims[0], # Use original_dims for copying
-                    width=item_in_seq.original_dims[1],
-                    height=item_in_seq.original_dims[2],
-                    weight=item_in_seq.weight / item_in_seq.quantity if item_in_seq.bundle == 'YES' and item_in_seq.quantity > 1 else item_in_seq.weight, # Adjust weight if bundled
-                    quantity=item_in_seq.quantity, # This will be handled by bundle logic in Item constructor if needed
-                    fragility=item_in_seq.fragility,
-                    stackable=item_in_seq.stackable,
-                    boxing_type=item_in_seq.boxing_type,
-                    bundle=item_in_seq.bundle, # Let Item constructor handle bundling if quantity > 1
-                    load_bearing=item_in_seq.load_bearing,
-                    temperature_sensitivity=item_in_seq.temperature_sensitivity
-                )
-                item_copy.needs_insulation = item_in_seq.needs_insulation # Preserve this flag
-                items_to_pack_for_eval.append((item_copy, rotation_flag_val))
+                decode_plan.append((item_in_seq, rotation_flag_val))
             else:
                 logger.error(f"Item in genome.item_sequence is not an Item object: {item_in_seq}")
                 continue # Skip non-Item objects
 
+        spec, decode_table, item_types = self._item_spec, self._decode_table or {}, self._item_types
+        use_trie = bool(decode_plan) and all(id(item) in decode_table for item, _ in decode_plan)
+        if not use_trie:
+            spec, decode_table = self._build_decode_table([item for item, _ in decode_plan])
+            item_types = None
+        if item_types is None:
+            item_types = self._build_item_types(spec, decode_table)
+
         # Pre-sort items by volume and weight for better initial packing
-        # Ensure dimensions are available for sorting
-        items_to_pack_for_eval.sort(key=lambda x: (
-            -(x[0].dimensions[0] * x[0].dimensions[1] * x[0].dimensions[2]) if hasattr(x[0], 'dimensions') and len(x[0].dimensions) == 3 else 0,
-            -x[0].weight if hasattr(x[0], 'weight') else 0,
-            not x[0].stackable if hasattr(x[0], 'stackable') else True
-        ), reverse=True) # Sorting should be largest to smallest, heaviest to lightest
+        # Sorting should be largest to smallest, heaviest to lightest
+        decode_plan.sort(key=lambda x: decode_table[id(x[0])][0], reverse=True)
         
         # Pack items and track metrics
         total_contact_area_eval = 0.0
         total_surface_area_eval = 0.0
+        start = 0
+        node = None
+
+        if use_trie:
+            # Genes selecting the same orientation place an item identically, so steps use the canonical gene
+            steps = []
+            for item, rotation_flag_val in decode_plan:
+                _, type_id, row = decode_table[id(item)]
+                steps.append((type_id, item_types.canonical_rotation(row, rotation_flag_val)))
+            start, node, snapshot = self.decode_trie.longest_prefix(steps)
+            if snapshot is not None:
+                state, total_contact_area_eval, total_surface_area_eval = snapshot
+                container._restore_state(state)
+
+        if abort_below is not None:
+            # Volume and count of the items that failed to fit so far; the bound only drops when one fails
+            rows = [decode_table[id(item)][2] for item, _ in decode_plan]
+            failed_count = start - len(container.items)
+            failed_volume = float(spec.volume[rows[:start]].sum()) - (container._get_placements().packed_volume()
+                                                                       if container.items else 0.0)
+            total_volume = float(spec.volume[rows].sum())
+
+        for position in range(start, len(decode_plan)):
+            item, rotation_flag_val = decode_plan[position]
+            row = decode_table[id(item)][2]
+            orientation = item_types.orientation(row, rotation_flag_val)
+            placed_count = len(container.items)
+            if orientation is not None:  # Items that fit the container no way are never tried
+                contact_area, surface_area = self._place_eval_item(container, spec, row, orientation)
+                total_contact_area_eval += contact_area
+                total_surface_area_eval += surface_area
+            if abort_below is not None and len(container.items) == placed_count:
+                failed_count += 1
+                failed_volume += float(spec.volume[row])
+                bound, metrics = self._fitness_upper_bound(total_volume - failed_volume,
+                                                           len(decode_plan) - failed_count, len(decode_plan))
+                if bound < abort_below:
+                    metrics['decode_progress'] = (position + 1) / len(decode_plan)
+                    raise DecodeAborted(bound, metrics)
+
+            if use_trie and record_prefixes:
+                node = self.decode_trie.child(node, steps[position])
+                if self.decode_trie.is_checkpoint(position + 1):
+                    self.decode_trie.attach(node, (container._capture_state(),
+                                                   total_contact_area_eval, total_surface_area_eval))
+
+        return container, total_contact_area_eval, total_surface_area_eval
+
+    def _evaluate_fitness(self, genome, record_prefixes=True, abort_below=None, all_metrics=False):
+        """
+        Evaluate fitness of a genome considering fitness weights.
+
+        Metrics are computed tier by tier (self.metric_tiers). Metrics of the
+        first tier are always computed; those of later tiers only if their
+        weight is non-zero, and are otherwise left out of the genome's metrics.
+        If abort_below is given and the genome provably cannot reach it, either
+        while decoding or before an expensive metric tier, evaluation stops
+        early: the genome gets the fitness upper bound as its fitness and its
+        metrics are flagged 'incomplete'.
         
-        for item_obj, rotation_flag_val in items_to_pack_for_eval:
-            original_dims = item_obj.dimensions # This should be the (potentially bundled) dimensions
-            # Apply rotation to a temporary dimension variable for placement checks
-            rotated_dims_for_check = GeneticPacker._get_rotation(None, original_dims, rotation_flag_val)
-            
-            best_pos_eval = None
-            best_rot_applied = None # Store the actual dimensions used for packing
-            best_space_eval = None
-            best_score_eval = float('-inf')
-            
-            is_temperature_sensitive_eval = hasattr(item_obj, 'needs_insulation') and item_obj.needs_insulation and self.route_temperature is not None
-            
-            for space_candidate in container.spaces:
-                if is_temperature_sensitive_eval and hasattr(space_candidate, 'temperature_safe') and not space_candidate.temperature_safe:
-                    continue
-                    
-                if space_candidate.can_fit_item(rotated_dims_for_check):
-                    pos_candidate = (space_candidate.x, space_candidate.y, space_candidate.z)
-                    # Pass rotated_dims_for_check for validation
-                    if container._is_valid_placement(item_obj, pos_candidate, rotated_dims_for_check):
-                        if is_temperature_sensitive_eval:
-                            wall_buffer = 0.3
-                            x_pos, y_pos, z_pos = pos_candidate
-                            w_dim, d_dim, h_dim = rotated_dims_for_check # Use rotated dimensions for checks
-                            
-                            # Check proximity to all six walls
-                            if not (x_pos >= wall_buffer and \
-                                    y_pos >= wall_buffer and \
-                                    z_pos >= wall_buffer and \
-                                    container.dimensions[0] - (x_pos + w_dim) >= wall_buffer and \
-                                    container.dimensions[1] - (y_pos + d_dim) >= wall_buffer and \
-                                    container.dimensions[2] - (z_pos + h_dim) >= wall_buffer):
-                                continue
-                        
-                        contact_score_eval = 0.0
-                        wall_contacts_eval = 0
-                        # Use rotated_dims_for_check for contact calculations
-                        if pos_candidate[0] == 0 or pos_candidate[0] + rotated_dims_for_check[0] == container.dimensions[0]:
-                            wall_contacts_eval += 1
-                        if pos_candidate[1] == 0 or pos_candidate[1] + rotated_dims_for_check[1] == container.dimensions[1]:
-                            wall_contacts_eval += 1
-                        if pos_candidate[2] == 0:
-                            wall_contacts_eval += 1
-                        
-                        for placed_item_instance in container.items:
-                            if hasattr(container, '_has_surface_contact') and hasattr(container, '_calculate_overlap_area') and \
-                               container._has_surface_contact(pos_candidate, rotated_dims_for_check, placed_item_instance):
-                                overlap_area_eval = container._calculate_overlap_area(
-                                    (pos_candidate[0], pos_candidate[1], rotated_dims_for_check[0], rotated_dims_for_check[1]),
-                                    (placed_item_instance.position[0], placed_item_instance.position[1],
-                                     placed_item_instance.dimensions[0], placed_item_instance.dimensions[1])
-                                )
-                                contact_score_eval += overlap_area_eval
-                        
-                        current_placement_score = 0.0
-                        if is_temperature_sensitive_eval:
-                            center_x_container = container.dimensions[0] / 2
-                            center_y_container = container.dimensions[1] / 2
-                            # Use rotated_dims_for_check for item center calculation
-                            item_center_x_eval = pos_candidate[0] + rotated_dims_for_check[0]/2
-                            item_center_y_eval = pos_candidate[1] + rotated_dims_for_check[1]/2
-                            
-                            distance_from_center_sq = ((item_center_x_eval - center_x_container)**2 + 
-                                                  (item_center_y_eval - center_y_container)**2)
-                            max_distance_sq = ((container.dimensions[0]/2)**2 + (container.dimensions[1]/2)**2)
-                            normalized_distance = (distance_from_center_sq / max_distance_sq) if max_distance_sq > 0 else 0.0
-                                                  
-                            central_bonus_eval = 50 * (1 - normalized_distance) # Max 50 points
-                            current_placement_score = contact_score_eval * 3 + central_bonus_eval
-                        else:
-                            current_placement_score = contact_score_eval * 2 + wall_contacts_eval * 1.5
-                        
-                        if current_placement_score > best_score_eval:
-                            best_score_eval = current_placement_score
-                            best_pos_eval = pos_candidate
-                            best_rot_applied = rotated_dims_for_check # This is the dimension set to use
-                            best_space_eval = space_candidate
+        Args:
+            genome: PackingGenome to evaluate
+            record_prefixes: Add the genome's decode snapshots to the decode trie
+            abort_below: Optional fitness threshold for an early abort
+            all_metrics: Compute every metric, whatever its weight
             
-            if best_pos_eval and best_rot_applied: # Ensure best_rot_applied is also found
-                item_obj.position = best_pos_eval
-                item_obj.dimensions = best_rot_applied # Set the item's dimensions to the rotated ones used for packing
-                container.items.append(item_obj)
-                container._update_spaces(best_pos_eval, best_rot_applied, best_space_eval)
-                
-                item_surface_area = 2 * (
-                    item_obj.dimensions[0] * item_obj.dimensions[1] +
-                    item_obj.dimensions[1] * item_obj.dimensions[2] +
-                    item_obj.dimensions[0] * item_obj.dimensions[2]
-                )
-                total_surface_area_eval += item_surface_area
-                
-                for other_item_instance in container.items[:-1]:
-                    if hasattr(container, '_has_surface_contact') and hasattr(container, '_calculate_overlap_area') and \
-                       container._has_surface_contact(item_obj.position, item_obj.dimensions, other_item_instance):
-                        overlap_area_contact = container._calculate_overlap_area(
-                             (item_obj.position[0], item_obj.position[1], item_obj.dimensions[0], item_obj.dimensions[1]),
-                             (other_item_instance.position[0], other_item_instance.position[1], other_item_instance.dimensions[0], other_item_instance.dimensions[1])
-                        )
-                        total_contact_area_eval += overlap_area_contact
-                
-                sort_spaces_local(container)
-        
-        # Calculate all metrics
-        metrics = {}
-        container_volume_val = container.dimensions[0] * container.dimensions[1] * container.dimensions[2]
-        
-        packed_volume_total = sum(
-            packed_item.dimensions[0] * packed_item.dimensions[1] * packed_item.dimensions[2] 
-            for packed_item in container.items if hasattr(packed_item, 'dimensions') and len(packed_item.dimensions) == 3
-        )
-        metrics['volume_utilization'] = (packed_volume_total / container_volume_val) if container_volume_val > 0 else 0.0
-        
-        metrics['contact_ratio'] = total_contact_area_eval / (total_surface_area_eval + 1e-6) if total_surface_area_eval > 0 else 0.0
-        
-        try:
-            # Ensure stability score is calculated correctly and handles missing methods/attributes
-            if container.items and hasattr(container, '_calculate_stability_score'):
-                stability_scores = [container._calculate_stability_score(s_item, s_item.position, s_item.dimensions)
-                                    for s_item in container.items if hasattr(s_item, 'position') and hasattr(s_item, 'dimensions')]
-                metrics['stability_score'] = sum(stability_scores) / len(stability_scores) if stability_scores else 0.0
-            else:
-                metrics['stability_score'] = 0.0
-        except (AttributeError, ZeroDivisionError, TypeError) as e:
-            logger.debug(f"Could not calculate stability score: {e}")
-            metrics['stability_score'] = 0.0
-        
+        Returns:
+            float: Fitness score of the genome
+        """
         try:
-            metrics['weight_balance'] = container._calculate_weight_balance_score() if hasattr(container, '_calculate_weight_balance_score') else 0.0
-        except AttributeError as e:
-            logger.debug(f"Could not calculate weight balance score: {e}")
-            metrics['weight_balance'] = 0.0
-            
-        metrics['items_packed_ratio'] = (len(container.items) / len(genome.item_sequence)) if len(genome.item_sequence) > 0 else \
-                                      (1.0 if not genome.item_sequence and not container.items else 0.0) # Handle empty item sequence
-
-        # Temperature Constraint Score
-        # Higher is better (closer to 1.0 means constraint is well met)
-        temp_constraint_score = 1.0 # Default if no temp items or no route temp
-        if self.route_temperature is not None:
-            temp_sensitive_packed_items = [item for item in container.items if getattr(item, 'needs_insulation', False)]
-            if temp_sensitive_packed_items:
-                total_min_wall_distance = 0
-                target_avg_wall_distance = 0.3 # e.g., 30cm desired average distance from wall
-
-                for item in temp_sensitive_packed_items:
-                    if not (hasattr(item, 'position') and hasattr(item, 'dimensions')):
-                        continue
-                    x, y, z = item.position
-                    w, d, h = item.dimensions
-                    
-                    # Distances to each of the 6 walls
-                    dist_to_walls = [
-                        x, y, z,
-                        container.dimensions[0] - (x + w),
-                        container.dimensions[1] - (y + d),
-                        container.dimensions[2] - (z + h)
-                    ]
-                    min_dist_for_item = min(d for d in dist_to_walls if d >= 0) # Smallest distance to any wall
-                    total_min_wall_distance += min_dist_for_item
-                
-                avg_min_wall_distance = total_min_wall_distance / len(temp_sensitive_packed_items) if temp_sensitive_packed_items else 0
-                
-                # Normalize score: 1 if avg distance >= target, scales down to 0
-                temp_constraint_score = min(1.0, avg_min_wall_distance / target_avg_wall_distance) if target_avg_wall_distance > 0 else 1.0
-            # If no temp-sensitive items are packed, constraint is considered met.
-        metrics['temperature_constraint'] = temp_constraint_score
-
-        # Weight Capacity Score
-        # Higher is better (1.0 if within capacity, penalizes overweight)
-        weight_capacity_score = 1.0
-        if hasattr(container, 'weight_capacity') and container.weight_capacity is not None and container.weight_capacity > 0:
-            total_packed_weight = sum(item.weight for item in container.items if hasattr(item, 'weight'))
-            if total_packed_weight > container.weight_capacity:
-                # Penalize proportionally to how much it's overweight
-                # Score becomes 0 if 2x over capacity, 0.5 if 1.5x over capacity etc.
-                overweight_ratio = total_packed_weight / container.weight_capacity
-                weight_capacity_score = max(0.0, 2.0 - overweight_ratio) # Linear penalty
-        metrics['weight_capacity'] = weight_capacity_score
+            container, total_contact_area_eval, total_surface_area_eval = self._decode_genome(
+                genome, record_prefixes, abort_below)
+        except DecodeAborted as aborted:
+            self._count_skipped_metrics(aborted.metrics)
+            genome.metrics = aborted.metrics
+            genome.fitness = aborted.bound
+            return aborted.bound
+
+        weights = self._active_fitness_weights()
+        metrics = {}
+        for tier, names in enumerate(self.metric_tiers):
+            if tier > 0:
+                if abort_below is not None and not all_metrics:
+                    bound, bound_metrics = self._metrics_upper_bound(metrics)
+                    if bound < abort_below:
+                        bound_metrics['decode_progress'] = 1.0
+                        bound_metrics['metric_tier'] = tier
+                        self._count_skipped_metrics(metrics)
+                        genome.metrics = bound_metrics
+                        genome.fitness = bound
+                        return bound
+                if not all_metrics:
+                    names = [name for name in names if weights.get(f"{name}_weight", 0.0) != 0]
+            for name in names:
+                started = time.perf_counter()
+                metrics[name] = self._compute_metric(name, container, genome, total_contact_area_eval,
+                                                     total_surface_area_eval)
+                profile = self.metric_profile.setdefault(name, {'computed': 0, 'skipped': 0, 'seconds': 0.0})
+                profile['computed'] += 1
+                profile['seconds'] += time.perf_counter() - started
+        self._count_skipped_metrics(metrics)
 
         # Store metrics in genome for detailed logging
         genome.metrics = metrics
 
-        # Apply weights to calculate main fitness
+        fitness = self._weighted_fitness(metrics)
+        genome.fitness = fitness # Assign calculated fitness to the genome object
+        logger.debug(f"Total fitness: {fitness:.4f}, Metrics: {metrics}")
+        return fitness
+
+    def _metric_names(self) -> Tuple[str, ...]:
+        """Every fitness metric, in tier order"""
+        return tuple(name for names in self.metric_tiers for name in names)
+
+    def _merge_metric_profile(self, metric_profile) -> None:
+        """Add a metric profile from another process (a worker or an island) to self.metric_profile"""
+        for name, counts in metric_profile.items():
+            profile = self.metric_profile.setdefault(name, {'computed': 0, 'skipped': 0, 'seconds': 0.0})
+            for key in profile:
+                profile[key] += counts[key]
+
+    def _count_skipped_metrics(self, computed) -> None:
+        """Record the metrics an evaluation skipped (all but those computed) in self.metric_profile"""
+        for name in self._metric_names():
+            if name not in computed or computed.get('incomplete'):
+                self.metric_profile.setdefault(name, {'computed': 0, 'skipped': 0, 'seconds': 0.0})['skipped'] += 1
+
+    @staticmethod
+    def _parse_metric_tiers(metric_tiers) -> Tuple[Tuple[str, ...], ...]:
+        """
+        Validate a metric tier structure
+
+        Args:
+            metric_tiers: Sequence of metric name sequences, or a string with tiers
+                separated by ';' and the metrics of a tier by ','
+
+        Returns:
+            tuple: Tiers of metric names; metrics not listed form an extra last tier
+        """
+        if isinstance(metric_tiers, str):
+            metric_tiers = [tier.split(',') for tier in metric_tiers.split(';')]
+        tiers = [tuple(name.strip() for name in tier if name.strip()) for tier in metric_tiers]
+        tiers = [tier for tier in tiers if tier]
+        known = [name for tier in METRIC_TIERS for name in tier]
+        listed = [name for tier in tiers for name in tier]
+        unknown = sorted(set(listed) - set(known))
+        if unknown:
+            raise ValueError(f"Unknown fitness metric(s) {', '.join(unknown)} in metric tiers; "
+                             f"expected {', '.join(known)}")
+        if len(set(listed)) < len(listed):
+            raise ValueError(f"Fitness metrics listed in more than one metric tier: {metric_tiers!r}")
+        missing = tuple(name for name in known if name not in listed)
+        return tuple(tiers) + ((missing,) if missing else ())
+
+    def _compute_metric(self, name, container, genome, contact_area, surface_area) -> float:
+        """
+        Compute one fitness metric of a decoded genome
+
+        Args:
+            name: Metric name, from METRIC_TIERS
+            container: Container the genome was decoded into
+            genome: The decoded PackingGenome
+            contact_area: Total contact area accumulated while decoding
+            surface_area: Total surface area of the packed items
+
+        Returns:
+            float: Metric value, higher is better
+        """
+        if name == 'volume_utilization':
+            container_volume_val = container.dimensions[0] * container.dimensions[1] * container.dimensions[2]
+            packed_volume_total = container._get_placements().packed_volume()
+            return (packed_volume_total / container_volume_val) if container_volume_val > 0 else 0.0
+
+        if name == 'contact_ratio':
+            return contact_area / (surface_area + 1e-6) if surface_area > 0 else 0.0
+
+        if name == 'items_packed_ratio':
+            return (len(container.items) / len(genome.item_sequence)) if len(genome.item_sequence) > 0 else \
+                   (1.0 if not genome.item_sequence and not container.items else 0.0) # Handle empty item sequence
+
+        if name == 'stability_score':
+            try:
+                # Ensure stability score is calculated correctly and handles missing methods/attributes
+                if container.items and hasattr(container, '_calculate_stability_score'):
+                    stability_scores = [container._calculate_stability_score(s_item, s_item.position, s_item.dimensions)
+                                        for s_item in container.items if hasattr(s_item, 'position') and hasattr(s_item, 'dimensions')]
+                    return sum(stability_scores) / len(stability_scores) if stability_scores else 0.0
+                return 0.0
+            except (AttributeError, ZeroDivisionError, TypeError) as e:
+                logger.debug(f"Could not calculate stability score: {e}")
+                return 0.0
+
+        if name == 'weight_balance':
+            try:
+                return container._calculate_weight_balance_score() if hasattr(container, '_calculate_weight_balance_score') else 0.0
+            except AttributeError as e:
+                logger.debug(f"Could not calculate weight balance score: {e}")
+                return 0.0
+
+        if name == 'temperature_constraint':
+            # Higher is better (closer to 1.0 means constraint is well met)
+            temp_constraint_score = 1.0 # Default if no temp items or no route temp
+            if self.route_temperature is not None:
+                temp_sensitive_packed_items = [item for item in container.items if getattr(item, 'needs_insulation', False)]
+                if temp_sensitive_packed_items:
+                    total_min_wall_distance = 0
+                    target_avg_wall_distance = 0.3 # e.g., 30cm desired average distance from wall
+
+                    for item in temp_sensitive_packed_items:
+                        if not (hasattr(item, 'position') and hasattr(item, 'dimensions')):
+                            continue
+                        x, y, z = item.position
+                        w, d, h = item.dimensions
+
+                        # Distances to each of the 6 walls
+                        dist_to_walls = [
+                            x, y, z,
+                            container.dimensions[0] - (x + w),
+                            container.dimensions[1] - (y + d),
+                            container.dimensions[2] - (z + h)
+                        ]
+                        min_dist_for_item = min(d for d in dist_to_walls if d >= 0) # Smallest distance to any wall
+                        total_min_wall_distance += min_dist_for_item
+
+                    avg_min_wall_distance = total_min_wall_distance / len(temp_sensitive_packed_items) if temp_sensitive_packed_items else 0
+
+                    # Normalize score: 1 if avg distance >= target, scales down to 0
+                    temp_constraint_score = min(1.0, avg_min_wall_distance / target_avg_wall_distance) if target_avg_wall_distance > 0 else 1.0
+                # If no temp-sensitive items are packed, constraint is considered met.
+            return temp_constraint_score
+
+        if name == 'weight_capacity':
+            # Higher is better (1.0 if within capacity, penalizes overweight)
+            weight_capacity_score = 1.0
+            if hasattr(container, 'weight_capacity') and container.weight_capacity is not None and container.weight_capacity > 0:
+                total_packed_weight = container._get_placements().total_weight()
+                if total_packed_weight > container.weight_capacity:
+                    # Penalize proportionally to how much it's overweight
+                    # Score becomes 0 if 2x over capacity, 0.5 if 1.5x over capacity etc.
+                    overweight_ratio = total_packed_weight / container.weight_capacity
+                    weight_capacity_score = max(0.0, 2.0 - overweight_ratio) # Linear penalty
+            return weight_capacity_score
+
+        raise ValueError(f"Unknown fitness metric {name!r}")
+
+    def _complete_metrics(self, genome) -> Dict[str, Any]:
+        """Metrics of an evaluated genome with every metric filled in, re-decoding it if some were skipped"""
+        metrics = getattr(genome, 'metrics', None) or {}
+        if all(name in metrics for name in self._metric_names()) or self.items_to_pack is None:
+            return metrics
+        full = PackingGenome.from_compact(self.items_to_pack, *genome.to_compact())
+        self._evaluate_fitness(full, record_prefixes=False, all_metrics=True)
+        return full.metrics
+
+    def _active_fitness_weights(self) -> Dict[str, float]:
+        """The current fitness weights, or the defaults if they are unset, invalid or all zero"""
         current_weights = self.fitness_weights
         if not current_weights or not isinstance(current_weights, dict) or not any(w > 0 for w in current_weights.values()):
             logger.warning("_evaluate_fitness: self.fitness_weights not set, invalid, or all zero. Falling back to default.")
             current_weights = self._get_default_fitness_weights() 
-        
-        fitness = 0.0
-        for weight_name, weight_value in current_weights.items():
-            metric_key = weight_name.replace('_weight', '')
-            metric_value = metrics.get(metric_key, 0.0)
-            fitness += metric_value * weight_value
-            logger.debug(f"Fitness component: {metric_key}={metric_value:.4f} * {weight_value:.4f} = {metric_value * weight_value:.4f}")
-        
-        # Store metrics in genome for detailed logging
-        genome.metrics = metrics
+        return current_weights
 
+    def _weighted_fitness(self, metrics) -> float:
+        """Fitness of a metrics dict under the current fitness weights"""
         # Apply weights to calculate main fitness
-        current_weights = self.fitness_weights
-        if not current_weights or not isinstance(current_weights, dict) or not any(w > 0 for w in current_weights.values()):
-            logger.warning("_evaluate_fitness: self.fitness_weights not set, invalid, or all zero. Falling back to default.")
-            current_weights = self._get_default_fitness_weights() 
+        current_weights = self._active_fitness_weights()
         
         fitness = 0.0
         for weight_name, weight_value in current_weights.items():
@@ -606,11 +1103,196 @@ class GeneticPacker:
             metric_value = metrics.get(metric_key, 0.0)
             fitness += metric_value * weight_value
             logger.debug(f"Fitness component: {metric_key}={metric_value:.4f} * {weight_value:.4f} = {metric_value * weight_value:.4f}")
-        
-        genome.fitness = fitness # Assign calculated fitness to the genome object
-        logger.debug(f"Total fitness: {fitness:.4f}, Metrics: {metrics}")
         return fitness
 
+    def _metrics_upper_bound(self, known) -> Tuple[float, Dict[str, Any]]:
+        """
+        Upper bound on the fitness of a genome whose metrics are partly known
+
+        Every metric not in `known` is bounded by its maximum of 1.0 (0.0 under
+        a negative weight).
+
+        Args:
+            known: Metric values already computed or bounded
+
+        Returns:
+            tuple: (bound, metrics at the bound, flagged 'incomplete')
+        """
+        metrics = {weight_name.replace('_weight', ''): 1.0 if weight_value >= 0 else 0.0
+                   for weight_name, weight_value in self._active_fitness_weights().items()}
+        metrics.update(known)
+        bound = self._weighted_fitness(metrics)
+        metrics['incomplete'] = True
+        return bound, metrics
+
+    def _fitness_upper_bound(self, placeable_volume, placeable_count, item_count) -> Tuple[float, Dict[str, Any]]:
+        """
+        Upper bound on the fitness a partially decoded genome can still reach
+
+        Volume utilization is bounded by the volume of the items that have not
+        failed to fit (packed plus still unplaced), capped by the container
+        volume, and the packed ratio by their count; every other metric by its
+        maximum (see _metrics_upper_bound).
+
+        Args:
+            placeable_volume: Volume of the items packed or not yet tried
+            placeable_count: Number of those items
+            item_count: Number of items in the genome
+
+        Returns:
+            tuple: (bound, metrics at the bound, flagged 'incomplete')
+        """
+        container_volume = float(np.prod(self.container_dims))
+        weights = self._active_fitness_weights()
+        known = {}
+        if weights.get('volume_utilization_weight', 0.0) >= 0:
+            known['volume_utilization'] = min(1.0, placeable_volume / container_volume) if container_volume > 0 else 0.0
+        if weights.get('items_packed_ratio_weight', 0.0) >= 0:
+            known['items_packed_ratio'] = placeable_count / item_count if item_count else 1.0
+        return self._metrics_upper_bound(known)
+
+    def _create_evaluation_pool(self, items):
+        """
+        Start a persistent process pool for genome evaluation
+
+        Returns:
+            ProcessPoolExecutor or None if parallel evaluation is disabled or unavailable
+        """
+        if self.workers <= 1 or self.population_size < self.parallel_min_population:
+            return None
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_evaluation_worker,
+                initargs=(self.container_dims, self.route_temperature, items, self.use_height_map, self.metric_tiers)
+            )
+            logger.info(f"  ⚙️  Parallel evaluation enabled with {self.workers} workers")
+            return executor
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not start evaluation pool, falling back to serial evaluation: {e}")
+            return None
+
+    def _evaluate_population(self, population, executor=None, deadline=None):
+        """
+        Evaluate fitness for every genome in the population
+
+        Genomes whose fingerprint (canonical decode sequence and active fitness
+        weights) is already in the fitness cache are served from it without
+        decoding, and equivalent genomes within the batch are decoded only once.
+        Genomes that differ only in which copies of identical items sit where, or
+        in rotations giving the same dimensions, share a fingerprint. The remaining
+        genomes are sent to the worker pool as compact index/rotation encodings when
+        an executor is available and the batch is large enough; otherwise they are
+        evaluated serially. Both paths produce identical fitness values.
+
+        Once the deadline passes, no further genomes are evaluated (at least one
+        always is) and the rest of the population keeps its previous fitness.
+
+        Genomes whose decode was aborted below self._abort_below get their
+        fitness bound, metrics flagged 'incomplete', and are not cached.
+
+        Args:
+            population: List of PackingGenome instances
+            executor: Optional ProcessPoolExecutor from _create_evaluation_pool
+            deadline: Optional time.monotonic() value after which evaluation stops
+
+        Returns:
+            list: Genomes of the population that were evaluated or served from the cache, in population order
+        """
+        logger.info(f"  📊 Evaluating {len(population)} genomes...")
+
+        # Resolve cache hits and group identical genomes: key -> (compact genome, genomes)
+        pending = {}
+        done = set()  # id() of genomes with a fitness from this call
+        for genome in population:
+            if self._item_types is not None:
+                genome.canonicalize(self._item_types)
+            order, rotation_flags = genome.to_compact()
+            if self._item_types is not None:
+                key = genome_fingerprint(*self._item_types.decode_sequence(order, rotation_flags), self.fitness_weights)
+            else:
+                key = genome_fingerprint(order, rotation_flags, self.fitness_weights)
+            if key in pending:
+                self.fitness_cache.hits += 1  # Decoded once for the whole batch
+                pending[key][1].append(genome)
+                continue
+            cached = self.fitness_cache.get(key)
+            if cached is not None:
+                genome.fitness = cached[0]
+                genome.metrics = dict(cached[1])
+                done.add(id(genome))
+            else:
+                pending[key] = ((order, rotation_flags), [genome])
+
+        if len(pending) < len(population):
+            logger.info(f"    ♻️  Reused {len(population) - len(pending)} cached evaluations")
+
+        def record(key, fitness, metrics):
+            genomes = pending[key][1]
+            incomplete = bool(metrics and metrics.get('incomplete'))
+            for genome in genomes:
+                genome.fitness = fitness
+                if metrics is not None:
+                    genome.metrics = dict(metrics)
+                done.add(id(genome))
+            if incomplete:
+                # A bound under this generation's threshold, not a fitness to reuse
+                self.early_abort_stats['aborted'] = self.early_abort_stats.get('aborted', 0) + 1
+                if 'metric_tier' in metrics:
+                    self.early_abort_stats['metric_tiers'] = self.early_abort_stats.get('metric_tiers', 0) + 1
+                self.early_abort_stats['skipped_steps'] = (self.early_abort_stats.get('skipped_steps', 0.0)
+                                                           + 1.0 - metrics['decode_progress'])
+            elif metrics is not None:
+                self.fitness_cache.put(key, fitness, dict(metrics))
+
+        def evaluated():
+            if len(done) < len(population):
+                logger.warning(f"    ⏰ Deadline reached: evaluated {len(done)}/{len(population)} genomes")
+            return [genome for genome in population if id(genome) in done]
+
+        if executor is None or len(pending) < self.parallel_min_population:
+            for i, key in enumerate(pending):
+                if deadline is not None and done and time.monotonic() >= deadline:
+                    break
+                genome = pending[key][1][0]
+                try:
+                    fitness = self._evaluate_fitness(genome, abort_below=self._abort_below)
+                    record(key, fitness, genome.metrics)
+                    if (i + 1) % 5 == 0 or i == len(pending) - 1:
+                        logger.info(f"    ✅ Evaluated {i + 1}/{len(pending)} genomes (latest fitness: {genome.fitness:.4f})")
+                except Exception as e:
+                    logger.error(f"❌ Error evaluating genome {i + 1}: {e}")
+                    record(key, 0.0, None)
+            return evaluated()
+
+        futures = {}
+        for key, ((order, rotation_flags), _) in pending.items():
+            futures[executor.submit(_evaluate_compact_genome,
+                                    (order, rotation_flags, self.fitness_weights, self._abort_below))] = key
+
+        completed = 0
+        not_done = set(futures)
+        while not_done:
+            timeout = None if deadline is None or not done else max(0.0, deadline - time.monotonic())
+            finished, not_done = wait(not_done, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not finished:  # Deadline passed
+                for future in not_done:
+                    future.cancel()
+                break
+            for future in finished:
+                key = futures[future]
+                try:
+                    fitness, metrics, metric_profile = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Error evaluating genome: {e}")
+                    fitness, metrics, metric_profile = 0.0, None, {}
+                self._merge_metric_profile(metric_profile)
+                record(key, fitness, metrics)
+                completed += 1
+                if completed % 5 == 0 or completed == len(pending):
+                    logger.info(f"    ✅ Evaluated {completed}/{len(pending)} genomes (latest fitness: {fitness:.4f})")
+        return evaluated()
+
     def mutate_population(self, population, operation_focus, rate_modifier):
         """
         Mutate a population of genomes with specified mutation strategy
@@ -648,85 +1330,102 @@ class GeneticPacker:
             return None
             
         try:
-            # Calculate current statistics
-            fitnesses = [g.fitness for g in population]
-            avg_fitness = sum(fitnesses) / len(fitnesses)
-            best_fitness = max(fitnesses)
-            fitness_variance = sum((f - avg_fitness) ** 2 for f in fitnesses) / len(fitnesses)
-            
-            # Print key algorithm metrics with cleaner formatting
-            logger.info(f"\n{'='*20} ALGORITHM METRICS {'='*20}")
-            logger.info(f"Generation: {generation} | Population: {len(population)}")
-            logger.info(f"Best fitness: {best_fitness:.4f} | Average: {avg_fitness:.4f}")
-            logger.info(f"Fitness variance: {fitness_variance:.6f} | Stagnation: {stagnation_counter}")
-            
-            # Create a prompt with current algorithm state
-            prompt = f"""
-            Return a mutation strategy for a genetic algorithm optimizing 3D bin packing with temperature-sensitive items.
-            Current metrics:
-            - Generation: {generation}
-            - Best fitness: {best_fitness:.4f}
-            - Average fitness: {avg_fitness:.4f}
-            - Fitness variance: {fitness_variance:.6f}
-            - Stagnation: {stagnation_counter} generations
-
-            Based on these metrics, provide a JSON object with these EXACT keys:
-            {{
-                "mutation_rate_modifier": number, // Between -0.05 and 0.2
-                "operation_focus": string,        // One of: "rotation", "swap", "subsequence", "balanced", "aggressive" 
-                "explanation": string             // Brief explanation of strategy choice
-            }}
-
-            Guidelines for strategy selection:
-            - High fitness variance ({fitness_variance:.6f} > 0.1) -> Need more exploitation, focus on subsequence for better interlocking
-            - Low fitness variance ({fitness_variance:.6f} < 0.01) -> Need more exploration with swap operations
-            - Stagnation ({stagnation_counter} > 5 generations) -> VERY aggressive mutation with highest rate modifier (0.15-0.2)
-            - Temperature-sensitive items require central placement with good interlocking -> subsequence operations help
-            - Poor space utilization requires compact placement -> subsequence operations help group similar items
-            - High stagnation should trigger "aggressive" operation_focus with high mutation rate
-
-            Focus options effects:
-            - "rotation": Prioritize item orientation changes - good for fine-tuning but not for interlocking
-            - "swap": Prioritize reordering items - good for exploration
-            - "subsequence": Prioritize moving groups of items - BEST FOR INTERLOCKING and temperature-sensitive items
-            - "balanced": Equal focus on all operations - use when uncertain
-            - "aggressive": NEW OPTION - combines high rate subsequence mutations with random reordering - best for escaping stagnation
-
-            If stagnation > 8, ALWAYS use "aggressive" focus with maximum rate modifier (0.2).
-            If stagnation between 5-8, use "subsequence" with high rate modifier (0.15-0.2).
-            If stagnation < 5, use "balanced" or specific focus based on fitness variance.
-
-            RESPOND WITH ONLY THE JSON OBJECT, NO OTHER TEXT.
-            """
-            
-            response = llm_client.generate(prompt)
-            
-            try:
-                strategy = json.loads(response.strip())
-                if "mutation_rate_modifier" in strategy and "operation_focus" in strategy:
-                    # Allow higher mutation rates for stagnation scenarios (up to 0.2)
-                    max_modifier = 0.2 if stagnation_counter >= 5 else 0.15
-                    strategy["mutation_rate_modifier"] = max(-0.05, min(max_modifier, strategy["mutation_rate_modifier"]))
-                    
-                    # Override with aggressive strategy for high stagnation
-                    if stagnation_counter >= 8 and strategy["operation_focus"] != "aggressive":
-                        strategy["operation_focus"] = "aggressive"
-                        strategy["mutation_rate_modifier"] = 0.2
-                        strategy["explanation"] = "Overriding with aggressive strategy due to critical stagnation"
-                    
-                    logger.info(f"    🤖 LLM Strategy: {strategy['operation_focus']} (rate: {strategy['mutation_rate_modifier']:.3f})")
-                    logger.info(f"    💭 Explanation: {strategy.get('explanation', 'No explanation provided')}")
-                    return strategy
-                    
-            except json.JSONDecodeError:
-                logger.warning("WARNING: Invalid LLM response format")
-                return self._get_aggressive_mutation_strategy(stagnation_counter)
-                
-            return None
-            
+            response = self._ask_llm('mutation_strategy', 'get_llm_completion',
+                                     self._build_mutation_strategy_prompt(generation, population, stagnation_counter),
+                                     self._mutation_strategy_state(population, stagnation_counter))
+            return self._parse_mutation_strategy(response, stagnation_counter)
         except Exception as e:
             logger.error(f"ERROR: Failed to get adaptive mutation strategy: {e}")
             return self._get_aggressive_mutation_strategy(stagnation_counter)
+
+    def _build_mutation_strategy_prompt(self, generation: int, population, stagnation_counter: int) -> str:
+        """Prompt asking the LLM for a mutation strategy given the population's fitness statistics"""
+        # Calculate current statistics
+        fitnesses = [g.fitness for g in population]
+        avg_fitness = sum(fitnesses) / len(fitnesses)
+        best_fitness = max(fitnesses)
+        fitness_variance = sum((f - avg_fitness) ** 2 for f in fitnesses) / len(fitnesses)
+        
+        # Print key algorithm metrics with cleaner formatting
+        logger.info(f"\n{'='*20} ALGORITHM METRICS {'='*20}")
+        logger.info(f"Generation: {generation} | Population: {len(population)}")
+        logger.info(f"Best fitness: {best_fitness:.4f} | Average: {avg_fitness:.4f}")
+        logger.info(f"Fitness variance: {fitness_variance:.6f} | Stagnation: {stagnation_counter}")
+        
+        # Create a prompt with current algorithm state
+        prompt = f"""
+        Return a mutation strategy for a genetic algorithm optimizing 3D bin packing with temperature-sensitive items.
+        Current metrics:
+        - Generation: {generation}
+        - Best fitness: {best_fitness:.4f}
+        - Average fitness: {avg_fitness:.4f}
+        - Fitness variance: {fitness_variance:.6f}
+        - Stagnation: {stagnation_counter} generations
+
+        Based on these metrics, provide a JSON object with these EXACT keys:
+        {{
+            "mutation_rate_modifier": number, // Between -0.05 and 0.2
+            "operation_focus": string,        // One of: "rotation", "swap", "subsequence", "balanced", "aggressive" 
+            "explanation": string             // Brief explanation of strategy choice
+        }}
+
+        Guidelines for strategy selection:
+        - High fitness variance ({fitness_variance:.6f} > 0.1) -> Need more exploitation, focus on subsequence for better interlocking
+        - Low fitness variance ({fitness_variance:.6f} < 0.01) -> Need more exploration with swap operations
+        - Stagnation ({stagnation_counter} > 5 generations) -> VERY aggressive mutation with highest rate modifier (0.15-0.2)
+        - Temperature-sensitive items require central placement with good interlocking -> subsequence operations help
+        - Poor space utilization requires compact placement -> subsequence operations help group similar items
+        - High stagnation should trigger "aggressive" operation_focus with high mutation rate
+
+        Focus options effects:
+        - "rotation": Prioritize item orientation changes - good for fine-tuning but not for interlocking
+        - "swap": Prioritize reordering items - good for exploration
+        - "subsequence": Prioritize moving groups of items - BEST FOR INTERLOCKING and temperature-sensitive items
+        - "balanced": Equal focus on all operations - use when uncertain
+        - "aggressive": NEW OPTION - combines high rate subsequence mutations with random reordering - best for escaping stagnation
+
+        If stagnation > 8, ALWAYS use "aggressive" focus with maximum rate modifier (0.2).
+        If stagnation between 5-8, use "subsequence" with high rate modifier (0.15-0.2).
+        If stagnation < 5, use "balanced" or specific focus based on fitness variance.
+
+        RESPOND WITH ONLY THE JSON OBJECT, NO OTHER TEXT.
+        """
+        return prompt
+
+    def _parse_mutation_strategy(self, response: str, stagnation_counter: int) -> Optional[Dict[str, Any]]:
+        """
+        Parse a mutation strategy returned by the LLM
+
+        Args:
+            response: Raw LLM response (a JSON object)
+            stagnation_counter: Number of generations without improvement
+
+        Returns:
+            Dictionary with the clamped strategy, the aggressive strategy if the
+            response is not JSON, or None if it lacks the strategy keys
+        """
+        try:
+            strategy = json.loads(response.strip())
+            if "mutation_rate_modifier" in strategy and "operation_focus" in strategy:
+                # Allow higher mutation rates for stagnation scenarios (up to 0.2)
+                max_modifier = 0.2 if stagnation_counter >= 5 else 0.15
+                strategy["mutation_rate_modifier"] = max(-0.05, min(max_modifier, strategy["mutation_rate_modifier"]))
+                
+                # Override with aggressive strategy for high stagnation
+                if stagnation_counter >= 8 and strategy["operation_focus"] != "aggressive":
+                    strategy["operation_focus"] = "aggressive"
+                    strategy["mutation_rate_modifier"] = 0.2
+                    strategy["explanation"] = "Overriding with aggressive strategy due to critical stagnation"
+                
+                logger.info(f"    🤖 LLM Strategy: {strategy['operation_focus']} (rate: {strategy['mutation_rate_modifier']:.3f})")
+                logger.info(f"    💭 Explanation: {strategy.get('explanation', 'No explanation provided')}")
+                return strategy
+                
+        except json.JSONDecodeError:
+            logger.warning("WARNING: Invalid LLM response format")
+            return self._get_aggressive_mutation_strategy(stagnation_counter)
+            
+        return None
     
     def _get_aggressive_mutation_strategy(self, stagnation_counter: int) -> Dict[str, Any]:
         """
@@ -773,7 +1472,7 @@ class GeneticPacker:
         """Get dynamic fitness function weights from LLM based on current optimization state"""
         
         try:
-            global llm_client, logger # Access module-level instances
+            llm_client = _get_llm_client()
             
             # Handle None current_metrics
             if current_metrics is None:
@@ -784,179 +1483,305 @@ class GeneticPacker:
                 logger.info("LLM client not available for dynamic fitness weights.")
                 return None
             
-            # Calculate metrics for LLM context
-            avg_fitness = sum(g.fitness for g in population) / len(population) if population else 0
-            best_fitness = max((g.fitness for g in population), default=0)
-            fitness_variance = np.var([g.fitness for g in population]) if population else 0 # Requires numpy
-            
-            logger.info(f"\\n{'='*20} DYNAMIC FITNESS WEIGHTS REQUEST {'='*20}")
-            logger.info(f"Generation: {generation} | Best fitness: {best_fitness:.4f} | Average: {avg_fitness:.4f}")
-            logger.info("Current Metrics:")
-            logger.info(f"  Volume utilization: {current_metrics.get('volume_utilization', 0.0):.4f}")
-            logger.info(f"  Contact ratio: {current_metrics.get('contact_ratio', 0.0):.4f}")
-            logger.info(f"  Stability score: {current_metrics.get('stability_score', 0.0):.4f}")
-            logger.info(f"  Weight balance: {current_metrics.get('weight_balance', 0.0):.4f}")
-            logger.info(f"  Items packed ratio: {current_metrics.get('items_packed_ratio', 0.0):.4f}")
-            
-            # Create a prompt with current algorithm state
-            prompt = f"""
-            Adjust the fitness weights for a genetic algorithm optimizing 3D bin packing with temperature-sensitive items.
-            The algorithm is currently at generation {generation}.
-            Current performance metrics:
-            - Best fitness: {best_fitness:.4f}
-            - Average fitness: {avg_fitness:.4f}
-            - Fitness variance: {fitness_variance:.6f}
-            Detailed current packing metrics:
-            - Volume utilization: {current_metrics.get('volume_utilization', 0.0):.4f}
-            - Stability score: {current_metrics.get('stability_score', 0.0):.4f}
-            - Contact ratio: {current_metrics.get('contact_ratio', 0.0):.4f}
-            - Weight balance: {current_metrics.get('weight_balance', 0.0):.4f}
-            - Items packed ratio: {current_metrics.get('items_packed_ratio', 0.0):.4f}
-            - Route temperature: {self.route_temperature if self.route_temperature is not None else "Not set"}
-
-            Based on these metrics, provide a new set of fitness weights in JSON format.
-            The weights should guide the optimization towards improving areas that are currently underperforming
-            or reinforce strategies that are working well. For example, if volume utilization is low, consider increasing its weight.
-            If stability is poor, its weight might need an increase.
-            
-            Return the weights in JSON format with the following keys:
-            - volume_utilization_weight
-            - stability_score_weight
-            - contact_ratio_weight
-            - weight_balance_weight
-            - items_packed_ratio_weight
-            - temperature_constraint_weight (adjust based on presence of temp-sensitive items and route_temperature. If route_temperature is not set, this weight should likely be low or zero unless items are inherently temperature-sensitive.)
-            - explanation (brief explanation for the chosen weight adjustments)
-
-            Ensure the numeric weights sum up to 1.0.
-            RESPOND WITH ONLY THE JSON OBJECT, NO OTHER TEXT.
-            """
-            
-            response_text = llm_client.get_llm_completion(prompt)
-            logger.info(f"LLM response for dynamic fitness weights: {response_text}")
-            
-            if not response_text:
-                logger.warning("LLM returned an empty response for dynamic fitness weights.")
-                return None
+            response_text = self._ask_llm('fitness_weights', 'get_llm_completion',
+                                          self._build_dynamic_weights_prompt(generation, population, current_metrics),
+                                          self._dynamic_weights_state(current_metrics))
+            return self._parse_fitness_weights(response_text, "dynamic")
+        except Exception as e:
+            logger.error(f"Error getting dynamic fitness weights from LLM: {e}", exc_info=True)
+            return None
 
-            # It's good practice to strip whitespace before parsing JSON
-            weights_data = json.loads(response_text.strip()) 
-            
-            explanation = weights_data.pop("explanation", "No explanation provided by LLM for dynamic weights.")
-            logger.info(f"LLM Explanation for dynamic weights: {explanation}")
+    def _build_dynamic_weights_prompt(self, generation: int, population,
+                                      current_metrics: Dict[str, float]) -> str:
+        """Prompt asking the LLM to adjust the fitness weights given the best genome's metrics"""
+        # Calculate metrics for LLM context
+        avg_fitness = sum(g.fitness for g in population) / len(population) if population else 0
+        best_fitness = max((g.fitness for g in population), default=0)
+        fitness_variance = np.var([g.fitness for g in population]) if population else 0 # Requires numpy
+        
+        logger.info(f"\\n{'='*20} DYNAMIC FITNESS WEIGHTS REQUEST {'='*20}")
+        logger.info(f"Generation: {generation} | Best fitness: {best_fitness:.4f} | Average: {avg_fitness:.4f}")
+        logger.info("Current Metrics:")
+        logger.info(f"  Volume utilization: {current_metrics.get('volume_utilization', 0.0):.4f}")
+        logger.info(f"  Contact ratio: {current_metrics.get('contact_ratio', 0.0):.4f}")
+        logger.info(f"  Stability score: {current_metrics.get('stability_score', 0.0):.4f}")
+        logger.info(f"  Weight balance: {current_metrics.get('weight_balance', 0.0):.4f}")
+        logger.info(f"  Items packed ratio: {current_metrics.get('items_packed_ratio', 0.0):.4f}")
+        
+        # Create a prompt with current algorithm state
+        prompt = f"""
+        Adjust the fitness weights for a genetic algorithm optimizing 3D bin packing with temperature-sensitive items.
+        The algorithm is currently at generation {generation}.
+        Current performance metrics:
+        - Best fitness: {best_fitness:.4f}
+        - Average fitness: {avg_fitness:.4f}
+        - Fitness variance: {fitness_variance:.6f}
+        Detailed current packing metrics:
+        - Volume utilization: {current_metrics.get('volume_utilization', 0.0):.4f}
+        - Stability score: {current_metrics.get('stability_score', 0.0):.4f}
+        - Contact ratio: {current_metrics.get('contact_ratio', 0.0):.4f}
+        - Weight balance: {current_metrics.get('weight_balance', 0.0):.4f}
+        - Items packed ratio: {current_metrics.get('items_packed_ratio', 0.0):.4f}
+        - Route temperature: {self.route_temperature if self.route_temperature is not None else "Not set"}
+
+        Based on these metrics, provide a new set of fitness weights in JSON format.
+        The weights should guide the optimization towards improving areas that are currently underperforming
+        or reinforce strategies that are working well. For example, if volume utilization is low, consider increasing its weight.
+        If stability is poor, its weight might need an increase.
+        
+        Return the weights in JSON format with the following keys:
+        - volume_utilization_weight
+        - stability_score_weight
+        - contact_ratio_weight
+        - weight_balance_weight
+        - items_packed_ratio_weight
+        - temperature_constraint_weight (adjust based on presence of temp-sensitive items and route_temperature. If route_temperature is not set, this weight should likely be low or zero unless items are inherently temperature-sensitive.)
+        - explanation (brief explanation for the chosen weight adjustments)
 
-            expected_weight_keys = [
-                'volume_utilization_weight', 'stability_score_weight', 
-                'contact_ratio_weight', 'weight_balance_weight', 
-                'items_packed_ratio_weight', 'temperature_constraint_weight'
-            ]
-            
-            parsed_weights = {}
-            for key in expected_weight_keys:
-                parsed_weights[key] = float(weights_data.get(key, 0.0)) # Default to 0.0 if key is missing
-            
-            total_weight = sum(parsed_weights.values())
+        Ensure the numeric weights sum up to 1.0.
+        RESPOND WITH ONLY THE JSON OBJECT, NO OTHER TEXT.
+        """
+        return prompt
 
-            if abs(total_weight) < 1e-6: # Check if sum is effectively zero
-                 logger.warning("Sum of dynamic weights from LLM is zero. Cannot normalize. Returning None.")
-                 return None
+    def _create_llm_advisor(self) -> Optional[LLMAdvisor]:
+        """Background advisor for LLM requests, or None to call the LLM synchronously"""
+        if not self.llm_budget or not getattr(_get_llm_client(), 'enabled', False):
+            return None  # A disabled client answers instantly with local fallbacks
+        return LLMAdvisor(budget=self.llm_budget)
 
-            if abs(total_weight - 1.0) > 0.01: # Normalize if not already summing to 1.0
-                logger.info(f"Normalizing LLM dynamic weights. Original sum: {total_weight}")
-                for key in parsed_weights:
-                    parsed_weights[key] /= total_weight # Normalize
-            
-            logger.info(f"Successfully obtained and processed dynamic fitness weights: {parsed_weights}")
-            return parsed_weights
-            
-        except json.JSONDecodeError:
-            logger.error("Error decoding JSON response from LLM for dynamic fitness weights.", exc_info=True)
-            return None
-        except Exception as e:
-            logger.error(f"Error getting dynamic fitness weights from LLM: {e}", exc_info=True)
+    def _llm_problem_state(self) -> Dict[str, Any]:
+        """Quantized description of the packing problem shared by every LLM cache key"""
+        items = self.items_to_pack or []
+        return {
+            'items': count_bucket(len(items)),
+            'container': [round(float(d), 2) for d in np.ravel(self.container_dims)],
+            'temperature': self.route_temperature is not None or
+                           any(getattr(item, 'temperature_sensitivity', None) is not None for item in items),
+        }
+
+    def _initial_weights_state(self, initial_metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache state of an initial fitness weights request"""
+        state = self._llm_problem_state()
+        state['utilization'] = bucket(initial_metrics.get('initial_volume_utilization_estimate', 0.0))
+        return state
+
+    def _dynamic_weights_state(self, current_metrics: Dict[str, float]) -> Dict[str, Any]:
+        """Cache state of a dynamic fitness weights request"""
+        state = self._llm_problem_state()
+        for metric in ('volume_utilization', 'stability_score', 'contact_ratio', 'weight_balance', 'items_packed_ratio'):
+            state[metric] = bucket(current_metrics.get(metric, 0.0), 0.1)
+        return state
+
+    def _mutation_strategy_state(self, population, stagnation_counter: int) -> Dict[str, Any]:
+        """Cache state of a mutation strategy request"""
+        fitnesses = [g.fitness for g in population]
+        state = self._llm_problem_state()
+        state['stagnation'] = min(stagnation_counter, 10)
+        state['best_fitness'] = bucket(max(fitnesses))
+        state['variance'] = magnitude_bucket(float(np.var(fitnesses)))
+        return state
+
+    def _ask_llm(self, kind: str, method_name: str, prompt: str, state: Dict[str, Any]) -> str:
+        """
+        Send a prompt to the LLM, answering repeated questions from the response cache
+
+        Args:
+            kind: Kind of request; with the prompt version and model it names the template
+            method_name: LLM client method taking the prompt
+            prompt: Prompt text
+            state: Quantized metrics the prompt reports
+
+        Returns:
+            str: Raw LLM response (empty if the request failed)
+        """
+        llm_client = _get_llm_client()
+        # A disabled client answers with empty responses, which are not worth keeping
+        cache = get_llm_cache() if getattr(llm_client, 'enabled', False) else None
+        if cache is not None:
+            template = f"{getattr(llm_client, 'model_name', 'llm')}/{kind}/v{LLM_PROMPT_VERSION}"
+            key = make_cache_key(template, state)
+            response = cache.get(key)
+            if response is not None:
+                logger.info(f"    💾 LLM {kind} answered from the response cache")
+                return response
+        response = getattr(llm_client, method_name)(prompt)
+        # Failed requests and unparseable answers would be replayed for the whole TTL
+        if cache is not None and self._is_usable_llm_response(kind, response):
+            cache.put(key, template, response)
+        return response
+
+    @staticmethod
+    def _is_usable_llm_response(kind: str, response: str) -> bool:
+        """True if a raw LLM response is a JSON object holding the advice its kind of request asks for"""
+        try:
+            advice = json.loads(response.strip())
+        except (AttributeError, ValueError):
+            return False
+        if not isinstance(advice, dict):
+            return False
+        if kind == 'mutation_strategy':
+            return 'mutation_rate_modifier' in advice and 'operation_focus' in advice
+        try:
+            return sum(float(value) for key, value in advice.items() if key.endswith('_weight')) > 0
+        except (TypeError, ValueError):
+            return False
+
+    def _request_llm_advice(self, kind: str, method_name: str, prompt: str, state: Dict[str, Any]) -> bool:
+        """
+        Send a prompt to the LLM in the background
+
+        Args:
+            kind: Kind of advice ('initial_weights', 'fitness_weights' or 'mutation_strategy')
+            method_name: LLM client method taking the prompt
+            prompt: Prompt text
+            state: Quantized metrics the prompt reports (the response cache key)
+
+        Returns:
+            bool: True if a request was submitted
+        """
+        llm_client = _get_llm_client()
+        if not hasattr(llm_client, method_name):
+            logger.info(f"LLM client not available for {kind} advice.")
+            return False
+        return self._llm_advisor.submit(kind, self._ask_llm, kind, method_name, prompt, state)
+
+    def _collect_llm_weights(self, kind: str, wait=False) -> Optional[Dict[str, float]]:
+        """Fitness weights from a background request that answered within the LLM budget, or None"""
+        response = self._llm_advisor.collect(kind, wait=wait)
+        if response is None:
             return None
+        weights = self._parse_fitness_weights(response, "initial" if kind == 'initial_weights' else "dynamic")
+        self._llm_advisor.record(kind, applied=weights is not None)
+        return weights
 
-    def optimize(self, items, fitness_weights=None):
+    def _advise_mutation_strategy(self, generation: int, population, stagnation_counter: int) -> Dict[str, Any]:
         """
-        Run the genetic algorithm to find the best packing solution.
+        Mutation strategy for a stagnating population, without waiting for the LLM
+
+        Uses the LLM strategy requested at an earlier generation if it answered
+        within the budget, otherwise the aggressive strategy, and requests new
+        advice that the LLM works on while the next generation is evaluated.
+
         Args:
-            items: List of items to pack
-            fitness_weights (dict, optional): Predefined fitness weights from UI.
-                                              If None or empty, dynamic weights may be fetched.
+            generation: Current generation number
+            population: Current population of genomes
+            stagnation_counter: Number of generations without improvement
+
         Returns:
-            tuple: (best_genome, best_fitness, generation_count)
+            Dictionary with the mutation strategy to apply
         """
-        self.items_to_pack = items # Store items for use in _calculate_initial_metrics and _evaluate_fitness
-        
-        logger.info(f"GeneticPacker.optimize called. Received fitness_weights from UI/caller: {fitness_weights}")
+        strategy = None
+        response = self._llm_advisor.collect('mutation_strategy')
+        if response is not None:
+            # An empty response is a failed request, not advice to be aggressive
+            strategy = self._parse_mutation_strategy(response, stagnation_counter) if response else None
+            self._llm_advisor.record('mutation_strategy', applied=strategy is not None)
+        if strategy is None:
+            strategy = self._get_aggressive_mutation_strategy(stagnation_counter)
+        self._request_llm_advice('mutation_strategy', 'get_llm_completion',
+                                 self._build_mutation_strategy_prompt(generation, population, stagnation_counter),
+                                 self._mutation_strategy_state(population, stagnation_counter))
+        return strategy
+
+    def _create_surrogate(self) -> Optional[SurrogateModel]:
+        """Surrogate fitness model for the items being packed, or None if pre-screening is off"""
+        if self.surrogate_fraction >= 1.0 or self._item_types is None:
+            return None
+        return SurrogateModel(self._item_types, tuple(float(d) for d in self.container_dims))
 
-        # Determine the fitness weights to use
-        if fitness_weights and isinstance(fitness_weights, dict) and any(w > 0 for w in fitness_weights.values()): # Check if any weight is positive
-            self.fitness_weights = fitness_weights
-            logger.info(f"Using fitness weights provided by UI/caller: {self.fitness_weights}")
+    def _abort_threshold(self, population) -> Optional[float]:
+        """Fitness of the weakest elite carried into the next generation, or None if early abort is off"""
+        if not self.early_abort or not population:
+            return None
+        elite_count = max(1, int(self.population_size * self.elite_percentage))
+        fitnesses = sorted((genome.fitness for genome in population), reverse=True)
+        return fitnesses[min(elite_count, len(fitnesses)) - 1]
+
+    def _next_generation(self, population, operation_focus="balanced", surrogate=None) -> List[PackingGenome]:
+        """
+        Breed the next generation from an evaluated population
+
+        Once a trained surrogate is given, 1/surrogate_fraction times the needed
+        offspring are bred and the surrogate keeps the most promising of them.
+
+        Args:
+            population: Evaluated genomes of the current generation
+            operation_focus: Mutation focus applied to every child
+            surrogate: Optional SurrogateModel to pre-screen offspring with
+
+        Returns:
+            list: Elite genomes followed by mutated offspring, population_size genomes in total
+        """
+        # Elitism: carry forward the best genome
+        elite_count = max(1, int(self.population_size * self.elite_percentage))
+        new_population = sorted(population, key=lambda x: x.fitness, reverse=True)[:elite_count]
+        offspring_count = self.population_size - len(new_population)
+        if surrogate is not None and surrogate.ready:
+            offspring_target = len(new_population) + int(math.ceil(offspring_count / self.surrogate_fraction))
         else:
-            if not fitness_weights:
-                 logger.info("No fitness_weights from UI/caller (None or empty). Attempting to get dynamic weights from LLM.")
-            else: # Handles case where fitness_weights might be e.g. all zeros from UI
-                 logger.info(f"Received fitness_weights from UI/caller ({fitness_weights}), but they are not effectively usable (e.g., all zero). Attempting to get dynamic weights from LLM.")
+            offspring_target = self.population_size
+
+        # Crossover and mutation to create new population
+        while len(new_population) < offspring_target:
+            parent1 = self._tournament_select(population)
+            parent2 = self._tournament_select(population)
+            child = self._crossover(parent1, parent2)
+
+            # Apply mutation
+            child.mutate(
+                operation_focus=operation_focus,  # Balanced by default for exploration
+                rate_modifier=random.uniform(0.05, 0.2)  # Small to moderate mutation rate
+            )
+
+            new_population.append(child)
+        if len(new_population) > self.population_size:
+            new_population[elite_count:] = surrogate.screen(new_population[elite_count:], offspring_count)
+        return new_population
+
+    def _evolve(self, population, executor, deadline, volume_bound):
+        """
+        Run the generation loop on a single population
 
-            # Calculate initial metrics first, as _get_initial_dynamic_fitness_weights might need them.
-            # self.items_to_pack should be set before calling _calculate_initial_metrics.
-            initial_metrics_for_llm = self._calculate_initial_metrics()
-            dynamic_weights = self._get_initial_dynamic_fitness_weights(initial_metrics=initial_metrics_for_llm) 
-            
-            if dynamic_weights:
-                self.fitness_weights = dynamic_weights
-                logger.info(f"Using dynamic fitness weights from LLM: {self.fitness_weights}")
-            else:
-                logger.info("Failed to get dynamic weights from LLM or LLM disabled. Using default fitness weights.")
-                self.fitness_weights = self._get_default_fitness_weights()
-        
-        # Final fallback: Ensure fitness_weights are always set to a default if still None or empty
-        if not self.fitness_weights or not any(w > 0 for w in self.fitness_weights.values()):
-            logger.warning("Fitness weights were still None, empty, or all zero after all attempts. Forcing default weights.")
-            self.fitness_weights = self._get_default_fitness_weights()
-        
-        logger.info(f"Final fitness weights for optimization run: {self.fitness_weights}")
+        Args:
+            population: Initial population
+            executor: Optional ProcessPoolExecutor from _create_evaluation_pool
+            deadline: time.monotonic() value at which the time budget runs out, or None
+            volume_bound: Upper bound on volume utilization, or None if that criterion is off
 
-        # Initialize population
-        population = [PackingGenome(items) for _ in range(self.population_size)]
+        Returns:
+            tuple: (best genome, best fitness); self.stop_reason is set if a stopping criterion was met
+        """
         best_overall_genome = None
         best_overall_fitness = float('-inf')
         stagnation_counter = 0
+        surrogate = self._create_surrogate()
 
         for generation in range(self.generations):
             logger.info(f"\n{'='*60}")
             logger.info(f"🧬 GENERATION {generation + 1}/{self.generations}")
             logger.info(f"{'='*60}")
 
-            # Evaluate fitness for the current population
-            # Use sequential evaluation instead of multiprocessing to avoid pickling issues
-            logger.info(f"  📊 Evaluating {len(population)} genomes...")
-            for i, genome in enumerate(population):
-                try:
-                    genome.fitness = self._evaluate_fitness(genome)
-                    if (i + 1) % 5 == 0 or i == len(population) - 1:
-                        logger.info(f"    ✅ Evaluated {i + 1}/{len(population)} genomes (latest fitness: {genome.fitness:.4f})")
-                except Exception as e:
-                    logger.error(f"❌ Error evaluating genome {i + 1}: {e}")
-                    genome.fitness = 0.0
+            # Evaluate fitness for the current population (serially or on the worker pool)
+            evaluated = self._evaluate_population(population, executor, deadline)
+            self.generation_count = generation + 1
+            if surrogate is not None:
+                surrogate.observe(evaluated, generation + 1)
 
             # Calculate generation statistics
-            fitnesses = [g.fitness for g in population]
+            fitnesses = [g.fitness for g in evaluated]
             current_best = max(fitnesses)
             current_avg = sum(fitnesses) / len(fitnesses)
             current_worst = min(fitnesses)
             current_std = np.std(fitnesses) if len(fitnesses) > 1 else 0.0
-            
+        
             logger.info(f"\n  📈 GENERATION {generation + 1} RESULTS:")
             logger.info(f"    🏆 Best fitness: {current_best:.4f}")
             logger.info(f"    📊 Average fitness: {current_avg:.4f}")
             logger.info(f"    📉 Worst fitness: {current_worst:.4f}")
             logger.info(f"    📏 Std deviation: {current_std:.4f}")
-            
+        
             # Show metrics from best genome in this generation
-            best_gen_genome = max(population, key=lambda x: x.fitness)
+            best_gen_genome = max(evaluated, key=lambda x: x.fitness)
             if hasattr(best_gen_genome, 'metrics') and best_gen_genome.metrics:
                 metrics = best_gen_genome.metrics
                 logger.info(f"    📋 Best genome metrics:")
@@ -969,7 +1794,7 @@ class GeneticPacker:
                     logger.info(f"       Temp constraint: {metrics.get('temperature_constraint', 0.0):.3f}")
                 if metrics.get('weight_capacity', 1.0) < 1.0:
                     logger.info(f"       Weight capacity: {metrics.get('weight_capacity', 0.0):.3f} (capacity exceeded!)")
-            
+        
             # Show fitness weights being used
             if generation == 0:
                 logger.info(f"    ⚖️  Current fitness weights:")
@@ -980,13 +1805,21 @@ class GeneticPacker:
 
             # Update best overall solution if improved
             improved = False
-            for genome in population:
+            for genome in evaluated:
                 if genome.fitness > best_overall_fitness:
                     best_overall_fitness = genome.fitness
                     best_overall_genome = genome
                     improved = True
                     logger.info(f"    🎯 NEW BEST SOLUTION! Fitness: {genome.fitness:.4f}")
 
+            best_metrics = getattr(best_overall_genome, 'metrics', None) or {}
+            self.generation_history.append({
+                'generation': generation + 1,
+                'best_fitness': best_overall_fitness,
+                'average_fitness': current_avg,
+                'volume_utilization': best_metrics.get('volume_utilization', 0.0),
+            })
+
             # Check stagnation
             if not improved:
                 stagnation_counter += 1
@@ -994,10 +1827,22 @@ class GeneticPacker:
             else:
                 stagnation_counter = 0
                 logger.info(f"    🚀 Improvement found! Stagnation reset.")
+                if self._llm_advisor is not None:
+                    self._llm_advisor.discard('mutation_strategy')  # Advice for the stagnated population
+
+            # Anytime mode: return the best genome so far once a stopping criterion is met
+            self.stop_reason = self._check_stopping_criteria(deadline, best_overall_genome, best_overall_fitness,
+                                                             stagnation_counter, volume_bound)
+            if self.stop_reason:
+                logger.info(f"    🛑 Stopping early: {self.stop_reason}")
+                break
 
             # Adaptive mutation strategy
             if stagnation_counter >= 5:
-                new_strategy = self._get_adaptive_mutation_strategy(generation, population, stagnation_counter)
+                if self._llm_advisor is not None:
+                    new_strategy = self._advise_mutation_strategy(generation, population, stagnation_counter)
+                else:
+                    new_strategy = self._get_adaptive_mutation_strategy(generation, population, stagnation_counter)
                 if new_strategy:
                     logger.info(f"    🧬 Adapting mutation strategy: {new_strategy['operation_focus']} (rate: {new_strategy['mutation_rate_modifier']:.3f})")
                     logger.info(f"    💡 Reasoning: {new_strategy.get('explanation', 'No explanation provided')}")
@@ -1008,42 +1853,208 @@ class GeneticPacker:
                         )
 
             # Dynamic fitness weight adjustment every few generations (only if LLM is available)
+            dynamic_weights = None
+            if self._llm_advisor is not None:
+                dynamic_weights = self._collect_llm_weights('fitness_weights')
             if generation > 0 and generation % 3 == 0 and best_overall_genome:
-                # Get current metrics from best genome for dynamic weight adjustment
-                current_metrics = getattr(best_overall_genome, 'metrics', {})
-                if current_metrics:
+                # Get current metrics from best genome for dynamic weight adjustment, including unweighted ones
+                current_metrics = self._complete_metrics(best_overall_genome)
+                if current_metrics and self._llm_advisor is not None:
+                    # Answered while the next generation is evaluated
+                    self._request_llm_advice('fitness_weights', 'get_llm_completion',
+                                             self._build_dynamic_weights_prompt(generation, population, current_metrics),
+                                             self._dynamic_weights_state(current_metrics))
+                elif current_metrics:
                     dynamic_weights = self._get_dynamic_fitness_weights(generation, population, current_metrics)
-                    if dynamic_weights:
-                        logger.info(f"    🎯 Updated fitness weights based on current performance")
-                        logger.info(f"    📊 New weights: {dynamic_weights}")
-                        self.fitness_weights = dynamic_weights
-
-            # Elitism: carry forward the best genome
-            elite_count = max(1, int(self.population_size * self.elite_percentage))
-            new_population = sorted(population, key=lambda x: x.fitness, reverse=True)[:elite_count]
-
-            # Crossover and mutation to create new population
-            while len(new_population) < self.population_size:
-                parent1 = self._tournament_select(population)
-                parent2 = self._tournament_select(population)
-                child = self._crossover(parent1, parent2)
-                
-                # Apply mutation
-                child.mutate(
-                    operation_focus="balanced",  # Use a balanced approach for exploration
-                    rate_modifier=random.uniform(0.05, 0.2)  # Small to moderate mutation rate
-                )
+            if dynamic_weights:
+                logger.info(f"    🎯 Updated fitness weights based on current performance")
+                logger.info(f"    📊 New weights: {dynamic_weights}")
+                self.fitness_weights = dynamic_weights
+                if surrogate is not None:
+                    surrogate.reset()  # Trained on fitness under the previous weights
+
+            # Children that cannot reach the weakest elite are not decoded to the end
+            self._abort_below = self._abort_threshold(population) if not dynamic_weights else None
+            population = self._next_generation(population, surrogate=surrogate)
+        self._abort_below = None
+        if surrogate is not None:
+            self.surrogate_stats = surrogate.stats()
+        return best_overall_genome, best_overall_fitness
+
+    def _run_islands(self, items, deadline, volume_bound):
+        """
+        Evolve self.islands populations in parallel processes with periodic migration
+
+        Falls back to a single serially evaluated population if the island
+        processes cannot be started.
+
+        Args:
+            items: Item table shared by the populations
+            deadline: time.monotonic() value at which the time budget runs out, or None
+            volume_bound: Upper bound on volume utilization, or None if that criterion is off
+
+        Returns:
+            tuple: (best genome, best fitness); self.stop_reason is set if a stopping criterion was met
+        """
+        model = IslandModel(self, items)
+        result = model.run(deadline, volume_bound)
+        self.island_stats = model.stats
+        if result is not None:
+            return result
+        logger.warning("Could not start island processes, falling back to a single population")
+        population = self._seed_population(items, deadline)
+        population += [PackingGenome(items) for _ in range(self.population_size - len(population))]
+        return self._evolve(population, None, deadline, volume_bound)
+
+    def _local_search(self, items, genome, fitness, run_deadline=None):
+        """
+        Refine the GA's best genome with first-improvement local search
+
+        Args:
+            items: Item table of the genome
+            genome: Best genome found by the GA
+            fitness: Its fitness
+            run_deadline: time.monotonic() value at which the whole run's time budget runs out, or None
+
+        Returns:
+            tuple: (genome, fitness) - the refined genome if it beats the GA's best
+            under the current fitness weights, otherwise the GA's best unchanged
+        """
+        deadline = time.monotonic() + self.local_search_budget
+        if run_deadline is not None:
+            deadline = min(deadline, run_deadline)
+        search = LocalSearch(self, items)
+        refined, refined_fitness = search.run(genome, deadline)
+        self.local_search_stats = search.stats
+        logger.info(f"🔍 Local search: {search.stats['start_fitness']:.4f} -> {refined_fitness:.4f} after "
+                    f"{search.stats['neighbours']} neighbours "
+                    f"({'local optimum' if search.stats['local_optimum'] else 'budget spent'})")
+        if search.stats['improvements'] and refined_fitness > fitness:
+            return refined, refined_fitness
+        return genome, fitness
+
+    def optimize(self, items, fitness_weights=None):
+        """
+        Run the genetic algorithm to find the best packing solution.
+        Args:
+            items: List of items to pack
+            fitness_weights (dict, optional): Predefined fitness weights from UI.
+                                              If None or empty, dynamic weights may be fetched.
+        Returns:
+            tuple: (best_genome, best_fitness, generation_count)
+        """
+        # The time budget covers the whole run, including fetching dynamic weights
+        run_deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        deadline = run_deadline
+        if deadline is not None and self.local_search_budget > 0:
+            deadline -= min(self.local_search_budget, self.time_budget)  # Left for the local search
+        self.local_search_stats = {}
+        self.surrogate_stats = {}
+        self.early_abort_stats = {}
+        self.metric_profile = {}
+        self._abort_below = None
+        self.stop_reason = None
+        self.generation_count = 0
+        self._llm_advisor = self._create_llm_advisor()
+        self.items_to_pack = items # Store items for use in _calculate_initial_metrics and _evaluate_fitness
+        
+        logger.info(f"GeneticPacker.optimize called. Received fitness_weights from UI/caller: {fitness_weights}")
+        initial_weights_requested = False
+
+        # Determine the fitness weights to use
+        if fitness_weights and isinstance(fitness_weights, dict) and any(w > 0 for w in fitness_weights.values()): # Check if any weight is positive
+            self.fitness_weights = fitness_weights
+            logger.info(f"Using fitness weights provided by UI/caller: {self.fitness_weights}")
+        else:
+            if not fitness_weights:
+                 logger.info("No fitness_weights from UI/caller (None or empty). Attempting to get dynamic weights from LLM.")
+            else: # Handles case where fitness_weights might be e.g. all zeros from UI
+                 logger.info(f"Received fitness_weights from UI/caller ({fitness_weights}), but they are not effectively usable (e.g., all zero). Attempting to get dynamic weights from LLM.")
+
+            # Calculate initial metrics first, as _get_initial_dynamic_fitness_weights might need them.
+            # self.items_to_pack should be set before calling _calculate_initial_metrics.
+            initial_metrics_for_llm = self._calculate_initial_metrics()
+            if self._llm_advisor is not None:
+                # The LLM answers while the decode tables, population and worker pool are set up
+                self.fitness_weights = None
+                initial_weights_requested = self._request_llm_advice(
+                    'initial_weights', 'get_llm_completion', self._build_initial_weights_prompt(initial_metrics_for_llm),
+                    self._initial_weights_state(initial_metrics_for_llm))
+            else:
+                dynamic_weights = self._get_initial_dynamic_fitness_weights(initial_metrics=initial_metrics_for_llm) 
                 
-                new_population.append(child)
-            
-            population = new_population
+                if dynamic_weights:
+                    self.fitness_weights = dynamic_weights
+                    logger.info(f"Using dynamic fitness weights from LLM: {self.fitness_weights}")
+                else:
+                    logger.info("Failed to get dynamic weights from LLM or LLM disabled. Using default fitness weights.")
+                    self.fitness_weights = self._get_default_fitness_weights()
+
+        self.fitness_cache.clear()
+        self._item_spec, self._decode_table = self._build_decode_table(items)
+        self._item_types = self._build_item_types(self._item_spec, self._decode_table)
+        if self._item_types.type_count < len(items):
+            logger.info(f"🧩 {len(items)} items in {self._item_types.type_count} item types "
+                        f"(10^{self._item_types.search_space_reduction():.1f} equivalent orderings per type sequence)")
+        self.decode_trie.clear()
+
+        # Volume utilization cannot exceed the packed share of all items' volume
+        volume_bound = None
+        if self.stop_at_volume_bound:
+            container_volume = float(np.prod(self.container_dims))
+            volume_bound = min(1.0, float(self._item_spec.volume.sum()) / container_volume) if container_volume > 0 else 0.0
+
+        self.generation_history = []
+        self.island_stats = []
+        if self.islands > 1:
+            # Each island process seeds and evolves its own population
+            population, executor = None, None
+        else:
+            # Initialize population
+            population = self._seed_population(items, deadline)
+            population += [PackingGenome(items) for _ in range(self.population_size - len(population))]
+            executor = self._create_evaluation_pool(items)
+        try:
+            if initial_weights_requested:
+                dynamic_weights = self._collect_llm_weights('initial_weights', wait=True)
+                if dynamic_weights:
+                    self.fitness_weights = dynamic_weights
+                    logger.info(f"Using dynamic fitness weights from LLM: {self.fitness_weights}")
+                else:
+                    logger.info("No usable dynamic weights from LLM within budget. Using default fitness weights.")
+
+            # Final fallback: Ensure fitness_weights are always set to a default if still None or empty
+            if not self.fitness_weights or not any(w > 0 for w in self.fitness_weights.values()):
+                logger.warning("Fitness weights were still None, empty, or all zero after all attempts. Forcing default weights.")
+                self.fitness_weights = self._get_default_fitness_weights()
+
+            logger.info(f"Final fitness weights for optimization run: {self.fitness_weights}")
+
+            if self.islands > 1:
+                best_overall_genome, best_overall_fitness = self._run_islands(items, deadline, volume_bound)
+            else:
+                best_overall_genome, best_overall_fitness = self._evolve(population, executor, deadline, volume_bound)
+        finally:
+            if executor is not None:
+                # Do not wait for evaluations still running when the time budget ran out
+                executor.shutdown(wait=self.stop_reason != 'time_budget', cancel_futures=True)
+            if self._llm_advisor is not None:
+                self._llm_advisor.shutdown()  # Requests still running are left to finish unused
+        if self.stop_reason is None:
+            self.stop_reason = 'generations'
+
+        if self.local_search_budget > 0 and best_overall_genome is not None:
+            best_overall_genome, best_overall_fitness = self._local_search(items, best_overall_genome,
+                                                                           best_overall_fitness, run_deadline)
+        if best_overall_genome is not None:
+            best_overall_genome.metrics = self._complete_metrics(best_overall_genome)  # Report unweighted metrics too
 
         # Final generation summary
         logger.info(f"\n{'='*60}")
         logger.info(f"🏁 OPTIMIZATION COMPLETE")
         logger.info(f"{'='*60}")
         logger.info(f"  🏆 Best fitness achieved: {best_overall_fitness:.4f}")
-        logger.info(f"  📊 Generations completed: {self.generations}")
+        logger.info(f"  📊 Generations completed: {self.generation_count}/{self.generations} (stopped by {self.stop_reason})")
         if best_overall_genome and hasattr(best_overall_genome, 'metrics'):
             metrics = best_overall_genome.metrics
             logger.info(f"  📈 Final metrics:")
@@ -1054,19 +2065,89 @@ class GeneticPacker:
             logger.info(f"    - Weight balance: {metrics.get('weight_balance', 0.0):.3f}")
             logger.info(f"    - Temperature constraint: {metrics.get('temperature_constraint', 0.0):.3f}")
             logger.info(f"    - Weight capacity: {metrics.get('weight_capacity', 0.0):.3f}")
+        if self.surrogate_stats:
+            surrogate_stats = self.surrogate_stats
+            correlation = surrogate_stats['mean_correlation']
+            logger.info(f"  🔮 Surrogate: {surrogate_stats['rejected']}/{surrogate_stats['screened']} offspring rejected "
+                        f"without decoding, mean rank correlation "
+                        f"{'n/a' if correlation is None else f'{correlation:.2f}'}"
+                        + (f", switched off at generation {surrogate_stats['disabled_at_generation']}"
+                           if not surrogate_stats['enabled'] else ""))
+        if self.early_abort_stats.get('aborted'):
+            aborted = self.early_abort_stats['aborted']
+            logger.info(f"  ✂️  Early abort: {aborted} decodes stopped below the elite threshold, skipping "
+                        f"{self.early_abort_stats['skipped_steps'] / aborted:.1%} of their placements"
+                        + (f" ({self.early_abort_stats['metric_tiers']} before an expensive metric tier)"
+                           if self.early_abort_stats.get('metric_tiers') else ""))
+        if self.metric_profile:
+            logger.info(f"  ⏱️  Metric cost: " + " | ".join(
+                f"{name} " + (f"{profile['seconds'] / profile['computed'] * 1000:.3f}ms x {profile['computed']}"
+                              if profile['computed'] else "never computed")
+                + (f" ({profile['skipped']} skipped)" if profile['skipped'] else "")
+                for name, profile in sorted(self.metric_profile.items(), key=lambda entry: -entry[1]['seconds'])))
+        if self.local_search_stats:
+            ls_stats = self.local_search_stats
+            logger.info(f"  🔍 Local search: {ls_stats['fitness_gain']:+.4f} fitness in {ls_stats['seconds']:.2f}s "
+                        f"({ls_stats['gain_per_second']:+.4f}/s), {ls_stats['improvements']} improvements in "
+                        f"{ls_stats['neighbours']} neighbours, {ls_stats['resumed_ratio']:.1%} of decode steps resumed")
+        cache_stats = self.fitness_cache.stats()
+        logger.info(f"  ♻️  Fitness cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                    f"({cache_stats['hit_rate']:.1%} of evaluations skipped)")
+        trie_stats = self.decode_trie.stats()
+        logger.info(f"  🌳 Decode prefixes: {trie_stats['resumed_steps']}/{trie_stats['total_steps']} placements "
+                    f"resumed from snapshots ({trie_stats['skipped_ratio']:.1%})")
+        self.llm_stats = self._llm_advisor.stats() if self._llm_advisor is not None else {}
+        for kind, llm_stats in self.llm_stats.items():
+            logger.info(f"  🤖 LLM {kind}: {llm_stats['applied']}/{llm_stats['requests']} applied, "
+                        f"{llm_stats['timeouts']} timed out, {llm_stats['errors']} failed "
+                        f"(mean latency {llm_stats['mean_latency']:.2f}s, max {llm_stats['max_latency']:.2f}s)")
+        llm_cache = get_llm_cache() if getattr(_get_llm_client(), 'enabled', False) else None
+        if llm_cache is not None and llm_cache.hits + llm_cache.misses:
+            cache_stats = llm_cache.stats()
+            logger.info(f"  💾 LLM response cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                        f"this process ({cache_stats['hit_rate']:.1%} answered locally)")
+        self._llm_advisor = None
         logger.info(f"{'='*60}")
 
         self.best_solution = best_overall_genome
         self.best_fitness = best_overall_fitness
-        self.generation_count = self.generations
         
         # Store final performance data in the best genome for reporting
         if best_overall_genome:
             best_overall_genome.best_fitness = best_overall_fitness
-            best_overall_genome.generation_count = self.generations
+            best_overall_genome.generation_count = self.generation_count
+            best_overall_genome.stop_reason = self.stop_reason
         
         return best_overall_genome
 
+    def _check_stopping_criteria(self, deadline, best_genome, best_fitness, stagnation_counter,
+                                 volume_bound) -> Optional[str]:
+        """
+        Check the anytime-mode stopping criteria after a generation
+
+        Args:
+            deadline: time.monotonic() value at which the time budget runs out, or None
+            best_genome: Best genome found so far
+            best_fitness: Its fitness
+            stagnation_counter: Generations since the best fitness last improved
+            volume_bound: Upper bound on volume utilization, or None if that criterion is off
+
+        Returns:
+            str: 'time_budget', 'target_fitness', 'stagnation' or 'volume_bound', or None to continue
+        """
+        if deadline is not None and time.monotonic() >= deadline:
+            return 'time_budget'
+        if best_genome is None:
+            return None
+        if self.target_fitness is not None and best_fitness >= self.target_fitness:
+            return 'target_fitness'
+        if self.stagnation_limit is not None and stagnation_counter >= self.stagnation_limit:
+            return 'stagnation'
+        metrics = getattr(best_genome, 'metrics', None) or {}
+        if volume_bound is not None and metrics.get('volume_utilization', 0.0) >= volume_bound - 1e-9:
+            return 'volume_bound'
+        return None
+
     @staticmethod
     def _get_rotation(_, original_dims: Tuple[float, float, float], rotation_flag: int) -> Tuple[float, float, float]:
         """Get dimensions after rotation based on flag (static method for external access)"""
@@ -1079,35 +2160,25 @@ class GeneticPacker:
     
     def _tournament_select(self, population, tournament_size=3):
         """Tournament selection"""
-        tournament = random.sample(population, tournament_size)
-        return max(tournament, key=lambda x: x.fitness)
+        contenders = _genome_rng().choice(len(population), size=tournament_size, replace=False)
+        fitnesses = np.fromiter((population[i].fitness for i in contenders), dtype=float, count=tournament_size)
+        return population[contenders[np.argmax(fitnesses)]]
 
     def _crossover(self, parent1, parent2):
         """Order crossover (OX) for sequence, uniform crossover for rotations"""
-        # OX crossover for item sequence
-        size = len(parent1.item_sequence)
-        start, end = sorted(random.sample(range(size), 2))
-        
-        # Create child sequence using OX
-        child_sequence = [None] * size
-        child_sequence[start:end] = parent1.item_sequence[start:end]
-        
-        remaining = [item for item in parent2.item_sequence 
-                    if item not in child_sequence[start:end]]
+        rng = _genome_rng()
+
+        # OX crossover for item sequence: keep parent1's slice, fill the rest in parent2's order
+        size = len(parent1.order)
+        start, end = np.sort(rng.choice(size, size=2, replace=False))
+        segment = parent1.order[start:end]
         
-        j = 0
-        for i in range(size):
-            if child_sequence[i] is None:
-                child_sequence[i] = remaining[j]
-                j += 1
+        in_segment = np.zeros(len(parent1.items), dtype=bool)
+        in_segment[segment] = True
+        remaining = parent2.order[~in_segment[parent2.order]]
+        child_order = np.concatenate((remaining[:start], segment, remaining[start:]))
         
         # Uniform crossover for rotations
-        child_rotations = array('B', [
-            parent1.rotation_flags[i] if random.random() < 0.5 
-            else parent2.rotation_flags[i]
-            for i in range(size)
-        ])
+        child_rotations = np.where(rng.random(size) < 0.5, parent1.rotation_flags, parent2.rotation_flags)
         
-        child = PackingGenome(child_sequence)
-        child.rotation_flags = child_rotations
-        return child
\ No newline at end of file
+        return PackingGenome.from_compact(parent1.items, child_order, child_rotations)
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Heuristic seed genomes for the genetic algorithm's initial population.
+Random genomes spend the first generations rediscovering obvious packings. Each
+seeding strategy pairs a classic item ordering with a rotation heuristic, so a
+fraction of the population starts from distinct, reasonable packings.
+
+The decoder pre-sorts items by volume, weight and stackability before placing
+them, so a seed's ordering only decides the placement order of items tied under
+that key; its rotation genes carry most of the heuristic.
+"""
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+# Strategies in the order seeds are taken from them
+SEED_STRATEGIES = ('volume', 'pack_items', 'height_groups', 'weight', 'base_area', 'temperature')
+
+def _volume(dims):
+    return dims[0] * dims[1] * dims[2]
+
+def _needs_insulation(item):
+    return bool(getattr(item, 'needs_insulation', False))
+
+# Item ordering of each strategy (ascending sort keys of upright items)
+ORDER_KEYS: Dict[str, Callable] = {
+    'volume': lambda item: -_volume(item.dimensions),
+    'base_area': lambda item: -(item.dimensions[0] * item.dimensions[1]),
+    'weight': lambda item: -item.weight,
+    'temperature': lambda item: (not _needs_insulation(item), -_volume(item.dimensions)),
+    # Same priorities as ContainerPacking.pack_items
+    'pack_items': lambda item: (not _needs_insulation(item),
+                                -sum(item.dimensions) / 3 if _needs_insulation(item) else 0,
+                                -(item.dimensions[0] * item.dimensions[1]), item.dimensions[2], -item.weight),
+    # Tallest first; refined by the seed's chosen heights in HeuristicSeeder.seed
+    'height_groups': lambda item: -max(item.dimensions),
+}
+
+# Rotation heuristic of each strategy (see HeuristicSeeder)
+ROTATION_RULES = {
+    'volume': 'best_fit',
+    'base_area': 'flat',
+    'weight': 'contact',
+    'temperature': 'lowest',
+    'pack_items': 'cross_section',
+    'height_groups': 'upright',
+}
+
+class HeuristicSeeder:
+    """
+    Build heuristic seed genomes for a GeneticPacker run
+
+    Rotation heuristics pick, per item, an index into its valid orientations:
+
+    - flat: largest base, lowest height
+    - upright: tallest orientation, building full-height columns
+    - cross_section: orientation whose width and height tile the container's
+      cross-section with the least remainder
+    - best_fit, contact, lowest: greedy construction; each item, in decode
+      order, is placed in every valid orientation and keeps the one ending
+      nearest the back wall (best_fit), with the highest contact ratio
+      (contact) or with the lowest top (lowest)
+    """
+
+    def __init__(self, packer, items):
+        """
+        Initialize the seeder
+
+        Args:
+            packer: GeneticPacker whose decode tables are built for items
+            items: Item table shared by the population
+        """
+        self.packer = packer
+        self.items = items
+        self.item_types = packer._item_types
+        self.container_dims = tuple(float(d) for d in packer.container_dims)
+
+    def _options(self, row):
+        """Valid orientations of an item-table row"""
+        return self.item_types.orientations[self.item_types.type_ids[row]]
+
+    def _static_rotations(self, rule) -> np.ndarray:
+        """Rotation genes chosen item by item without decoding"""
+        _, width, height = self.container_dims
+        if rule == 'flat':
+            key = lambda o: (o[2], -o[0])
+        elif rule == 'upright':
+            key = lambda o: (-o[2], -o[0])
+        else:  # cross_section
+            key = lambda o: ((width % o[1]) / width + (height % o[2]) / height, -o[0])
+        genes = np.zeros(len(self.items), dtype=np.uint8)
+        for row in range(len(self.items)):
+            options = self._options(row)
+            if options:
+                genes[row] = min(range(len(options)), key=lambda i: key(options[i]))
+        return genes
+
+    def _greedy_rotations(self, rule, order) -> np.ndarray:
+        """Rotation genes chosen by placing each item in every orientation, in the order a genome with order decodes"""
+        packer = self.packer
+        spec, decode_table = packer._item_spec, packer._decode_table
+        if rule == 'best_fit':
+            score = lambda item, contact, surface: (-(item.position[0] + item.dimensions[0]),
+                                                    -(item.position[2] + item.dimensions[2]))
+        elif rule == 'contact':
+            score = lambda item, contact, surface: (contact / surface if surface else 0.0,
+                                                    -(item.position[2] + item.dimensions[2]))
+        else:  # lowest
+            score = lambda item, contact, surface: (-(item.position[2] + item.dimensions[2]), contact)
+
+        rows = [decode_table[id(item)][2] for item in self.items]
+        # The decoder's stable pre-sort, applied to the genome order
+        decode_order = sorted(order.tolist(), key=lambda i: decode_table[id(self.items[i])][0], reverse=True)
+        container = packer._create_eval_container()
+        genes = np.zeros(len(self.items), dtype=np.uint8)
+        for index in decode_order:
+            row, options = rows[index], self._options(index)
+            best = None
+            state = container._capture_state()
+            for gene, orientation in enumerate(options):
+                placed_count = len(container.items)
+                contact, surface = packer._place_eval_item(container, spec, row, orientation)
+                if len(container.items) > placed_count:
+                    candidate = score(container.items[-1], contact, surface)
+                    if best is None or candidate > best[0]:
+                        best = (candidate, gene)
+                container._restore_state(state)
+            if best is not None:
+                genes[index] = best[1]
+                packer._place_eval_item(container, spec, row, options[best[1]])
+        return genes
+
+    def seed(self, strategy: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Seed genome of a strategy
+
+        Args:
+            strategy: One of SEED_STRATEGIES
+
+        Returns:
+            tuple: (order, rotation_flags) compact genome encoding
+        """
+        rule, order_key = ROTATION_RULES[strategy], ORDER_KEYS[strategy]
+        keys = [order_key(item) for item in self.items]
+        if rule in ('best_fit', 'contact', 'lowest'):
+            order = np.array(sorted(range(len(self.items)), key=keys.__getitem__), dtype=np.int32)
+            rotations = self._greedy_rotations(rule, order)
+        else:
+            rotations = self._static_rotations(rule)
+            if strategy == 'height_groups':
+                # Group items by the height their seeded orientation stands at
+                heights = [self.item_types.orientation(row, rotations[row]) for row in range(len(self.items))]
+                keys = [(-(dims[2] if dims else 0.0), key) for key, dims in zip(keys, heights)]
+            order = np.array(sorted(range(len(self.items)), key=keys.__getitem__), dtype=np.int32)
+        return order, rotations[order]
@@ -0,0 +1,179 @@
+"""
+Surrogate fitness model for pre-screening offspring.
+A full evaluation decodes every item into the container. The decoder fixes the
+placement order up to ties, so a genome's packing is mostly determined by the
+orientation its rotation genes select for each item. This model predicts
+fitness from cheap orientation features with a ridge regression trained
+online on every genome the GA evaluates. The GA breeds extra offspring, ranks
+them by predicted fitness, and fully decodes only the top fraction.
+"""
+import logging
+import random
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("packer")
+
+def rank_correlation(predicted, actual) -> Optional[float]:
+    """Spearman rank correlation, or None if it is undefined (fewer than 3 pairs or a constant side)"""
+    predicted, actual = np.asarray(predicted, dtype=np.float64), np.asarray(actual, dtype=np.float64)
+    if len(predicted) < 3 or np.ptp(predicted) == 0 or np.ptp(actual) == 0:
+        return None
+    ranks = [np.argsort(np.argsort(values, kind='stable'), kind='stable').astype(np.float64)
+             for values in (predicted, actual)]
+    return float(np.corrcoef(ranks[0], ranks[1])[0, 1])
+
+class SurrogateModel:
+    """
+    Online ridge regression from orientation features to fitness
+
+    Features of a genome are the plain and volume-weighted means, over its
+    items, of the selected orientation's height, flatness (base area relative
+    to the item's largest base) and the share of the container's length,
+    width and height left over when tiling it with that orientation. The
+    model's rank correlation with true fitness is measured every generation
+    over the screened offspring of the last `window` generations, including a
+    few picked at random so the sample is not limited to the surrogate's
+    favourites; once a full window correlates below `min_correlation` the
+    model switches itself off for the rest of the run.
+    """
+
+    def __init__(self, item_types, container_dims, ridge=1e-3, min_samples=20, min_correlation=0.2,
+                 window=3, explore_share=0.2):
+        """
+        Initialize the model
+
+        Args:
+            item_types: ItemTypeTable of the items being packed
+            container_dims: (length, width, height) of the container
+            ridge: L2 regularization of the regression
+            min_samples: Evaluated genomes needed before the model screens offspring
+            min_correlation: Rank correlation below which the model switches off
+            window: Generations of screened offspring the correlation is measured over
+            explore_share: Share of the kept offspring picked at random instead of by prediction
+        """
+        self.ridge = ridge
+        self.min_samples = min_samples
+        self.min_correlation = min_correlation
+        self.window = window
+        self.explore_share = explore_share
+        self.enabled = True
+        self.disabled_at = None  # Generation the model switched itself off at
+        self.correlations: List[float] = []  # Windowed rank correlation after each screened generation
+        self._recent = deque(maxlen=window)  # (predictions, fitnesses) of recently screened generations
+        self.screened = 0  # Offspring ranked by the model
+        self.rejected = 0  # Offspring discarded without a full decode
+        self._orientation_features = self._build_orientation_features(item_types, container_dims)
+        feature_count = self._orientation_features.shape[2] * 2 - 1
+        self._gram = np.zeros((feature_count, feature_count))
+        self._moment = np.zeros(feature_count)
+        self._samples = 0
+        self._coefficients = None
+
+    @staticmethod
+    def _build_orientation_features(item_types, container_dims) -> np.ndarray:
+        """(rows, 6 rotation genes, features + volume) feature table of every item and gene"""
+        length, width, height = (float(d) for d in container_dims)
+        table = np.zeros((len(item_types), 6, 6))
+        for row in range(len(item_types)):
+            options = item_types.orientations[item_types.type_ids[row]]
+            if not options:
+                continue
+            largest_base = max(o[0] * o[1] for o in options)
+            for gene in range(6):
+                l, w, h = item_types.orientation(row, gene)
+                table[row, gene] = (h / height, (l * w) / largest_base if largest_base else 0.0,
+                                    (length % l) / length, (width % w) / width, (height % h) / height, l * w * h)
+        return table
+
+    def features(self, genome) -> np.ndarray:
+        """Feature vector of a genome (its item-order independent orientation statistics)"""
+        order, rotation_flags = genome.to_compact()
+        values = self._orientation_features[order, rotation_flags]
+        volumes, values = values[:, -1], values[:, :-1]
+        total = volumes.sum()
+        weighted = (values * volumes[:, None]).sum(axis=0) / total if total > 0 else values.mean(axis=0)
+        return np.concatenate(([1.0], values.mean(axis=0), weighted))
+
+    def reset(self) -> None:
+        """Forget the training data (e.g. when the fitness weights change)"""
+        self._gram[:] = 0.0
+        self._moment[:] = 0.0
+        self._samples = 0
+        self._coefficients = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the model is enabled and trained on enough genomes to screen offspring"""
+        return self.enabled and self._coefficients is not None and self._samples >= self.min_samples
+
+    def observe(self, genomes, generation) -> None:
+        """
+        Train on evaluated genomes and score the predictions made for them
+
+        Args:
+            genomes: Genomes of a generation with their true fitness
+            generation: Generation number, for the switch-off log
+        """
+        if not genomes or not self.enabled:
+            return
+        X = np.array([self.features(genome) for genome in genomes])
+        y = np.array([genome.fitness for genome in genomes], dtype=np.float64)
+        self._gram += X.T @ X
+        self._moment += X.T @ y
+        self._samples += len(genomes)
+        regularizer = self.ridge * np.eye(len(self._moment))
+        regularizer[0, 0] = 0.0  # Do not shrink the intercept
+        self._coefficients = np.linalg.lstsq(self._gram + regularizer, self._moment, rcond=None)[0]
+
+        predicted = [(genome.__dict__.pop('surrogate_prediction'), genome.fitness)
+                     for genome in genomes if 'surrogate_prediction' in genome.__dict__]
+        if not predicted:
+            return
+        self._recent.append(predicted)
+        correlation = rank_correlation(*zip(*[pair for pairs in self._recent for pair in pairs]))
+        if correlation is None:
+            return
+        self.correlations.append(correlation)
+        if len(self._recent) == self.window and correlation < self.min_correlation:
+            self.enabled = False
+            self.disabled_at = generation
+            logger.info(f"    📉 Surrogate switched off: rank correlation {correlation:.2f} over the last "
+                        f"{self.window} generations (minimum {self.min_correlation:.2f})")
+
+    def screen(self, offspring, keep) -> list:
+        """
+        Keep the offspring with the highest predicted fitness
+
+        Args:
+            offspring: Candidate genomes
+            keep: Number to keep for a full evaluation
+
+        Returns:
+            list: Kept genomes, each tagged with its surrogate_prediction
+        """
+        if keep >= len(offspring):
+            return list(offspring)
+        predictions = np.array([self.features(genome) for genome in offspring]) @ self._coefficients
+        explore = min(keep - 1, int(round(keep * self.explore_share))) if keep > 1 else 0
+        ranked = np.argsort(-predictions, kind='stable').tolist()
+        chosen = ranked[:keep - explore] + random.sample(ranked[keep - explore:], explore)
+        for index in chosen:
+            offspring[index].surrogate_prediction = float(predictions[index])
+        self.screened += len(offspring)
+        self.rejected += len(offspring) - keep
+        return [offspring[index] for index in chosen]
+
+    def stats(self) -> Dict[str, Any]:
+        """Screening counts and the model's rank correlation with true fitness"""
+        return {
+            'enabled': self.enabled,
+            'disabled_at_generation': self.disabled_at,
+            'samples': self._samples,
+            'screened': self.screened,
+            'rejected': self.rejected,
+            'correlations': list(self.correlations),
+            'mean_correlation': sum(self.correlations) / len(self.correlations) if self.correlations else None,
+        }
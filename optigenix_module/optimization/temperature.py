@@ -220,6 +220,7 @@ class TemperatureConstraintHandler:
         # Calculate center of container
         center_x = container.dimensions[0] / 2
         center_y = container.dimensions[1] / 2
+        graph = container._get_contact_graph() if hasattr(container, '_get_contact_graph') else None
         
         for item in temp_items:
             x, y, z = item.position
@@ -248,13 +249,16 @@ class TemperatureConstraintHandler:
             total_dist += min_dist
             
             # Check if well insulated by surrounding items
-            surrounding_items = 0
-            for other_item in container.items:
-                if other_item == item:
-                    continue
-                # Check if items are in contact
-                if self._has_surface_contact(item.position, item.dimensions, other_item):
-                    surrounding_items += 1
+            if graph is not None:
+                surrounding_items = graph.degree(item)
+            else:
+                surrounding_items = 0
+                for other_item in container.items:
+                    if other_item == item:
+                        continue
+                    # Check if items are in contact
+                    if self._has_surface_contact(item.position, item.dimensions, other_item):
+                        surrounding_items += 1
             
             if surrounding_items >= 2:
                 metrics['temp_items_well_insulated'] += 1
@@ -0,0 +1,223 @@
+"""
+Persistent cache of LLM responses keyed by quantized optimization state.
+Runs on similar manifests ask the LLM near-identical questions, so responses
+are stored in SQLite under a key built from the prompt template and a coarse
+bucketing of the metrics the prompt reports. Entries expire after a TTL and
+the least recently used ones are evicted beyond a size cap.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("llm_cache")
+
+DEFAULT_CACHE_PATH = "llm_cache.sqlite3"
+DEFAULT_TTL = 7 * 24 * 3600  # One week
+DEFAULT_MAX_ENTRIES = 2000
+
+# Global singleton instance
+_GLOBAL_CACHE_INSTANCE = None
+_GLOBAL_CACHE_LOCK = threading.Lock()
+
+def bucket(value, width=0.05) -> float:
+    """Lower edge of the bucket holding a metric"""
+    return round(math.floor(float(value) / width) * width, 6)
+
+def count_bucket(count) -> int:
+    """Power-of-two bucket of a count (0, 1, 2, 4, 8, ...)"""
+    count = int(count)
+    return 0 if count <= 0 else 1 << (count.bit_length() - 1)
+
+def magnitude_bucket(value) -> Optional[int]:
+    """Order of magnitude of a non-negative value (None for zero)"""
+    return math.floor(math.log10(value)) if value > 0 else None
+
+def make_cache_key(template: str, state: Dict[str, Any]) -> str:
+    """
+    Cache key of a prompt template asked about a quantized state
+
+    Args:
+        template: Prompt template name (including its version and the model answering it)
+        state: JSON-serializable quantized metrics
+
+    Returns:
+        str: Hex digest identifying the question
+    """
+    payload = json.dumps([template, state], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class LLMResponseCache:
+    """
+    SQLite-backed LLM response cache with a TTL and a size cap
+
+    Entries read or written by this process are also kept in memory, so
+    repeated questions are answered without touching the database. The cache
+    is safe to share between threads; if the database cannot be opened or
+    written it keeps working in memory only.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache (the database is opened on first use)
+
+        Args:
+            path: SQLite database file, or None to keep entries in memory only
+            ttl: Seconds an entry stays valid
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (created, response), in LRU order
+        self._touched: Dict[str, float] = {}  # key -> time of memory hits not yet written to the database
+        self._lock = threading.Lock()
+        self._conn = None
+        self._persistent = path is not None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open connection to the database, or None if it is unavailable"""
+        if self._conn is None and self._persistent:
+            try:
+                self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                self._conn.execute("CREATE TABLE IF NOT EXISTS llm_responses ("
+                                   "key TEXT PRIMARY KEY, template TEXT, response TEXT, created REAL, last_used REAL)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_last_used ON llm_responses (last_used)")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ LLM response cache {self.path} unavailable, caching in memory only: {e}")
+                self._conn = None
+                self._persistent = False
+        return self._conn
+
+    def _remember(self, key, created, response) -> None:
+        """Keep an entry in memory as the most recently used"""
+        self._memory[key] = (created, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Cached response for a key
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            str: The response, or None if it is missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            conn = self._connection()
+            if entry is None and conn is not None:
+                try:
+                    row = conn.execute("SELECT created, response FROM llm_responses WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+                        conn.commit()
+                    entry = row
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ LLM response cache read failed: {e}")
+            if entry is None or now - entry[0] > self.ttl:
+                self._memory.pop(key, None)
+                self._touched.pop(key, None)
+                self.misses += 1
+                return None
+            if conn is not None and key in self._memory:
+                self._touched[key] = now
+            self._remember(key, *entry)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, template: str, response: str) -> None:
+        """
+        Store a response, evicting expired and least recently used entries
+
+        Args:
+            key: Key from make_cache_key
+            template: Prompt template name, kept for inspection
+            response: Raw LLM response
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+            self._touched.pop(key, None)
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                # Memory hits count as uses, so the database evicts the same entries as memory
+                conn.executemany("UPDATE llm_responses SET last_used = ? WHERE key = ?",
+                                 [(used, touched) for touched, used in self._touched.items()])
+                self._touched.clear()
+                conn.execute("INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?)",
+                             (key, template, response, now, now))
+                conn.execute("DELETE FROM llm_responses WHERE created < ?", (now - self.ttl,))
+                conn.execute("DELETE FROM llm_responses WHERE key NOT IN "
+                             "(SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT ?)", (self.max_entries,))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ LLM response cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self.hits = self.misses = 0
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM llm_responses")
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ LLM response cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this process"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'persistent': self._persistent,
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the global LLM response cache (singleton pattern)
+
+    Configured by the LLM_CACHE_PATH (an empty value disables caching),
+    LLM_CACHE_TTL (seconds) and LLM_CACHE_MAX_ENTRIES environment variables.
+    """
+    global _GLOBAL_CACHE_INSTANCE
+
+    path = os.environ.get("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+    if not path:
+        return None
+    with _GLOBAL_CACHE_LOCK:
+        if _GLOBAL_CACHE_INSTANCE is None or _GLOBAL_CACHE_INSTANCE.path != path:
+            _GLOBAL_CACHE_INSTANCE = LLMResponseCache(
+                path,
+                ttl=float(os.environ.get("LLM_CACHE_TTL", DEFAULT_TTL)),
+                max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+    return _GLOBAL_CACHE_INSTANCE
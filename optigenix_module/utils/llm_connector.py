@@ -60,10 +60,16 @@ class GeminiClient:
         self.logger.addHandler(file_handler)
     
     def generate(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
-        """Generate with Gemini model"""
+        """Generate with Gemini model, answering with a local fallback strategy if the request fails"""
+        content = self._request(prompt, max_tokens, temperature)
+        if content is None:
+            return json.dumps(self._get_fallback_strategy())
+        return content
+
+    def _request(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> Optional[str]:
+        """Gemini response text, or None if the client is disabled or every retry failed"""
         if not self.enabled:
-            fallback = self._get_fallback_strategy()
-            return json.dumps(fallback)
+            return None
             
         print(f"\\n{'='*60}")
         print(f"🧠 QUERYING LLM: Asking Gemini for adaptive mutation strategy...")
@@ -165,12 +171,16 @@ class GeminiClient:
                 else:
                     print(f"\n❌ ERROR: Gemini API request failed after {max_retries} attempts: {error_msg}")
                     print(f"{'='*60}")
-                    fallback = self._get_fallback_strategy()
-                    return json.dumps(fallback)
+                    return None
         
         # This should never be reached, but just in case
-        fallback = self._get_fallback_strategy()
-        return json.dumps(fallback)
+        return None
+
+    def get_llm_completion(self, prompt: str) -> str:
+        """Raw JSON completion for a prompt, or an empty string when the LLM is disabled or the request failed"""
+        if not self.enabled:
+            return ""
+        return self._request(prompt) or ""
 
     def _clean_json_response(self, response: str) -> dict:
         """Clean and parse JSON response from Gemini"""
@@ -516,11 +526,104 @@ class GeminiClient:
         return {"route_temperature": route_temp, "constraints_applied": True}
 
 
+class StubLLMClient(GeminiClient):
+    """
+    Deterministic local stand-in for the Gemini client
+
+    Answers the genetic algorithm's prompts with rule-based JSON, following
+    the guidelines the prompts themselves give, without network access. Tests
+    and benchmarks use it to exercise the LLM code paths reproducibly; select
+    it with LLM_PROVIDER=stub.
+    """
+    def __init__(self, delay: float = 0.0):
+        """
+        Initialize the stub
+
+        Args:
+            delay: Seconds each response takes, to simulate LLM latency
+        """
+        self.api_key = None
+        self.enabled = True
+        self.model_name = "local-stub"
+        self.delay = delay
+        self.strategy_history = []
+        self.logger = logging.getLogger("llm_connector")
+
+    def _request(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> Optional[str]:
+        """Rule-based JSON response to a fitness-weights or mutation-strategy prompt"""
+        if self.delay:
+            time.sleep(self.delay)
+        if "fitness weights" in prompt:
+            return json.dumps(self._stub_fitness_weights(prompt))
+        return json.dumps(self._stub_mutation_strategy(prompt))
+
+    @staticmethod
+    def _prompt_value(prompt: str, label: str, default: float = 0.0) -> float:
+        """Number following a label in a prompt"""
+        match = re.search(rf"{label}:\s*(-?[\d.]+(?:e-?\d+)?)", prompt)
+        return float(match.group(1)) if match else default
+
+    def _stub_mutation_strategy(self, prompt: str) -> dict:
+        """Mutation strategy from the stagnation and fitness variance reported in the prompt"""
+        stagnation = self._prompt_value(prompt, "Stagnation")
+        variance = self._prompt_value(prompt, "Fitness variance")
+        if stagnation > 8:
+            return {"mutation_rate_modifier": 0.2, "operation_focus": "aggressive",
+                    "explanation": "Stub strategy: critical stagnation"}
+        if stagnation >= 5:
+            return {"mutation_rate_modifier": 0.15, "operation_focus": "subsequence",
+                    "explanation": "Stub strategy: stagnation, moving groups of items"}
+        if variance < 0.01:
+            return {"mutation_rate_modifier": 0.05, "operation_focus": "swap",
+                    "explanation": "Stub strategy: low variance, exploring with swaps"}
+        return {"mutation_rate_modifier": 0.05, "operation_focus": "balanced",
+                "explanation": "Stub strategy: balanced"}
+
+    def _stub_fitness_weights(self, prompt: str) -> dict:
+        """Default weights, shifted towards the weakest packing metric reported in the prompt"""
+        weights = {
+            "volume_utilization_weight": 0.50,
+            "stability_score_weight": 0.10,
+            "contact_ratio_weight": 0.10,
+            "weight_balance_weight": 0.10,
+            "items_packed_ratio_weight": 0.15,
+            "temperature_constraint_weight": 0.05,
+        }
+        metrics = {
+            "volume_utilization_weight": "Volume utilization",
+            "stability_score_weight": "Stability score",
+            "contact_ratio_weight": "Contact ratio",
+            "weight_balance_weight": "Weight balance",
+            "items_packed_ratio_weight": "Items packed ratio",
+        }
+        reported = {key: self._prompt_value(prompt, label, None) for key, label in metrics.items()}
+        reported = {key: value for key, value in reported.items() if value is not None}
+        if reported:
+            weakest = min(reported, key=reported.get)
+            weights[weakest] += 0.10
+            weights["volume_utilization_weight"] -= 0.10 if weakest != "volume_utilization_weight" else 0.0
+        if "Route temperature: Not set" in prompt:
+            weights["items_packed_ratio_weight"] += weights.pop("temperature_constraint_weight")
+            weights["temperature_constraint_weight"] = 0.0
+        total = sum(weights.values())
+        weights = {key: round(value / total, 4) for key, value in weights.items()}
+        weights["explanation"] = "Stub weights: defaults shifted towards the weakest metric"
+        return weights
+
+
 def get_llm_client() -> GeminiClient:
-    """Get the global LLM client instance (singleton pattern)"""
+    """
+    Get the global LLM client instance (singleton pattern)
+
+    LLM_PROVIDER=stub selects the deterministic local StubLLMClient; any other
+    value uses Gemini.
+    """
     global _GLOBAL_CLIENT_INSTANCE
     
     if _GLOBAL_CLIENT_INSTANCE is None:
-        _GLOBAL_CLIENT_INSTANCE = GeminiClient()
+        if os.environ.get("LLM_PROVIDER", "gemini").lower() == "stub":
+            _GLOBAL_CLIENT_INSTANCE = StubLLMClient()
+        else:
+            _GLOBAL_CLIENT_INSTANCE = GeminiClient()
     
     return _GLOBAL_CLIENT_INSTANCE
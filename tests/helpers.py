@@ -0,0 +1,81 @@
+"""
+Random items, packed containers and GA packers shared by the tests
+"""
+import random
+
+import numpy as np
+
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.item import Item
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+
+CONTAINER_DIMS = (6.0, 2.35, 2.39)
+GA_CONTAINER_DIMS = (4.0, 2.35, 2.39)
+
+def random_items(rng, count):
+    """Items with mixed sizes, fragility, stackability, load bearing and insulation needs"""
+    items = []
+    for i in range(count):
+        item = Item(
+            name=f"item_{i}",
+            length=round(rng.uniform(0.3, 1.2), 2),
+            width=round(rng.uniform(0.3, 1.0), 2),
+            height=round(rng.uniform(0.2, 0.9), 2),
+            weight=rng.choice([5, 20, 60, 150]),
+            quantity=1,
+            fragility=rng.choice(['LOW', 'MEDIUM', 'HIGH']),
+            stackable=rng.random() > 0.2,
+            boxing_type='CARTON',
+            bundle='NO',
+            load_bearing=rng.choice([0, 50, 400]),
+        )
+        item.needs_insulation = rng.random() < 0.2
+        items.append(item)
+    return items
+
+def item_batch(rng, count, prefix):
+    """Random items with names unique to the batch"""
+    items = random_items(rng, count)
+    for item in items:
+        item.name = f"{prefix}_{item.name}"
+    return items
+
+def packed_container(seed, count=40):
+    """Container filled by the reference packing path"""
+    rng = random.Random(seed)
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.use_placement_kernel = False
+    container.pack_items(random_items(rng, count))
+    return container, rng
+
+def probe_item(rng):
+    """Small item to place against the packed items"""
+    return Item("probe", round(rng.uniform(0.15, 0.4), 2), round(rng.uniform(0.15, 0.4), 2),
+                round(rng.uniform(0.15, 0.4), 2), rng.choice([5, 60]), 1, 'LOW', True, 'CARTON', 'NO')
+
+def ga_items(seed, types=8, copies=3):
+    """Item table with several identical copies of each item type"""
+    rng = random.Random(seed)
+    items = []
+    for kind in range(types):
+        dims = (round(rng.uniform(0.3, 1.2), 2), round(rng.uniform(0.3, 1.0), 2), round(rng.uniform(0.2, 0.9), 2))
+        weight, fragility = rng.choice([5, 20, 60]), rng.choice(['LOW', 'MEDIUM', 'HIGH'])
+        for copy in range(copies):
+            items.append(Item(f"type{kind}_{copy}", *dims, weight, 1, fragility, rng.random() > 0.2, 'CARTON', 'NO',
+                              load_bearing=rng.choice([0, 50, 400])))
+    return items
+
+def ga_packer(items, **kwargs):
+    """Packer with its decode tables and default fitness weights set up as optimize() does"""
+    packer = GeneticPacker(GA_CONTAINER_DIMS, llm_budget=0, **kwargs)
+    packer.items_to_pack = items
+    packer.fitness_weights = packer._get_default_fitness_weights()
+    packer._item_spec, packer._decode_table = packer._build_decode_table(items)
+    packer._item_types = packer._build_item_types(packer._item_spec, packer._decode_table)
+    return packer
+
+def random_genomes(items, count, seed):
+    """Genomes with random item orders and rotation flags"""
+    rng = np.random.default_rng(seed)
+    return [PackingGenome.from_compact(items, rng.permutation(len(items)), rng.integers(0, 6, len(items)))
+            for _ in range(count)]
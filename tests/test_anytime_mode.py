@@ -0,0 +1,72 @@
+"""
+Anytime-mode stopping criteria of the GA and the request time budget that bounds them
+"""
+import math
+import time
+
+import pytest
+
+from config import GA_TIME_BUDGET
+from modules.handlers import parse_time_budget
+from optigenix_module.optimization.packer import GeneticPacker
+from tests.helpers import GA_CONTAINER_DIMS, ga_items, random_genomes
+
+@pytest.mark.parametrize("value, expected", [
+    ("30", 30.0),
+    ("2.5", 2.5),
+    (str(GA_TIME_BUDGET * 10), GA_TIME_BUDGET),
+    ("1e400", GA_TIME_BUDGET),
+    ("inf", GA_TIME_BUDGET),
+    ("nan", GA_TIME_BUDGET),
+    ("0", GA_TIME_BUDGET),
+    ("-5", GA_TIME_BUDGET),
+    ("soon", GA_TIME_BUDGET),
+    ("", GA_TIME_BUDGET),
+    (None, GA_TIME_BUDGET),
+])
+def test_request_time_budget_is_capped(value, expected):
+    assert parse_time_budget(value) == expected
+
+@pytest.mark.parametrize("time_budget", [0, -1.0, math.nan, math.inf])
+def test_invalid_time_budget_is_rejected(time_budget):
+    with pytest.raises(ValueError):
+        GeneticPacker(GA_CONTAINER_DIMS, time_budget=time_budget, llm_budget=0)
+
+def _best_genome(volume_utilization):
+    genome = random_genomes(ga_items(1), 1, seed=1)[0]
+    genome.metrics = {'volume_utilization': volume_utilization}
+    return genome
+
+def test_stopping_criteria():
+    packer = GeneticPacker(GA_CONTAINER_DIMS, target_fitness=0.8, stagnation_limit=4, llm_budget=0)
+    genome = _best_genome(0.5)
+    running = time.monotonic() + 60
+
+    assert packer._check_stopping_criteria(None, genome, 0.7, 3, 0.9) is None
+    assert packer._check_stopping_criteria(running, genome, 0.7, 3, 0.9) is None
+    assert packer._check_stopping_criteria(time.monotonic() - 1, genome, 0.7, 3, 0.9) == 'time_budget'
+    assert packer._check_stopping_criteria(running, genome, 0.8, 3, 0.9) == 'target_fitness'
+    assert packer._check_stopping_criteria(running, genome, 0.7, 4, 0.9) == 'stagnation'
+    assert packer._check_stopping_criteria(running, _best_genome(0.9), 0.7, 3, 0.9) == 'volume_bound'
+    assert packer._check_stopping_criteria(running, _best_genome(0.9), 0.7, 3, None) is None
+    # Only the time budget applies before any genome is evaluated
+    assert packer._check_stopping_criteria(running, None, 0.0, 10, 0.0) is None
+    assert packer._check_stopping_criteria(time.monotonic() - 1, None, 0.0, 10, 0.0) == 'time_budget'
+
+def test_criteria_off_by_default():
+    packer = GeneticPacker(GA_CONTAINER_DIMS, llm_budget=0)
+    assert packer._check_stopping_criteria(None, _best_genome(1.0), 1.0, 1000, None) is None
+
+@pytest.mark.parametrize("kwargs, reason", [
+    ({'time_budget': 0.5}, 'time_budget'),
+    ({'target_fitness': 0.0}, 'target_fitness'),
+    ({'stagnation_limit': 1}, 'stagnation'),
+])
+def test_optimize_stops_on_criterion(kwargs, reason):
+    items = ga_items(2, types=4, copies=2)
+    packer = GeneticPacker(GA_CONTAINER_DIMS, population_size=6, generations=200, workers=1, llm_budget=0, **kwargs)
+    started = time.monotonic()
+    packer.optimize(items)
+    assert packer.stop_reason == reason
+    assert packer.generation_count < 200 and packer.best_fitness > 0
+    assert time.monotonic() - started < 30
@@ -0,0 +1,81 @@
+"""
+Equivalence tests between the contact graph and the pairwise contact scans it replaces
+"""
+import pytest
+
+from optigenix_module.models.contact_graph import ContactGraph
+from tests.helpers import packed_container
+
+def _pair_scan_contact_ratio(container):
+    """calculate_overall_contact_ratio as a scan over every pair of items"""
+    total_contact_area = 0.0
+    total_surface_area = 0.0
+    for item in container.items:
+        w, d, h = item.dimensions
+        total_surface_area += 2 * (w*d + w*h + d*h)
+        for other in container.items:
+            if item is not other:
+                total_contact_area += container._calculate_contact_area_between_items(item.position, item.dimensions, other)
+    return total_contact_area / 2 / total_surface_area
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_edges_match_pair_scans(seed):
+    container, _ = packed_container(seed, count=60)
+    items = container.items
+    graph = container._get_contact_graph()
+    edges = 0
+    for item in items:
+        neighbours = {id(other): edge for other, edge in graph.edges(item)}
+        for other in items:
+            if other is item:
+                continue
+            area = container._calculate_contact_area_between_items(item.position, item.dimensions, other)
+            assert container._calculate_contact_area(item.position, item.dimensions, other) == area
+            significant = container._has_surface_contact(item.position, item.dimensions, other)
+            edge = neighbours.get(id(other))
+            if edge is None:
+                assert area == 0 and not significant, (item.name, other.name)
+                continue
+            edges += 1
+            assert edge.area == area, (item.name, other.name)
+            assert edge.significant == significant, (item.name, other.name)
+            base_overlap = container._calculate_overlap_area(
+                (item.position[0], item.position[1], item.dimensions[0], item.dimensions[1]),
+                (other.position[0], other.position[1], other.dimensions[0], other.dimensions[1]))
+            assert edge.base_overlap == base_overlap
+            on_top = abs(item.position[2] - (other.position[2] + other.dimensions[2])) < 0.001
+            assert edge.supports == (on_top and base_overlap > 0)
+    assert edges == 2 * graph.edge_count > 0
+
+@pytest.mark.parametrize("seed", [5, 6])
+def test_container_scores_match_pair_scans(seed):
+    container, _ = packed_container(seed, count=60)
+    items = container.items
+
+    significant_pairs = sum(container._has_surface_contact(item.position, item.dimensions, other)
+                            for item in items for other in items if item is not other)
+    assert container._calculate_interlocking_score() == significant_pairs / (len(items) * 6)
+    assert container.calculate_overall_contact_ratio() == _pair_scan_contact_ratio(container)
+
+    graph = container._get_contact_graph()
+    for item in items:
+        x, y, z = item.position
+        w, d, _ = item.dimensions
+        below = container._get_items_below((x, y, z), (w, d)) if z > 0 else []
+        assert graph.supporters(item) == below
+        assert graph.support_area(item) == sum(
+            container._calculate_overlap_area((x, y, w, d), (b.position[0], b.position[1], b.dimensions[0], b.dimensions[1]))
+            for b in below)
+
+def test_rebuilt_graph_after_removals_matches_fresh_graph():
+    container, _ = packed_container(7, count=50)
+    container._get_contact_graph()
+    del container.items[len(container.items) // 2:]
+    graph = container._get_contact_graph()
+
+    fresh = ContactGraph()
+    fresh.sync(list(container.items), container._get_items_near)
+    assert (graph.edge_count, graph.significant_edge_count) == (fresh.edge_count, fresh.significant_edge_count)
+    for item in container.items:
+        assert [(id(other), edge) for other, edge in graph.edges(item)] == \
+               [(id(other), edge) for other, edge in fresh.edges(item)]
@@ -0,0 +1,151 @@
+"""
+Snapshot, rollback and fork of container state, and the alternative arrangements branched from it
+"""
+import random
+
+import pytest
+from flask import Flask
+
+from optigenix_module.models.contact_graph import ContactGraph
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.metrics_accumulator import MetricsAccumulator
+from tests.helpers import CONTAINER_DIMS, item_batch
+
+def _state(container):
+    """Everything a rollback must restore, in comparable form"""
+    return {
+        'items': [(id(item), item.position, item.dimensions) for item in container.items],
+        'spaces': [(s.x, s.y, s.z, s.width, s.depth, s.height, getattr(s, 'temperature_safe', False))
+                   for s in container.spaces],
+        'unpacked': sorted(container.unpacked_reasons),
+        'weight_distribution': dict(container.weight_distribution),
+        'metrics': (container.volume_utilization, container.total_weight, container.remaining_volume,
+                    container.center_of_gravity),
+    }
+
+def _assert_indexes_match_items(container):
+    """The derived indexes agree with indexes rebuilt from the item list"""
+    items = list(container.items)
+    index = container._get_spatial_index()
+    assert index._items == items
+    for item in items:
+        near = index.query(*item.position, *item.dimensions, margin=0.001)
+        assert item in near
+
+    graph = container._get_contact_graph()
+    fresh = ContactGraph()
+    fresh.sync(items, container._get_items_near)
+    assert (graph.edge_count, graph.significant_edge_count) == (fresh.edge_count, fresh.significant_edge_count)
+    for item in items:
+        assert [(id(other), edge) for other, edge in graph.edges(item)] == \
+               [(id(other), edge) for other, edge in fresh.edges(item)]
+
+    totals = container._get_metrics()
+    rebuilt = MetricsAccumulator(container.dimensions)
+    rebuilt.sync(items)
+    assert (totals.packed_volume, totals.total_weight, totals.moments) == \
+           (rebuilt.packed_volume, rebuilt.total_weight, rebuilt.moments)
+    assert totals.weight_map.ravel().tolist() == pytest.approx(rebuilt.weight_map.ravel().tolist())
+
+def _assert_valid_arrangement(container, expected_count):
+    """Unique, non-overlapping items inside the container, every item packed or unpacked once"""
+    assert len({id(item) for item in container.items}) == len(container.items)
+    assert len({item.name for item in container.items}) == len(container.items)
+    assert len(container.items) + len(container.unpacked_reasons) == expected_count
+    assert not {item.name for item in container.items} & set(container.unpacked_reasons)
+    boxes = [(*item.position, *item.dimensions) for item in container.items]
+    for x, y, z, w, d, h in boxes:
+        assert min(x, y, z) >= -1e-9
+        assert x + w <= CONTAINER_DIMS[0] + 1e-9 and y + d <= CONTAINER_DIMS[1] + 1e-9
+        assert z + h <= CONTAINER_DIMS[2] + 1e-9
+    for i, first in enumerate(boxes):
+        for second in boxes[i + 1:]:
+            assert not container._check_overlap_3d(first, second)
+    volume = sum(w * d * h for _, _, _, w, d, h in boxes)
+    assert container.volume_utilization == pytest.approx(volume / (CONTAINER_DIMS[0] * CONTAINER_DIMS[1] * CONTAINER_DIMS[2]))
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_rollback_restores_state(seed):
+    rng = random.Random(seed)
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.pack_items(item_batch(rng, 25, 'first'))
+    before = _state(container)
+    snapshot = container.snapshot()
+
+    container.pack_items(item_batch(rng, 25, 'second'))
+    assert len(container.items) > len(before['items'])
+    _assert_indexes_match_items(container)
+
+    container.rollback(snapshot)
+    assert _state(container) == before
+    _assert_indexes_match_items(container)
+
+def test_fork_is_independent():
+    rng = random.Random(3)
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.pack_items(item_batch(rng, 20, 'first'))
+    snapshot = container.snapshot()
+    before = _state(container)
+
+    fork = container.fork(snapshot)
+    assert _state(fork) == before
+    fork.pack_items(item_batch(rng, 20, 'second'))
+    assert len(fork.items) > len(container.items)
+    _assert_indexes_match_items(fork)
+
+    # The shared indexes follow whichever container queries them
+    assert _state(container) == before
+    _assert_indexes_match_items(container)
+    _assert_indexes_match_items(fork)
+
+def _two_batch_container(seed):
+    rng = random.Random(seed)
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.pack_items(item_batch(rng, 40, 'first'))
+    container.pack_items(item_batch(rng, 20, 'second'))
+    return container, rng
+
+@pytest.mark.parametrize("seed", [7, 8])
+def test_arrangements_after_several_batches(seed):
+    container, _ = _two_batch_container(seed)
+    total = len(container.items) + len(container.unpacked_reasons)
+    before = _state(container)
+
+    arrangements = container.generate_multiple_arrangements(3)
+    assert len(arrangements) == 3
+    for alternative, score in arrangements:
+        _assert_valid_arrangement(alternative, total)
+        assert 0.0 <= score <= 1.0
+    assert _state(container) == before
+
+def test_arrangements_after_rollback():
+    container, rng = _two_batch_container(9)
+    snapshot = container.snapshot()
+    container.pack_items(item_batch(rng, 20, 'third'))
+    container.rollback(snapshot)
+    total = len(container.items) + len(container.unpacked_reasons)
+
+    for alternative, _ in container.generate_multiple_arrangements(5):
+        _assert_valid_arrangement(alternative, total)
+
+def test_generate_alternative_plan_route():
+    from modules import handlers
+
+    container, _ = _two_batch_container(10)
+    total = len(container.items) + len(container.unpacked_reasons)
+    app = Flask(__name__)
+    saved = handlers.container_storage.current_container
+    handlers.container_storage.current_container = container
+    try:
+        with app.app_context():
+            response = handlers.generate_alternative_plan_handler().get_json()
+    finally:
+        handlers.container_storage.current_container = saved
+
+    assert response['success']
+    assert len(response['alternatives']) == 5
+    scores = [alternative['score'] for alternative in response['alternatives']]
+    assert scores == sorted(scores, reverse=True)
+    for alternative in response['alternatives']:
+        assert alternative['items_packed'] + alternative['items_unpacked'] == total
+        assert 0.0 < alternative['volume_utilization'] <= 100.0
@@ -0,0 +1,73 @@
+"""
+Soundness of the fitness bounds behind early abort, and what aborted evaluations may not leave behind
+"""
+import time
+
+import pytest
+
+from optigenix_module.optimization.local_search import LocalSearch
+from optigenix_module.optimization.packer import PackingGenome
+from tests.helpers import ga_items, ga_packer, random_genomes
+
+VOLUME_HEAVY_WEIGHTS = {
+    'volume_utilization_weight': 0.7,
+    'items_packed_ratio_weight': 0.2,
+    'stability_score_weight': 0.1,
+    'contact_ratio_weight': 0.0,
+    'weight_balance_weight': 0.0,
+    'temperature_constraint_weight': 0.0,
+}
+
+def _copy(items, genome):
+    return PackingGenome.from_compact(items, *genome.to_compact())
+
+@pytest.mark.parametrize("copies", [2, 6])
+@pytest.mark.parametrize("weights", [None, VOLUME_HEAVY_WEIGHTS])
+def test_bound_is_never_below_true_fitness(copies, weights):
+    items = ga_items(copies, types=10, copies=copies)
+    packer = ga_packer(items, workers=1)
+    if weights:
+        packer.fitness_weights = dict(weights)
+    aborted = {'decode': 0, 'tier': 0}
+    for genome in random_genomes(items, 8, seed=copies):
+        true_fitness = packer._evaluate_fitness(_copy(items, genome), record_prefixes=False)
+        for threshold in (true_fitness - 0.05, true_fitness, true_fitness + 1e-6, true_fitness + 0.05, 0.99):
+            candidate = _copy(items, genome)
+            fitness = packer._evaluate_fitness(candidate, record_prefixes=False, abort_below=threshold)
+            if candidate.metrics.get('incomplete'):
+                aborted['tier' if 'metric_tier' in candidate.metrics else 'decode'] += 1
+                assert fitness < threshold
+                assert fitness >= true_fitness - 1e-12, (threshold, fitness, true_fitness)
+            else:
+                assert fitness == true_fitness
+    assert sum(aborted.values()) > 0
+    if copies == 6:
+        assert aborted['decode'] > 0  # Items fail to fit, so decodes abort before finishing
+
+def test_aborted_evaluations_are_not_cached():
+    items = ga_items(3, types=10, copies=6)
+    packer = ga_packer(items, workers=1, early_abort=True)
+    population = random_genomes(items, 12, seed=3)
+    packer._evaluate_population(population[:4])
+    packer._abort_below = max(genome.fitness for genome in population[:4])
+    packer._evaluate_population(population)
+
+    assert any(genome.metrics.get('incomplete') for genome in population)
+    assert not any(genome.metrics.get('incomplete') for genome in population[:4])  # Served from the cache
+    cached = list(packer.fitness_cache._entries.values())
+    assert len(cached) == sum(not genome.metrics.get('incomplete') for genome in population)
+    assert not any(metrics.get('incomplete') for _, metrics in cached)
+    assert not any(hasattr(genome, 'incomplete') for genome in population)
+
+def test_local_search_does_not_cache_aborted_neighbours():
+    items = ga_items(4, types=6, copies=4)
+    packer = ga_packer(items, workers=1, early_abort=True)
+    genome = random_genomes(items, 1, seed=4)[0]
+    fitness = packer._evaluate_fitness(genome)
+
+    search = LocalSearch(packer, items)
+    search.run(genome, time.monotonic() + 3)
+    assert search.stats['neighbours'] > 0
+    assert len(packer.fitness_cache) > 0
+    assert not any(metrics.get('incomplete') for _, metrics in packer.fitness_cache._entries.values())
+    assert search.stats['final_fitness'] >= fitness
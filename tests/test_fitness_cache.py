@@ -0,0 +1,69 @@
+"""
+Fitness memoization: LRU eviction, hit/miss counters and keys that follow the fitness weights
+"""
+import numpy as np
+
+from optigenix_module.optimization.fitness_cache import FitnessCache, genome_fingerprint
+from optigenix_module.optimization.packer import PackingGenome
+from tests.helpers import ga_items, ga_packer, random_genomes
+
+WEIGHTS = {'volume_utilization_weight': 0.7, 'items_packed_ratio_weight': 0.3}
+
+def _key(index, weights=WEIGHTS):
+    return genome_fingerprint(np.array([index, 1, 2], dtype=np.int32), np.zeros(3, dtype=np.int8), weights)
+
+def test_least_recently_used_entry_is_evicted_at_capacity():
+    cache = FitnessCache(max_size=3)
+    for index in range(3):
+        cache.put(_key(index), index / 10, {'volume_utilization': index / 10})
+    assert cache.get(_key(0)) == (0.0, {'volume_utilization': 0.0})  # Now the most recently used
+    cache.put(_key(3), 0.3, {})
+    assert len(cache) == 3
+    assert cache.get(_key(1)) is None
+    assert [cache.get(_key(index))[0] for index in (0, 2, 3)] == [0.0, 0.2, 0.3]
+
+    # Overwriting an entry does not evict another
+    cache.put(_key(2), 0.25, {})
+    assert len(cache) == 3 and cache.get(_key(2))[0] == 0.25
+
+def test_hit_and_miss_counters():
+    cache = FitnessCache(max_size=2)
+    assert cache.get(_key(0)) is None
+    cache.put(_key(0), 0.5, {})
+    cache.get(_key(0))
+    cache.get(_key(0))
+    cache.get(_key(1))
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'hit_rate': 0.5, 'size': 1, 'max_size': 2}
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'size': 0, 'max_size': 2}
+
+def test_disabled_cache_stores_nothing():
+    cache = FitnessCache(max_size=0)
+    cache.put(_key(0), 0.5, {})
+    assert len(cache) == 0 and cache.get(_key(0)) is None
+
+def test_fingerprint_follows_genome_and_weights():
+    assert _key(0) == _key(0, dict(reversed(list(WEIGHTS.items()))))
+    assert _key(0) != _key(1)
+    assert _key(0) != _key(0, {**WEIGHTS, 'volume_utilization_weight': 0.6})
+    assert _key(0) != genome_fingerprint(np.array([0, 1, 2], dtype=np.int32), np.array([0, 0, 1], dtype=np.int8),
+                                         WEIGHTS)
+
+def test_population_misses_after_a_weight_change():
+    items = ga_items(1)
+    packer = ga_packer(items, workers=1)
+    population = random_genomes(items, 6, seed=1)
+    packer._evaluate_population(population)
+    assert packer.fitness_cache.stats()['misses'] == 6 and len(packer.fitness_cache) == 6
+
+    copies = [PackingGenome.from_compact(items, *genome.to_compact()) for genome in population]
+    packer._evaluate_population(copies)
+    assert packer.fitness_cache.stats()['hits'] == 6
+    assert [genome.fitness for genome in copies] == [genome.fitness for genome in population]
+
+    packer.fitness_weights = {**packer.fitness_weights, 'volume_utilization_weight': 0.9}
+    reweighted = [PackingGenome.from_compact(items, *genome.to_compact()) for genome in population]
+    packer._evaluate_population(reweighted)
+    stats = packer.fitness_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (6, 12, 12)
+    assert all(new.fitness > old.fitness for new, old in zip(reweighted, population))
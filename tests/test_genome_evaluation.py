@@ -0,0 +1,66 @@
+"""
+Invariants of GA genome evaluation: every shortcut gives the fitness of a plain decode
+"""
+import numpy as np
+import pytest
+
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+from tests.helpers import GA_CONTAINER_DIMS, ga_items, ga_packer, random_genomes
+
+def _fresh_fitness(items, genome):
+    """Fitness and metrics of a genome decoded from scratch by a new serial packer"""
+    packer = ga_packer(items, workers=1)
+    copy = PackingGenome.from_compact(items, *genome.to_compact())
+    fitness = packer._evaluate_fitness(copy, record_prefixes=False)
+    return fitness, copy.metrics
+
+def test_parallel_evaluation_matches_serial():
+    items = ga_items(1)
+    serial = random_genomes(items, 10, seed=2)
+    parallel = [PackingGenome.from_compact(items, *genome.to_compact()) for genome in serial]
+
+    ga_packer(items, workers=1, population_size=10)._evaluate_population(serial)
+    packer = ga_packer(items, workers=2, population_size=10)
+    executor = packer._create_evaluation_pool(items)
+    assert executor is not None
+    try:
+        packer._evaluate_population(parallel, executor)
+    finally:
+        executor.shutdown()
+
+    assert len({genome.fitness for genome in serial}) > 1
+    assert [genome.fitness for genome in parallel] == [genome.fitness for genome in serial]
+    assert [genome.metrics for genome in parallel] == [genome.metrics for genome in serial]
+
+@pytest.mark.parametrize("seed", [3, 4])
+def test_trie_resumed_decode_matches_fresh_decode(seed):
+    items = ga_items(seed)
+    rng = np.random.default_rng(seed)
+    packer = ga_packer(items, workers=1)
+    for base in random_genomes(items, 3, seed):
+        order, rotation_flags = base.to_compact()
+        for _ in range(6):
+            # Variants differ from their parent in one rotation, so they share a decode prefix with it
+            flags = rotation_flags.copy()
+            flags[rng.integers(len(items))] = rng.integers(6)
+            genome = PackingGenome.from_compact(items, order, flags)
+            fitness = packer._evaluate_fitness(genome)
+            assert (fitness, genome.metrics) == _fresh_fitness(items, genome)
+    assert packer.decode_trie.stats()['resumed_steps'] > 0
+
+def test_canonical_genome_keeps_its_fitness():
+    items = ga_items(5)
+    item_types = ga_packer(items)._item_types
+    rewritten = 0
+    for genome in random_genomes(items, 8, seed=6):
+        canonical = PackingGenome.from_compact(items, genome.order.copy(), genome.rotation_flags.copy())
+        canonical.canonicalize(item_types)
+        rewritten += not (np.array_equal(canonical.order, genome.order) and
+                          np.array_equal(canonical.rotation_flags, genome.rotation_flags))
+        assert _fresh_fitness(items, canonical) == _fresh_fitness(items, genome)
+    assert rewritten > 0
+
+@pytest.mark.parametrize("cores, requested, expected", [(1, 3, 1), (2, 3, 2), (4, 3, 3), (None, 2, 1)])
+def test_islands_are_capped_at_cpu_cores(monkeypatch, cores, requested, expected):
+    monkeypatch.setattr("os.cpu_count", lambda: cores)
+    assert GeneticPacker(GA_CONTAINER_DIMS, islands=requested, llm_budget=0).islands == expected
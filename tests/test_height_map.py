@@ -0,0 +1,114 @@
+"""
+Equivalence tests between height-map support queries and the exact item scans
+"""
+import random
+
+import pytest
+
+from modules.stability import calculate_support_score
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.item import Item
+from tests.helpers import CONTAINER_DIMS, probe_item, random_items
+
+def _place(container, name, position, dims, **kwargs):
+    """Place an item at a fixed position, bypassing the packing heuristics"""
+    item = Item(name, *dims, kwargs.get('weight', 10), 1, kwargs.get('fragility', 'LOW'),
+                kwargs.get('stackable', True), 'CARTON', 'NO', load_bearing=kwargs.get('load_bearing', 0))
+    item.position = position
+    container.items.append(item)
+    return item
+
+def _queries(container, rng, count=300):
+    """Footprints on top of, across and beside the placed items, near their top heights"""
+    tops = sorted({round(item.position[2] + item.dimensions[2], 6) for item in container.items})
+    queries = []
+    for _ in range(count):
+        item = rng.choice(container.items)
+        x, y, _ = item.position
+        w, d, h = item.dimensions
+        z = rng.choice([item.position[2] + h, rng.choice(tops), rng.choice(tops) + rng.uniform(-0.0015, 0.0015)])
+        qx = rng.choice([x, x + rng.uniform(-0.3, w), round(rng.uniform(0, CONTAINER_DIMS[0]), 2)])
+        qy = rng.choice([y, y + rng.uniform(-0.3, d), round(rng.uniform(0, CONTAINER_DIMS[1]), 2)])
+        qw = rng.choice([w, rng.uniform(0.02, 1.2), 0.01])
+        qd = rng.choice([d, rng.uniform(0.02, 1.0), 0.01])
+        queries.append(((max(0.0, qx), max(0.0, qy), z), (qw, qd)))
+    return queries
+
+def _exact_and_mapped(container, call):
+    """Result of a query without and with the height map"""
+    height_map = container.height_map
+    container.height_map = None
+    exact = call()
+    container.height_map = height_map
+    return exact, call()
+
+def _packed_with_height_map(seed):
+    rng = random.Random(seed)
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.use_placement_kernel = False
+    items = random_items(rng, 60)
+    for item in items:
+        # Few distinct heights, so many tops are shared
+        item.dimensions = (item.dimensions[0], item.dimensions[1], rng.choice([0.3, 0.45, 0.6]))
+        item.original_dims = item.dimensions
+    container.pack_items(items)
+    container.enable_height_map(resolution=rng.choice([0.05, 0.1]))
+    return container, rng
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_items_below_matches_exact_scan(seed):
+    container, rng = _packed_with_height_map(seed)
+    answered = 0
+    for (x, y, z), (w, d) in _queries(container, rng):
+        container.height_map.sync(container.items)
+        mapped = container.height_map.items_below(x, y, z, w, d)
+        exact, via_map = _exact_and_mapped(container, lambda: container._get_items_below((x, y, z), (w, d)))
+        assert via_map == exact, ((x, y, z), (w, d))
+        if mapped is not None:
+            answered += 1
+            assert [item for item in mapped if item in exact] == exact, ((x, y, z), (w, d))
+    assert answered > 0
+
+@pytest.mark.parametrize("seed", [5, 6])
+def test_support_checks_match_exact_scan(seed):
+    container, rng = _packed_with_height_map(seed)
+    probe = probe_item(rng)
+    for (x, y, z), (w, d) in _queries(container, rng, count=150):
+        probe.fragility = rng.choice(['LOW', 'HIGH'])
+        dims = (w, d, probe.dimensions[2])
+        pos = (x, y, z)
+        for call in (lambda: container._check_stackability(probe, pos),
+                     lambda: container._is_valid_placement(probe, pos, dims),
+                     lambda: container._calculate_stability_score(probe, pos, dims)):
+            exact, via_map = _exact_and_mapped(container, call)
+            assert via_map == exact, (pos, dims)
+        probe.position, probe.dimensions = pos, dims
+        exact, via_map = _exact_and_mapped(container, lambda: calculate_support_score(container, probe))
+        assert via_map == exact, (pos, dims)
+        probe.position = None
+
+def test_same_height_item_in_shared_cells_is_found():
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.enable_height_map(resolution=0.05)
+    _place(container, "wide", (0.0, 0.0, 0.0), (0.52, 0.5, 0.4))
+    # Same top, and every cell it covers is shared with the wide item
+    fragile = _place(container, "fragile", (0.52, 0.0, 0.0), (0.02, 0.04, 0.4), fragility='HIGH', stackable=False)
+    probe = Item("probe", 0.3, 0.3, 0.2, 5, 1, 'LOW', True, 'CARTON', 'NO')
+
+    pos = (0.4, 0.0, 0.4)
+    assert fragile in container._get_items_below(pos, (0.3, 0.3))
+    assert not container._check_stackability(probe, pos)
+    assert not container._is_valid_placement(probe, pos, probe.dimensions)
+
+def test_rollback_restores_height_map():
+    container, rng = _packed_with_height_map(7)
+    container.height_map.sync(container.items)
+    before = (container.height_map.heights.copy(), container.height_map.top_ids.copy(),
+              container.height_map.top_counts.copy())
+    snapshot = container.snapshot()
+    _place(container, "extra", (0.0, 0.0, 2.0), (0.5, 0.5, 0.3))
+    container.height_map.sync(container.items)
+    container.rollback(snapshot)
+    container.height_map.sync(container.items)
+    after = (container.height_map.heights, container.height_map.top_ids, container.height_map.top_counts)
+    assert all((a == b).all() for a, b in zip(before, after))
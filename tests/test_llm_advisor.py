@@ -0,0 +1,102 @@
+"""
+Background LLM requests: latency budget, timeouts, errors and late arrivals
+"""
+import json
+import time
+
+import pytest
+
+from optigenix_module.optimization import packer as packer_module
+from optigenix_module.optimization.llm_advisor import LLMAdvisor
+from optigenix_module.utils.llm_connector import StubLLMClient
+from tests.helpers import ga_items, ga_packer, random_genomes
+
+PROMPT = "Stagnation: 9\nFitness variance: 0.001"
+
+def _fail(prompt):
+    raise RuntimeError("LLM unavailable")
+
+def test_response_within_budget_is_applied():
+    advisor = LLMAdvisor(budget=2.0)
+    assert advisor.submit('mutation_strategy', StubLLMClient(delay=0.05).get_llm_completion, PROMPT)
+    response = advisor.collect('mutation_strategy', wait=True)
+    assert json.loads(response)['operation_focus'] == 'aggressive'
+    advisor.record('mutation_strategy', applied=True)
+    stats = advisor.stats()['mutation_strategy']
+    assert (stats['requests'], stats['applied'], stats['ignored'], stats['timeouts'], stats['errors']) == (1, 1, 0, 0, 0)
+    assert 0.05 <= stats['mean_latency'] < 2.0
+    assert advisor.collect('mutation_strategy') is None  # Taken
+    advisor.shutdown()
+
+def test_pending_request_is_not_collected_or_resubmitted():
+    advisor = LLMAdvisor(budget=2.0)
+    client = StubLLMClient(delay=0.3)
+    assert advisor.submit('mutation_strategy', client.get_llm_completion, PROMPT)
+    assert not advisor.submit('mutation_strategy', client.get_llm_completion, PROMPT)
+    assert advisor.collect('mutation_strategy') is None  # Still within budget
+    assert advisor.collect('mutation_strategy', wait=True) is not None
+    assert advisor.stats()['mutation_strategy']['requests'] == 1
+    advisor.shutdown()
+
+def test_slow_response_times_out():
+    advisor = LLMAdvisor(budget=0.1)
+    advisor.submit('fitness_weights', StubLLMClient(delay=1.0).get_llm_completion, PROMPT)
+    started = time.monotonic()
+    assert advisor.collect('fitness_weights', wait=True) is None
+    assert time.monotonic() - started < 0.5
+    stats = advisor.stats()['fitness_weights']
+    assert (stats['timeouts'], stats['ignored'], stats['applied']) == (1, 1, 0)
+    assert advisor.collect('fitness_weights') is None  # Dropped, never used
+    advisor.shutdown()
+
+def test_late_arrival_is_ignored():
+    advisor = LLMAdvisor(budget=0.1)
+    advisor.submit('fitness_weights', StubLLMClient(delay=0.2).get_llm_completion, PROMPT)
+    time.sleep(0.4)  # Finished, but after its budget
+    assert advisor.collect('fitness_weights') is None
+    stats = advisor.stats()['fitness_weights']
+    assert (stats['timeouts'], stats['ignored']) == (1, 1)
+    assert stats['max_latency'] > 0.1
+    advisor.shutdown()
+
+def test_failed_request_counts_an_error():
+    advisor = LLMAdvisor(budget=1.0)
+    advisor.submit('mutation_strategy', _fail, PROMPT)
+    assert advisor.collect('mutation_strategy', wait=True) is None
+    stats = advisor.stats()['mutation_strategy']
+    assert (stats['errors'], stats['ignored'], stats['timeouts']) == (1, 1, 0)
+    advisor.shutdown()
+
+def test_shutdown_does_not_wait_for_running_requests():
+    advisor = LLMAdvisor(budget=5.0)
+    advisor.submit('mutation_strategy', StubLLMClient(delay=2.0).get_llm_completion, PROMPT)
+    started = time.monotonic()
+    advisor.shutdown()
+    assert time.monotonic() - started < 0.5
+    assert advisor.stats()['mutation_strategy']['ignored'] == 1
+    assert advisor.collect('mutation_strategy') is None
+
+@pytest.mark.parametrize("delay, applied", [(0.0, True), (1.0, False)])
+def test_ga_uses_advice_only_within_budget(monkeypatch, delay, applied):
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    monkeypatch.setattr(packer_module, 'llm_client', StubLLMClient(delay=delay))
+    items = ga_items(1)
+    packer = ga_packer(items, workers=1)
+    packer._llm_advisor = LLMAdvisor(budget=0.2)
+    population = random_genomes(items, 6, seed=1)
+    for index, genome in enumerate(population):
+        genome.fitness = 0.5 + index * 1e-4
+    aggressive = packer._get_aggressive_mutation_strategy(6)
+
+    # Nothing has been asked yet, so the built-in strategy is used while the LLM works
+    assert packer._advise_mutation_strategy(5, population, 6) == aggressive
+    time.sleep(0.3)
+    strategy = packer._advise_mutation_strategy(6, population, 6)
+    stats = packer._llm_advisor.stats()['mutation_strategy']
+    if applied:
+        assert strategy['explanation'] == "Stub strategy: stagnation, moving groups of items"
+        assert stats['applied'] == 1 and stats['timeouts'] == 0
+    else:
+        assert strategy == aggressive
+        assert stats['timeouts'] == 1 and stats['applied'] == 0
+    packer._llm_advisor.shutdown()
@@ -0,0 +1,145 @@
+"""
+LLM response cache and the GA's LLM requests answered by the local stub client
+"""
+import json
+
+import pytest
+
+from optigenix_module.optimization import packer as packer_module
+from optigenix_module.optimization.packer import GeneticPacker
+from optigenix_module.utils import llm_cache, llm_connector
+from optigenix_module.utils.llm_cache import LLMResponseCache
+from tests.helpers import ga_items, ga_packer, random_genomes
+
+class _Clock:
+    """Stand-in for the time module with a settable time"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(llm_cache, 'time', clock)
+    return clock
+
+@pytest.fixture
+def stub_client(monkeypatch, tmp_path):
+    """LLM_PROVIDER=stub client shared by the GA, with a response cache in a temporary directory"""
+    monkeypatch.setenv("LLM_PROVIDER", "stub")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setattr(llm_connector, '_GLOBAL_CLIENT_INSTANCE', None)
+    monkeypatch.setattr(llm_cache, '_GLOBAL_CACHE_INSTANCE', None)
+    monkeypatch.setattr(packer_module, 'llm_client', None)
+    client = packer_module._get_llm_client()
+    yield client
+    llm_cache.get_llm_cache().close()
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMResponseCache(path, ttl=60)
+    cache.put("key", "template", "response")
+    clock.now += 30
+    assert cache.get("key") == "response"
+
+    # A new process reads the entry from the database until it expires
+    reopened = LLMResponseCache(path, ttl=60)
+    assert reopened.get("key") == "response"
+    clock.now += 31
+    assert cache.get("key") is None
+    assert LLMResponseCache(path, ttl=60).get("key") is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMResponseCache(path, max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.put(key, "template", key.upper())
+        clock.now += 1
+    assert cache.get("a") == "A"
+    clock.now += 1
+    cache.put("d", "template", "D")
+
+    for reader in (cache, LLMResponseCache(path, max_entries=3)):
+        assert [reader.get(key) for key in ("a", "b", "c", "d")] == ["A", None, "C", "D"]
+
+def test_unavailable_database_falls_back_to_memory(tmp_path, clock):
+    cache = LLMResponseCache(str(tmp_path / "missing" / "cache.sqlite3"), max_entries=2)
+    assert cache.get("a") is None
+    assert not cache.stats()['persistent']
+    for key in ("a", "b", "c"):
+        cache.put(key, "template", key.upper())
+    assert [cache.get(key) for key in ("a", "b", "c")] == [None, "B", "C"]
+
+    memory_only = LLMResponseCache(None)
+    memory_only.put("a", "template", "A")
+    assert memory_only.get("a") == "A" and not memory_only.stats()['persistent']
+
+def test_stub_client_is_selected_by_provider(stub_client):
+    assert isinstance(stub_client, llm_connector.StubLLMClient)
+    assert llm_connector.get_llm_client() is stub_client
+
+def test_stub_answers_ga_requests_through_the_cache(stub_client):
+    items = ga_items(1)
+    packer = ga_packer(items, workers=1)
+    population = random_genomes(items, 6, seed=1)
+    for index, genome in enumerate(population):
+        genome.fitness = 0.5 + index * 1e-4
+
+    calls = []
+    request = stub_client._request
+    stub_client._request = lambda prompt, *args, **kwargs: calls.append(prompt) or request(prompt, *args, **kwargs)
+    first = packer._get_adaptive_mutation_strategy(10, population, 9)
+    second = packer._get_adaptive_mutation_strategy(20, population, 9)
+    assert first == second == {"mutation_rate_modifier": 0.2, "operation_focus": "aggressive",
+                               "explanation": "Stub strategy: critical stagnation"}
+    assert len(calls) == 1
+    assert llm_cache.get_llm_cache().stats()['hits'] == 1
+
+    metrics = {'volume_utilization': 0.6, 'stability_score': 0.9, 'contact_ratio': 0.2,
+               'weight_balance': 0.8, 'items_packed_ratio': 0.95}
+    weights = packer._get_dynamic_fitness_weights(10, population, metrics)
+    assert weights is not None
+    assert weights['contact_ratio_weight'] > packer._get_default_fitness_weights()['contact_ratio_weight']
+    assert sum(value for key, value in weights.items() if key.endswith('_weight')) == pytest.approx(1.0, abs=1e-3)
+
+def test_failed_and_unusable_responses_are_not_cached(stub_client):
+    items = ga_items(1)
+    packer = ga_packer(items, workers=1)
+    population = random_genomes(items, 6, seed=1)
+    for index, genome in enumerate(population):
+        genome.fitness = 0.5 + index * 1e-4
+    cache = llm_cache.get_llm_cache()
+
+    # A request that fails after its retries: the GA falls back to the aggressive strategy and asks again later
+    stub_client._request = lambda prompt, *args, **kwargs: None
+    assert stub_client.get_llm_completion("prompt") == ""
+    strategy = packer._get_adaptive_mutation_strategy(10, population, 9)
+    assert strategy == packer._get_aggressive_mutation_strategy(9)
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 0
+
+    # A mutation strategy where weights were asked for is never kept
+    stub_client._request = lambda prompt, *args, **kwargs: json.dumps(stub_client._get_fallback_strategy())
+    metrics = {'volume_utilization': 0.6}
+    assert packer._get_dynamic_fitness_weights(10, population, metrics) is None
+    del stub_client._request
+    assert packer._get_adaptive_mutation_strategy(20, population, 9)['explanation'] == "Stub strategy: critical stagnation"
+    assert packer._get_dynamic_fitness_weights(20, population, metrics) is not None
+    assert cache.stats()['hits'] == 0
+
+@pytest.mark.parametrize("kind, response, usable", [
+    ('mutation_strategy', '{"mutation_rate_modifier": 0.1, "operation_focus": "swap"}', True),
+    ('mutation_strategy', '{"volume_utilization_weight": 1.0}', False),
+    ('fitness_weights', '{"volume_utilization_weight": 0.6, "stability_score_weight": 0.4}', True),
+    ('initial_weights', '{"mutation_rate_modifier": 0.1, "operation_focus": "swap"}', False),
+    ('fitness_weights', '{"volume_utilization_weight": 0}', False),
+    ('fitness_weights', '{"volume_utilization_weight": "high"}', False),
+    ('fitness_weights', '["volume_utilization_weight"]', False),
+    ('fitness_weights', 'not json', False),
+    ('fitness_weights', '', False),
+    ('fitness_weights', None, False),
+])
+def test_usable_llm_responses(kind, response, usable):
+    assert GeneticPacker._is_usable_llm_response(kind, response) == usable
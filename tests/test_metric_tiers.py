@@ -0,0 +1,83 @@
+"""
+Fitness metric tiers: configuration, skipped zero-weight metrics and the abort before an expensive tier
+"""
+import pytest
+
+from optigenix_module.optimization.packer import METRIC_TIERS, GeneticPacker, PackingGenome
+from tests.helpers import ga_items, ga_packer, random_genomes
+
+ALL_METRICS = [name for tier in METRIC_TIERS for name in tier]
+
+@pytest.mark.parametrize("metric_tiers", [
+    [['volume_utilization'], ['stability'], ['contact_ratio']],
+    "volume_utilization;stability",
+    [['volume_utilization', 'contact_ratio'], ['contact_ratio']],
+    "volume_utilization,volume_utilization",
+])
+def test_unknown_or_duplicate_metrics_are_rejected(metric_tiers):
+    with pytest.raises(ValueError):
+        GeneticPacker._parse_metric_tiers(metric_tiers)
+
+def test_unlisted_metrics_form_a_last_tier():
+    tiers = GeneticPacker._parse_metric_tiers(" stability_score ; volume_utilization, contact_ratio ;")
+    assert tiers[:2] == (('stability_score',), ('volume_utilization', 'contact_ratio'))
+    assert set(tiers[2]) == set(ALL_METRICS) - {'stability_score', 'volume_utilization', 'contact_ratio'}
+    assert len(tiers) == 3
+    assert GeneticPacker._parse_metric_tiers(METRIC_TIERS) == METRIC_TIERS
+    assert GeneticPacker._parse_metric_tiers([ALL_METRICS]) == (tuple(ALL_METRICS),)
+
+def test_zero_weight_metrics_are_skipped():
+    items = ga_items(1)
+    packer = ga_packer(items, workers=1)
+    packer.fitness_weights.update({'weight_balance_weight': 0.0, 'stability_score_weight': 0.0})
+    genomes = random_genomes(items, 3, seed=1)
+    for genome in genomes:
+        packer._evaluate_fitness(genome)
+        assert set(genome.metrics) == set(ALL_METRICS) - {'weight_balance', 'stability_score'}
+    # Zero-weight metrics of the first tier are still computed
+    assert packer.metric_profile['weight_capacity']['computed'] == 3
+    for name in ('weight_balance', 'stability_score'):
+        assert packer.metric_profile[name]['computed'] == 0
+        assert packer.metric_profile[name]['skipped'] == 3
+    assert packer.metric_profile['temperature_constraint']['computed'] == 3
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_abort_before_an_expensive_tier(seed):
+    items = ga_items(seed)
+    packer = ga_packer(items, workers=1)
+    genome = random_genomes(items, 1, seed=seed)[0]
+    reference = PackingGenome.from_compact(items, *genome.to_compact())
+    true_fitness = packer._evaluate_fitness(reference)
+    first_tier = {name: reference.metrics[name] for name in METRIC_TIERS[0]}
+    bound, _ = packer._metrics_upper_bound(first_tier)
+    assert true_fitness <= bound
+
+    packer.metric_profile = {}
+    fitness = packer._evaluate_fitness(genome, abort_below=bound + 1e-9)
+    assert fitness == pytest.approx(bound) and fitness >= true_fitness
+    assert genome.metrics['incomplete'] and genome.metrics['metric_tier'] == 1
+    assert genome.metrics['decode_progress'] == 1.0
+    assert {name: genome.metrics[name] for name in METRIC_TIERS[0]} == first_tier
+    for name in ALL_METRICS:
+        computed = name in METRIC_TIERS[0]
+        assert packer.metric_profile[name]['computed'] == computed
+        assert packer.metric_profile[name]['skipped'] == (not computed)
+
+    # Reaching the threshold does not abort
+    complete = PackingGenome.from_compact(items, *genome.to_compact())
+    assert packer._evaluate_fitness(complete, abort_below=true_fitness) == true_fitness
+    assert 'incomplete' not in complete.metrics
+
+@pytest.mark.parametrize("seed", [3, 4])
+def test_all_metrics_give_the_tiered_fitness(seed):
+    items = ga_items(seed)
+    packer = ga_packer(items, workers=1)
+    packer.fitness_weights.update({'contact_ratio_weight': 0.0, 'temperature_constraint_weight': 0.0,
+                                   'stability_score_weight': 0.0})
+    for genome in random_genomes(items, 4, seed):
+        full = PackingGenome.from_compact(items, *genome.to_compact())
+        tiered_fitness = packer._evaluate_fitness(genome)
+        assert packer._evaluate_fitness(full, all_metrics=True) == tiered_fitness
+        assert set(full.metrics) == set(ALL_METRICS)
+        assert set(genome.metrics) < set(full.metrics)
+        assert all(full.metrics[name] == value for name, value in genome.metrics.items())
@@ -0,0 +1,85 @@
+"""
+Equivalence tests between the running metric totals and full recomputation from the items
+"""
+import random
+
+import numpy as np
+import pytest
+
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.metrics_accumulator import MetricsAccumulator
+from tests.helpers import CONTAINER_DIMS, item_batch, packed_container
+
+def _recomputed(items, grid_shape=(10, 10)):
+    """Volume, weight, centre of gravity and weight map summed over the items from scratch"""
+    volume = weight = mx = my = mz = 0
+    weight_map = np.zeros(grid_shape)
+    rows, cols = grid_shape
+    for item in items:
+        x, y, z = item.position
+        w, d, h = item.dimensions
+        volume += w * d * h
+        weight += item.weight
+        mx += (x + w/2) * item.weight
+        my += (y + d/2) * item.weight
+        mz += (z + h/2) * item.weight
+        row = int((y / CONTAINER_DIMS[1]) * rows)
+        col = int((x / CONTAINER_DIMS[0]) * cols)
+        if 0 <= row < rows and 0 <= col < cols:
+            weight_map[row, col] += item.weight
+    cog = (mx/weight, my/weight, mz/weight) if weight else None
+    return volume, weight, cog, weight_map
+
+def _assert_matches_items(totals, items):
+    volume, weight, cog, weight_map = _recomputed(items)
+    assert totals.count == len(items)
+    assert (totals.packed_volume, totals.total_weight, totals.center_of_gravity()) == (volume, weight, cog)
+    assert totals.weight_map.ravel().tolist() == pytest.approx(weight_map.ravel().tolist())
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_totals_follow_item_list(seed):
+    container, rng = packed_container(seed, count=50)
+    placed = list(container.items)
+    items = []
+    totals = MetricsAccumulator(CONTAINER_DIMS)
+    for _ in range(60):
+        action = rng.random()
+        if action < 0.5 and len(items) < len(placed):
+            # Place the next few items
+            items.extend(placed[len(items):len(items) + rng.randint(1, 5)])
+        elif action < 0.8:
+            # Roll back to an earlier prefix
+            del items[rng.randint(0, len(items)):]
+        elif len(items) > 1:
+            # Switch to a reordered list, as a fork does, so the totals are replayed from the first differing item
+            items = list(items)
+            i, j = sorted(rng.sample(range(len(items)), 2))
+            items[i], items[j] = items[j], items[i]
+        totals.sync(items)
+        _assert_matches_items(totals, items)
+
+        probe = rng.choice(placed)
+        _, _, cog, _ = _recomputed(items + [probe])
+        assert totals.center_of_gravity_with(probe.position, probe.dimensions, probe.weight) == pytest.approx(cog)
+
+@pytest.mark.parametrize("seed", [4, 5])
+def test_container_metrics_after_place_and_rollback(seed):
+    rng = random.Random(seed)
+    container = EnhancedContainer(CONTAINER_DIMS)
+    snapshots = []
+    for batch in range(3):
+        snapshots.append(container.snapshot())
+        container.pack_items(item_batch(rng, 20, f"batch{batch}"))
+        _assert_matches_items(container._get_metrics(), container.items)
+        volume, weight, cog, weight_map = _recomputed(container.items)
+        assert container.total_weight == weight
+        assert container.volume_utilization == pytest.approx(volume / np.prod(CONTAINER_DIMS))
+        assert tuple(container.center_of_gravity) == pytest.approx(cog)
+        assert container.weight_map.ravel().tolist() == pytest.approx(weight_map.ravel().tolist())
+
+    for snapshot in reversed(snapshots):
+        container.rollback(snapshot)
+        _assert_matches_items(container._get_metrics(), container.items)
+        volume, weight, _, _ = _recomputed(container.items)
+        assert (container.total_weight, container.remaining_volume) == \
+               pytest.approx((weight, np.prod(CONTAINER_DIMS) - volume))
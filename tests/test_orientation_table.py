@@ -0,0 +1,72 @@
+"""
+Orientation table: every listed orientation fits, is distinct and respects fragility
+"""
+import itertools
+import random
+
+import pytest
+
+from optigenix_module.models.orientation_table import ROTATION_PERMUTATIONS, OrientationTable
+from tests.helpers import CONTAINER_DIMS
+
+SHAPES = [
+    (1.0, 0.5, 0.3),
+    (0.4, 0.4, 0.4),     # Cube: a single orientation
+    (0.6, 0.6, 0.2),     # Square face
+    (0.3, 0.8, 0.3),
+    (5.0, 0.5, 0.5),     # Fits only lying along the length
+    (3.0, 2.5, 0.2),     # Too wide to lie across the width
+    (7.0, 1.0, 1.0),     # Longer than the container
+]
+
+def _random_shapes(seed, count=200):
+    rng = random.Random(seed)
+    return [tuple(round(rng.uniform(0.1, 3.0), rng.choice([1, 2])) for _ in range(3)) for _ in range(count)]
+
+def _fits(dims):
+    return all(d <= max_d for d, max_d in zip(dims, CONTAINER_DIMS))
+
+@pytest.mark.parametrize("fragile", [False, True])
+def test_orientations_fit_are_distinct_and_keep_fragile_items_upright(fragile):
+    table = OrientationTable(CONTAINER_DIMS)
+    for dims in SHAPES + _random_shapes(1):
+        orientations = table.orientations(dims, fragile)
+        assert len(set(orientations)) == len(orientations)
+        for rotated in orientations:
+            assert sorted(rotated) == sorted(dims)
+            assert _fits(rotated)
+            if fragile:
+                assert rotated[2] <= dims[2]
+        # Nothing valid is left out, and the order follows the rotation flags
+        expected = []
+        for permutation in ROTATION_PERMUTATIONS:
+            rotated = tuple(dims[axis] for axis in permutation)
+            if rotated not in expected and _fits(rotated) and (not fragile or rotated[2] <= dims[2]):
+                expected.append(rotated)
+        assert list(orientations) == expected
+
+def test_known_shapes():
+    table = OrientationTable(CONTAINER_DIMS)
+    assert table.orientations((0.4, 0.4, 0.4)) == ((0.4, 0.4, 0.4),)
+    assert len(table.orientations((0.6, 0.6, 0.2))) == 3
+    assert len(table.orientations((1.0, 0.5, 0.3))) == 6
+    assert table.orientations((1.0, 0.5, 0.3), fragile=True) == ((1.0, 0.5, 0.3), (0.5, 1.0, 0.3))
+    assert all(rotated[0] == 5.0 for rotated in table.orientations((5.0, 0.5, 0.5)))
+    assert table.orientations((7.0, 1.0, 1.0)) == ()
+
+def test_select_wraps_the_gene_and_reports_no_fit():
+    table = OrientationTable(CONTAINER_DIMS)
+    dims = (0.6, 0.6, 0.2)
+    orientations = table.orientations(dims)
+    assert [table.select(dims, False, gene) for gene in range(6)] == list(itertools.islice(
+        itertools.cycle(orientations), 6))
+    assert table.select((7.0, 1.0, 1.0), False, 3) is None
+    # Fragile items only ever get an upright orientation, whatever the gene
+    assert all(table.select((1.0, 0.5, 0.3), True, gene)[2] == 0.3 for gene in range(6))
+
+def test_table_is_memoized_per_shape_and_fragility():
+    table = OrientationTable(CONTAINER_DIMS)
+    first = table.orientations([1.0, 0.5, 0.3])
+    assert table.orientations((1.0, 0.5, 0.3)) is first
+    table.orientations((1.0, 0.5, 0.3), fragile=True)
+    assert len(table) == 2
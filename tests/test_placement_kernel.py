@@ -0,0 +1,99 @@
+"""
+Equivalence tests between the batched placement kernel and the scalar reference checks
+"""
+import random
+
+import pytest
+
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.placement_kernel import evaluate_candidates, layer_candidates
+from tests.helpers import CONTAINER_DIMS, packed_container, probe_item, random_items
+
+def _candidates(container, rng, probe):
+    """Space corners, positions on top of and beside placed items, and random positions"""
+    corners = [(space.x, space.y, space.z) for space in container.spaces]
+    for item in container.items:
+        x, y, z = item.position
+        w, d, h = item.dimensions
+        corners.extend([(x, y, z + h), (x + w / 2, y + d / 2, z + h), (x + w, y, z), (x, y + d, z)])
+    positions, dims = [], []
+    for rotation in container._get_valid_rotations(probe):
+        for corner in corners:
+            positions.append(corner)
+            dims.append(rotation)
+        for _ in range(20):
+            positions.append(tuple(round(rng.uniform(-0.2, limit), 2) for limit in CONTAINER_DIMS))
+            dims.append(rotation)
+    return positions, dims
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_kernel_matches_reference_checks(seed):
+    container, rng = packed_container(seed)
+    assert container.items
+    probe = probe_item(rng)
+    for fragility in ('LOW', 'HIGH'):
+        probe.fragility = fragility
+        positions, dims = _candidates(container, rng, probe)
+        terms = evaluate_candidates(positions, dims, container._get_placements(), container.dimensions,
+                                    probe.weight, probe.fragility == 'HIGH')
+        assert terms.feasible.any() and (terms.contact_count > 0).any()
+
+        for index, (pos, rotation) in enumerate(zip(positions, dims)):
+            assert bool(terms.feasible[index]) == container._is_valid_placement(probe, pos, rotation), (pos, rotation)
+            reference = container._candidate_terms(pos, rotation)
+            row = terms.row(index)
+            assert row['nearest_distances'] == reference['nearest_distances'], (pos, rotation)
+            assert row['contact_area'] == reference['contact_area'], (pos, rotation)
+            assert row['contact_count'] == reference['contact_count'], (pos, rotation)
+            assert row['insulating_count'] == reference['insulating_count'], (pos, rotation)
+
+def test_kernel_on_empty_container():
+    container = EnhancedContainer(CONTAINER_DIMS)
+    probe = random_items(random.Random(0), 1)[0]
+    positions = [(0, 0, 0), (1.0, 0.5, 0), (0, 0, 0.5), (5.9, 0, 0)]
+    dims = [probe.dimensions] * len(positions)
+    terms = evaluate_candidates(positions, dims, container._get_placements(), container.dimensions,
+                                probe.weight, False)
+    expected = [container._is_valid_placement(probe, pos, rotation) for pos, rotation in zip(positions, dims)]
+    assert terms.feasible.tolist() == expected
+    assert terms.nearest_distances.tolist() == [container._find_nearest_distances(pos, rotation)
+                                                for pos, rotation in zip(positions, dims)]
+
+@pytest.mark.parametrize("wall_buffer", [None, 0.3])
+def test_layer_candidates_match_space_loop(wall_buffer):
+    container, rng = packed_container(4)
+    probe = random_items(rng, 1)[0]
+    rotations = container._get_valid_rotations(probe)
+    excluded = [rng.random() < 0.1 for _ in container.spaces]
+    heights = sorted({0.0} | {item.position[2] + item.dimensions[2] for item in container.items})
+    for height in heights:
+        expected = []
+        for rotation_index, (w, d, h) in enumerate(rotations):
+            if height + h > CONTAINER_DIMS[2]:
+                continue
+            for space_index, space in enumerate(container.spaces):
+                if excluded[space_index] or not space.can_fit_item((w, d, h)) or abs(space.z - height) > 0.001:
+                    continue
+                if wall_buffer is not None and min(space.x, space.y,
+                                                   CONTAINER_DIMS[0] - (space.x + w),
+                                                   CONTAINER_DIMS[1] - (space.y + d),
+                                                   CONTAINER_DIMS[2] - (height + h)) < wall_buffer:
+                    continue
+                expected.append((rotation_index, space_index))
+        extents = container._get_space_manager().extents()
+        assert layer_candidates(extents, rotations, height, CONTAINER_DIMS, wall_buffer, excluded) == expected
+
+@pytest.mark.parametrize("route_temperature", [None, 35])
+def test_pack_items_identical_with_and_without_kernel(route_temperature):
+    layouts = []
+    for use_kernel in (False, True):
+        rng = random.Random(5)
+        items = random_items(rng, 40)
+        for item in items:
+            item.needs_insulation = False
+            item.temperature_sensitivity = rng.choice(['n/a', '2°C to 8°C', '10°C to 30°C'])
+        container = EnhancedContainer(CONTAINER_DIMS)
+        container.use_placement_kernel = use_kernel
+        container.pack_items(items, route_temperature=route_temperature)
+        layouts.append([(item.name, item.position, item.dimensions) for item in container.items])
+    assert layouts[0] == layouts[1]
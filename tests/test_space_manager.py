@@ -0,0 +1,191 @@
+"""
+Invariants of the maximal free spaces left after random placement sequences
+"""
+import random
+
+import pytest
+
+from optigenix_module.models.space import MaximalSpace
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.space_manager import (TOLERANCE, MaximalSpaceManager, interlocking_space_key,
+                                                   origin_space_key)
+from tests.helpers import CONTAINER_DIMS, packed_container, random_items
+
+DIMS = CONTAINER_DIMS
+
+def _bounds(space):
+    return (space.x, space.y, space.z, space.x + space.width, space.y + space.height, space.z + space.depth)
+
+def _overlap(a, b, margin=TOLERANCE):
+    """Whether two boxes given by corner coordinates share volume deeper than margin"""
+    return all(a[i] < b[i + 3] - margin and b[i] < a[i + 3] - margin for i in range(3))
+
+def _contains(outer, inner):
+    return (all(outer[i] <= inner[i] + TOLERANCE for i in range(3)) and
+            all(inner[i + 3] <= outer[i + 3] + TOLERANCE for i in range(3)))
+
+def _space(x, y, z, x2, y2, z2, temperature_safe=False):
+    space = MaximalSpace(x, y, z, x2 - x, y2 - y, z2 - z)
+    space.temperature_safe = temperature_safe
+    return space
+
+def _place_random_boxes(manager, rng, count, boxes, after_each=None, flag_aware=True):
+    """Place boxes at random positions inside random free spaces, as (x, y, z, x2, y2, z2)"""
+    for _ in range(count):
+        if not len(manager):
+            break
+        space = rng.choice(manager.spaces[:6])
+        x1, y1, z1, x2, y2, z2 = _bounds(space)
+        w = min(round(rng.uniform(0.05, 1.2), 3), x2 - x1)
+        d = min(round(rng.uniform(0.05, 1.0), 3), y2 - y1)
+        h = min(round(rng.uniform(0.05, 0.9), 3), z2 - z1)
+        # At the space's corner most of the time, as the packer does, otherwise anywhere inside it
+        offset = rng.random() < 0.3
+        x = x1 + (rng.uniform(0, x2 - x1 - w) if offset else 0)
+        y = y1 + (rng.uniform(0, y2 - y1 - d) if offset else 0)
+        z = z1 if rng.random() < 0.8 else z1 + rng.uniform(0, z2 - z1 - h)
+        boxes.append((x, y, z, x + w, y + d, z + h))
+        manager.place_box((x, y, z), (w, d, h), flag_aware)
+        if after_each is not None:
+            after_each()
+
+def _assert_free_and_irredundant(manager, boxes, flag_aware=True):
+    spaces = list(manager)
+    for space in spaces:
+        bounds = _bounds(space)
+        assert min(space.width, space.height, space.depth) >= manager.min_size
+        assert all(-TOLERANCE <= bounds[i] and bounds[i + 3] <= DIMS[i] + TOLERANCE for i in range(3))
+        for box in boxes:
+            assert not _overlap(bounds, box), (bounds, box)
+    for i, space in enumerate(spaces):
+        for j, other in enumerate(spaces):
+            if i != j and (not flag_aware or space.temperature_safe == other.temperature_safe):
+                assert not _contains(_bounds(other), _bounds(space)), (space, other)
+
+def _assert_maximal(manager, boxes, step=0.005):
+    """No space can grow through any face without leaving the container or running into a box"""
+    for space in manager:
+        bounds = _bounds(space)
+        for axis in range(3):
+            for side in (0, 1):
+                slab = list(bounds)
+                if side:
+                    slab[axis], slab[axis + 3] = bounds[axis + 3], bounds[axis + 3] + step
+                else:
+                    slab[axis], slab[axis + 3] = bounds[axis] - step, bounds[axis]
+                at_wall = slab[axis] < -TOLERANCE or slab[axis + 3] > DIMS[axis] + TOLERANCE
+                assert at_wall or any(_overlap(slab, box, margin=0) for box in boxes), (space, axis, side)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_spaces_are_free_maximal_and_irredundant(seed):
+    rng = random.Random(seed)
+    manager = MaximalSpaceManager([_space(0, 0, 0, *DIMS)])
+    boxes = []
+    _place_random_boxes(manager, rng, 40, boxes,
+                        after_each=lambda: _assert_free_and_irredundant(manager, boxes, flag_aware=False),
+                        flag_aware=False)
+    assert len(boxes) == 40
+    _assert_maximal(manager, boxes)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_temperature_safe_spaces_are_pruned_only_against_their_flag(seed):
+    rng = random.Random(seed)
+    # A temperature-safe zone away from the walls, inside the standard space
+    safe = _space(0.1, 0.1, 0, DIMS[0] - 0.1, DIMS[1] - 0.1, DIMS[2] - 0.1, temperature_safe=True)
+    manager = MaximalSpaceManager([_space(0, 0, 0, *DIMS), safe])
+    boxes = []
+    _place_random_boxes(manager, rng, 30, boxes, after_each=lambda: _assert_free_and_irredundant(manager, boxes))
+    flags = [space.temperature_safe for space in manager]
+    assert True in flags and False in flags
+    # Standard spaces still contain temperature-safe ones, which flag-aware pruning keeps
+    assert any(_contains(_bounds(outer), _bounds(inner)) for outer in manager if not outer.temperature_safe
+               for inner in manager if inner.temperature_safe)
+
+    # Without temperature constraints, new spaces contained in a space of either flag are dropped
+    space = next(space for space in manager if space.temperature_safe)
+    before = {id(space) for space in manager}
+    manager.place_box((space.x, space.y, space.z), (0.05, 0.05, 0.05), flag_aware=False)
+    new = [space for space in manager if id(space) not in before]
+    assert new
+    for space in new:
+        assert not any(other is not space and _contains(_bounds(other), _bounds(space)) for other in manager)
+
+def _listing(manager):
+    return [(_bounds(space), space.temperature_safe) for space in manager], list(manager._keys)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_restore_gives_back_the_checkpointed_spaces(seed):
+    rng = random.Random(seed)
+    manager = MaximalSpaceManager([_space(0, 0, 0, *DIMS)])
+    boxes = []
+    _place_random_boxes(manager, rng, 10, boxes)
+    checkpoints = []
+    for _ in range(4):
+        checkpoints.append((manager.checkpoint(), _listing(manager)))
+        _place_random_boxes(manager, rng, 5, boxes)
+    for state, listing in reversed(checkpoints):
+        manager.restore(state)
+        assert _listing(manager) == listing
+        # A restored state can be branched from without changing the checkpoint
+        _place_random_boxes(manager, rng, 3, [])
+        manager.restore(state)
+        assert _listing(manager) == listing
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_packed_container_spaces_are_free(seed):
+    container, _ = packed_container(seed, count=50)
+    boxes = [(x, y, z, x + w, y + d, z + h) for (x, y, z), (w, d, h) in
+             ((item.position, item.dimensions) for item in container.items)]
+    _assert_free_and_irredundant(container._get_space_manager(), boxes, flag_aware=False)
+    _assert_maximal(container._get_space_manager(), boxes)
+
+def _touching(boxes):
+    """count_adjacent over a list of boxes, by brute force"""
+    def count(bounds):
+        return sum(all(box[i] <= bounds[i + 3] + TOLERANCE and bounds[i] <= box[i + 3] + TOLERANCE for i in range(3))
+                   for box in boxes)
+    return count
+
+def _assert_order_matches_full_sort(manager, count_adjacent):
+    """Keys, order and adjacency counts agree with a manager sorted from scratch"""
+    spaces = list(manager)
+    if manager.tracks_adjacency:
+        assert [manager._adjacency[id(space)] for space in spaces] == [count_adjacent(_bounds(space)) for space in spaces]
+    keys = [manager.key(space, count_adjacent(_bounds(space)), manager.dimensions) for space in spaces]
+    assert manager._keys == keys
+    fresh = MaximalSpaceManager(spaces, key=manager.key, dimensions=manager.dimensions, count_adjacent=count_adjacent)
+    assert fresh._keys == keys
+
+@pytest.mark.parametrize("key", [origin_space_key, interlocking_space_key])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_incremental_order_matches_full_sort(key, seed):
+    rng = random.Random(seed)
+    boxes = []
+    count_adjacent = _touching(boxes)
+    manager = MaximalSpaceManager([_space(0, 0, 0, *DIMS)], key=key, dimensions=DIMS, count_adjacent=count_adjacent)
+    _place_random_boxes(manager, rng, 30, boxes,
+                        after_each=lambda: _assert_order_matches_full_sort(manager, count_adjacent))
+    assert manager.tracks_adjacency == (key is interlocking_space_key)
+
+    # Switching policy re-sorts the same spaces
+    manager.reorder(origin_space_key if key is interlocking_space_key else interlocking_space_key)
+    _assert_order_matches_full_sort(manager, count_adjacent)
+
+@pytest.mark.parametrize("key", [origin_space_key, interlocking_space_key])
+def test_container_space_order_matches_full_sort(key):
+    rng = random.Random(3)
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.set_space_order(key)
+    update_spaces = container._update_spaces
+    placements = []
+
+    def checked_update(pos, dims, used_space=None):
+        update_spaces(pos, dims, used_space)
+        boxes = [(x, y, z, x + w, y + d, z + h) for (x, y, z), (w, d, h) in
+                 ((item.position, item.dimensions) for item in container.items)]
+        _assert_order_matches_full_sort(container._get_space_manager(), _touching(boxes))
+        placements.append(pos)
+
+    container._update_spaces = checked_update
+    container.pack_items(random_items(rng, 40))
+    assert len(placements) == len(container.items) > 10
@@ -0,0 +1,95 @@
+"""
+Surrogate fitness model: rank correlation, automatic switch-off and offspring screening
+"""
+import random
+
+import numpy as np
+import pytest
+
+from optigenix_module.optimization.surrogate import SurrogateModel, rank_correlation
+from tests.helpers import GA_CONTAINER_DIMS, ga_items, ga_packer, random_genomes
+
+@pytest.mark.parametrize("predicted, actual", [
+    ([], []),
+    ([0.1, 0.2], [0.3, 0.4]),
+    ([0.5, 0.5, 0.5], [0.1, 0.2, 0.3]),
+    ([0.1, 0.2, 0.3], [0.4, 0.4, 0.4]),
+])
+def test_rank_correlation_is_undefined_for_degenerate_samples(predicted, actual):
+    assert rank_correlation(predicted, actual) is None
+
+def test_rank_correlation_compares_ranks():
+    assert rank_correlation([1, 2, 3, 4], [0.1, 0.5, 0.6, 10]) == pytest.approx(1.0)
+    assert rank_correlation([1, 2, 3, 4], [10, 0.6, 0.5, 0.1]) == pytest.approx(-1.0)
+    assert -1.0 < rank_correlation([1, 2, 3, 4, 5], [2, 1, 4, 3, 5]) < 1.0
+
+def _model(items, **kwargs):
+    return SurrogateModel(ga_packer(items)._item_types, GA_CONTAINER_DIMS, **kwargs)
+
+def _generation(items, seed, prediction):
+    """Evaluated genomes of a screened generation, with the predictions made for them"""
+    rng = random.Random(seed)
+    genomes = random_genomes(items, 8, seed)
+    for genome in genomes:
+        genome.fitness = rng.random()
+        genome.surrogate_prediction = prediction(genome.fitness)
+    return genomes
+
+@pytest.mark.parametrize("window", [2, 3])
+def test_anti_correlated_model_switches_off_after_a_full_window(window):
+    items = ga_items(1)
+    model = _model(items, window=window)
+    for generation in range(1, window + 1):
+        assert model.enabled
+        model.observe(_generation(items, generation, lambda fitness: -fitness), generation)
+    assert not model.enabled and model.disabled_at == window
+    assert model.correlations[-1] == pytest.approx(-1.0)
+    assert not model.ready
+
+    # A switched-off model no longer trains or screens
+    samples = model.stats()['samples']
+    model.observe(_generation(items, 99, lambda fitness: -fitness), window + 1)
+    assert model.stats()['samples'] == samples and model.disabled_at == window
+
+def test_correlated_model_stays_on():
+    items = ga_items(1)
+    model = _model(items, window=3)
+    for generation in range(1, 6):
+        model.observe(_generation(items, generation, lambda fitness: fitness + 0.1), generation)
+    assert model.enabled and model.disabled_at is None
+    assert model.correlations == pytest.approx([1.0] * 5)
+    assert model.ready
+
+@pytest.mark.parametrize("keep", [1, 5, 10, 19])
+def test_screen_keeps_exactly_keep_offspring(keep):
+    items = ga_items(2)
+    model = _model(items, explore_share=0.2)
+    training = random_genomes(items, 30, seed=2)
+    for genome in training:
+        genome.fitness = float(model.features(genome)[1])  # Learnable: the mean orientation height
+    model.observe(training, 1)
+    assert model.ready
+
+    random.seed(keep)
+    offspring = random_genomes(items, 20, seed=keep)
+    kept = model.screen(offspring, keep)
+    assert len(kept) == keep and len({id(genome) for genome in kept}) == keep
+    assert all(any(genome is candidate for candidate in offspring) for genome in kept)
+
+    predictions = np.array([model.features(genome) for genome in offspring]) @ model._coefficients
+    explore = min(keep - 1, int(round(keep * 0.2))) if keep > 1 else 0
+    ranked = np.argsort(-predictions, kind='stable').tolist()
+    best = [offspring[index] for index in ranked[:keep - explore]]
+    assert kept[:keep - explore] == best
+    # The explore share comes from outside the predicted best
+    assert not any(genome is other for genome in kept[keep - explore:] for other in best)
+    assert all(genome.surrogate_prediction == pytest.approx(predictions[offspring.index(genome)]) for genome in kept)
+    assert (model.screened, model.rejected) == (20, 20 - keep)
+
+def test_screen_keeps_everything_when_keep_covers_offspring():
+    items = ga_items(3)
+    model = _model(items)
+    offspring = random_genomes(items, 5, seed=3)
+    assert model.screen(offspring, 5) == offspring
+    assert not any(hasattr(genome, 'surrogate_prediction') for genome in offspring)
+    assert model.screened == 0